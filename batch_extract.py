@@ -0,0 +1,53 @@
+# ===== batch_extract.py =====
+
+import argparse
+import os
+import sys
+from core.batch_extractor import BatchExtractor, load_template
+
+def collect_pdfs(inputs, file_list=None):
+    '''Expand files and directories into a sorted list of PDF paths'''
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for dirpath, _, filenames in os.walk(item):
+                paths.extend(os.path.join(dirpath, f) for f in filenames if f.lower().endswith('.pdf'))
+        else:
+            paths.append(item)
+
+    if file_list:
+        with open(file_list, 'r') as f:
+            paths.extend(line.strip() for line in f if line.strip())
+
+    return sorted(set(paths))
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract labeled regions from many PDFs using a saved label file')
+    parser.add_argument('template', help='label JSON saved from the labeling tool')
+    parser.add_argument('inputs', nargs='*', help='PDF files or directories')
+    parser.add_argument('-o', '--output', required=True, help='JSONL file to append results to')
+    parser.add_argument('--file-list', help='text file with one PDF path per line')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--zoom', type=float, default=1.0, help='zoom level of a template saved in canvas pixels by older versions')
+    parser.add_argument('--no-resume', action='store_true', help='overwrite output instead of resuming')
+    args = parser.parse_args()
+
+    template = load_template(args.template, zoom=args.zoom)
+    pdf_paths = collect_pdfs(args.inputs, args.file_list)
+
+    def report(extractor):
+        sys.stderr.write(f'\r{extractor.processed} done, {extractor.failed} failed, '
+                         f'{extractor.docs_per_second():.1f} docs/sec')
+        sys.stderr.flush()
+
+    extractor = BatchExtractor(template, workers=args.workers)
+    extractor.run(pdf_paths, args.output, resume=not args.no_resume, on_progress=report)
+
+    sys.stderr.write(f'\nProcessed {extractor.processed} documents '
+                     f'({extractor.skipped} already done, {extractor.failed} failed) '
+                     f'in {extractor.elapsed:.1f}s, {extractor.docs_per_second():.1f} docs/sec\n')
+    return 1 if extractor.failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
@@ -0,0 +1,90 @@
+# ===== benchmarks/bench_canvas_edit.py =====
+
+import random
+import sys
+import time
+import tkinter as tk
+from core.label_manager import LabelManager
+from models.label import Label
+from ui.label_panel import LabelPanel
+from ui.pdf_canvas import PDFCanvas
+
+LABEL_COUNTS = [100, 1000, 5000]
+EDITS = 50
+
+def make_label(rng: random.Random) -> Label:
+    '''Create a random label inside an A4 page at zoom 1.0'''
+    x, y = rng.uniform(0, 550), rng.uniform(0, 800)
+    return Label(x, y, 'field', (x, y, x + rng.uniform(10, 40), y + rng.uniform(5, 20)))
+
+def time_edits(root: tk.Tk, label_count: int, full_refresh: bool) -> float:
+    '''Average seconds per add+delete cycle on a page holding label_count labels'''
+    rng = random.Random(label_count)
+    canvas = tk.Canvas(root, width=600, height=850)
+    manager = LabelManager()
+    for _ in range(label_count):
+        manager.add_label(0, make_label(rng))
+
+    pdf_canvas = PDFCanvas(canvas, manager)
+    pdf_canvas.refresh()
+    panel_frame = tk.Frame(root)
+    panel = LabelPanel(panel_frame, manager)
+    panel.update_list()
+    root.update()
+
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        label = make_label(rng)
+        manager.add_label(0, label)
+        if full_refresh:
+            pdf_canvas.refresh()
+            panel.update_list()
+        else:
+            pdf_canvas.add_label(label)
+            panel.label_added(label)
+        root.update_idletasks()
+
+        index = manager.get_label_count(0) - 1
+        removed = manager.delete_label(0, index)
+        if full_refresh:
+            pdf_canvas.refresh()
+            panel.update_list()
+        else:
+            pdf_canvas.remove_label(removed)
+            panel.label_deleted(index)
+        root.update_idletasks()
+    elapsed = (time.perf_counter() - start) / EDITS
+
+    canvas.destroy()
+    panel_frame.destroy()
+    return elapsed
+
+def run() -> list:
+    '''Time full-refresh and incremental edits at each label count'''
+    root = tk.Tk()
+    root.withdraw()
+    results = []
+    for count in LABEL_COUNTS:
+        results.append({
+            'labels': count,
+            'full_refresh_ms': time_edits(root, count, True) * 1000,
+            'incremental_ms': time_edits(root, count, False) * 1000
+        })
+    root.destroy()
+    return results
+
+def main():
+    try:
+        results = run()
+    except tk.TclError as e:
+        print(f'Skipping canvas benchmark, no display available: {e}')
+        return 0
+
+    print(f'{"labels":>8} {"full refresh":>14} {"incremental":>14}')
+    for r in results:
+        print(f'{r["labels"]:>8} {r["full_refresh_ms"]:>11.2f} ms {r["incremental_ms"]:>11.3f} ms')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
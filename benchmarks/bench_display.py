@@ -0,0 +1,93 @@
+# ===== benchmarks/bench_display.py =====
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tkinter as tk
+import fitz  # PyMuPDF
+from typing import Dict
+from benchmarks.synthetic import make_pdf
+
+ZOOMS = [1.0, 2.0, 3.0]
+REPEAT = 5
+
+def run(workdir: str, full: bool = False) -> Dict[str, float]:
+    '''Compare display latency and peak memory of the PIL and PPM pixmap paths'''
+    pdf_path = os.path.join(workdir, 'display.pdf')
+    make_pdf(pdf_path, pages=1, size='a0' if full else 'a4', lines_per_page=120)
+
+    results = {}
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in ('pil', 'ppm'):
+        for zoom in ZOOMS:
+            # A fresh process per case keeps peak RSS measurements independent
+            proc = subprocess.run(
+                [sys.executable, '-W', 'ignore', '-m', 'benchmarks.bench_display',
+                 '--child', path, str(zoom), pdf_path],
+                capture_output=True, text=True, cwd=repo_root
+            )
+            if proc.returncode != 0:
+                print(f'Skipping {path} display benchmark: {proc.stderr.strip()[-200:]}', file=sys.stderr)
+                break
+            case = json.loads(proc.stdout.strip().splitlines()[-1])
+            # Without a display only the conversion before Tk is timed
+            stage = 'display' if case['tk'] else 'convert'
+            results[f'display.{path}.zoom_{zoom:.1f}_{stage}_ms'] = case['ms']
+            results[f'display.{path}.zoom_{zoom:.1f}_{stage}_peak_mb'] = case['peak_mb']
+    return results
+
+def measure(path: str, zoom: float, pdf_path: str) -> dict:
+    '''Time one page display through a path and the extra peak memory it needs'''
+    doc = fitz.open(pdf_path)
+    page = doc[0]
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+
+    if path == 'pil':
+        from PIL import Image, ImageTk
+
+        def display(z: float):
+            pix = page.get_pixmap(matrix=fitz.Matrix(z, z))
+            img = Image.frombytes('RGB', [pix.width, pix.height], pix.samples)
+            return ImageTk.PhotoImage(img) if root else img
+    else:
+        def display(z: float):
+            pix = page.get_pixmap(matrix=fitz.Matrix(z, z))
+            data = pix.tobytes('ppm')
+            return tk.PhotoImage(master=root, data=data, format='PPM') if root else data
+
+    # Warm up imports and Tk with a tiny render before taking the baseline
+    display(0.1)
+    base = _max_rss()
+    current = None
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        # Like the canvas, the previous image stays alive until it is replaced
+        current = display(zoom)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        'tk': root is not None,
+        'ms': times[len(times) // 2] * 1000,
+        'peak_mb': (_max_rss() - base) / 1e6
+    }
+
+def _max_rss() -> int:
+    '''Peak resident memory of this process in bytes'''
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        print(json.dumps(measure(sys.argv[2], float(sys.argv[3]), sys.argv[4])))
+    else:
+        for name, value in run(sys.argv[1] if len(sys.argv) > 1 else '.').items():
+            print(f'{name:>40} {value:10.2f}')
+# ====================
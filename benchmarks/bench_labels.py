@@ -0,0 +1,36 @@
+# ===== benchmarks/bench_labels.py =====
+
+import random
+import time
+from typing import Dict, List
+from benchmarks.synthetic import make_labels
+from models.label import Label
+
+CYCLES = 200
+
+def label_counts(full: bool) -> List[int]:
+    return [10, 1000, 100000, 1000000] if full else [10, 1000, 100000]
+
+def run(workdir: str, full: bool = False) -> Dict[str, float]:
+    '''Time label add/delete cycles and hit-testing in LabelManager'''
+    results = {}
+    rng = random.Random(0)
+    for count in label_counts(full):
+        # Roughly 1000 labels per page, like dense auto-generated forms
+        manager = make_labels(count, pages=max(1, count // 1000))
+
+        start = time.perf_counter()
+        for _ in range(CYCLES):
+            x, y = rng.uniform(0, 500), rng.uniform(0, 800)
+            manager.add_label(0, Label(x, y, 'bench', (x, y, x + 30, y + 12)))
+            manager.delete_label(0, manager.get_label_count(0) - 1)
+        results[f'labels.n_{count}.add_delete_ms'] = (time.perf_counter() - start) / CYCLES * 1000
+
+        manager.find_labels_at(0, 0, 0)  # build the page index
+        start = time.perf_counter()
+        for _ in range(CYCLES):
+            manager.find_labels_at(0, rng.uniform(0, 595), rng.uniform(0, 842))
+        results[f'labels.n_{count}.hit_test_ms'] = (time.perf_counter() - start) / CYCLES * 1000
+    return results
+
+# ====================
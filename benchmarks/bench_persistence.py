@@ -0,0 +1,40 @@
+# ===== benchmarks/bench_persistence.py =====
+
+import os
+import time
+import tracemalloc
+from typing import Dict
+from benchmarks.bench_labels import label_counts
+from benchmarks.synthetic import make_labels
+from core.label_manager import LabelManager
+
+def run(workdir: str, full: bool = False) -> Dict[str, float]:
+    '''Time save/load throughput and peak memory for JSON and label databases'''
+    results = {}
+    for count in label_counts(full):
+        manager = make_labels(count, pages=max(1, count // 1000))
+        for fmt in ('json', 'db'):
+            path = os.path.join(workdir, f'labels_{count}.{fmt}')
+            if os.path.exists(path):
+                os.remove(path)
+
+            start = time.perf_counter()
+            manager.save_to_file(path)
+            elapsed = time.perf_counter() - start
+            results[f'persist.{fmt}.n_{count}.save_labels_per_sec'] = count / elapsed
+
+            loaded = LabelManager()
+            tracemalloc.start()
+            start = time.perf_counter()
+            loaded.load_from_file(path)
+            loaded.get_labels(0)  # first page view
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[f'persist.{fmt}.n_{count}.load_ms'] = elapsed * 1000
+            results[f'persist.{fmt}.n_{count}.load_peak_mb'] = peak / 1e6
+            loaded.clear_all()
+    return results
+
+# ====================
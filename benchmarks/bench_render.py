@@ -0,0 +1,73 @@
+# ===== benchmarks/bench_render.py =====
+
+import os
+import time
+from typing import Dict, List
+from benchmarks.synthetic import make_pdf
+from core.pdf_document import PDFDocument
+
+VIEWPORT = (1200, 800)
+
+def zoom_steps() -> List[float]:
+    '''Every zoom level reachable with the zoom buttons'''
+    doc = PDFDocument()
+    steps = {doc.zoom_level}
+    while doc.zoom_level < 3.0:
+        doc.zoom_in()
+        steps.add(doc.zoom_level)
+    doc.zoom_level = 1.0
+    while doc.zoom_level > 0.5:
+        doc.zoom_out()
+        steps.add(doc.zoom_level)
+    return sorted(steps)
+
+def median_ms(fn, repeat: int) -> float:
+    '''Median wall time of fn in milliseconds'''
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+def run(workdir: str, full: bool = False) -> Dict[str, float]:
+    '''Time page rendering at each zoom step, uncached, cached and tiled'''
+    results = {}
+    sizes = ['a4', 'a0'] if full else ['a4']
+    for size in sizes:
+        pdf_path = os.path.join(workdir, f'render_{size}.pdf')
+        make_pdf(pdf_path, pages=10, size=size, lines_per_page=80 if size == 'a4' else 300)
+
+        # A zero budget disables the render cache so every call rasterizes
+        doc = PDFDocument(cache_bytes=0, prefetch_pages=0)
+        doc.open(pdf_path)
+        for zoom in zoom_steps():
+            doc.zoom_level = zoom
+            results[f'render.{size}.zoom_{zoom:.1f}_ms'] = median_ms(lambda i: doc.render_page(i % 10), 5)
+            if not doc.use_tiles():
+                # Progressive display: preview rendered before the full page
+                results[f'render.{size}.zoom_{zoom:.1f}_first_pixel_ms'] = median_ms(
+                    lambda i: doc.render_preview(i % 10), 5)
+            else:
+                results[f'render.{size}.zoom_{zoom:.1f}_viewport_tiles_ms'] = median_ms(
+                    lambda i: _render_viewport(doc, i % 10), 5)
+        doc.close()
+
+        cached = PDFDocument(prefetch_pages=0)
+        cached.open(pdf_path)
+        cached.render_page(0)
+        results[f'render.{size}.cache_hit_ms'] = median_ms(lambda i: cached.render_page(0), 20)
+        cached.close()
+    return results
+
+def _render_viewport(doc: PDFDocument, page_num: int):
+    '''Render the tiles covering the top-left viewport of a page'''
+    size = doc.tile_size
+    cols = -(-VIEWPORT[0] // size)
+    rows = -(-VIEWPORT[1] // size)
+    for row in range(rows):
+        for col in range(cols):
+            doc.render_tile(page_num, col, row)
+
+# ====================
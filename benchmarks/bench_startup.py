@@ -0,0 +1,84 @@
+# ===== benchmarks/bench_startup.py =====
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+REPEAT = 5
+PAGE_TIMEOUT = 30.0
+
+def run(workdir: str, full: bool = False) -> Dict[str, float]:
+    '''Time cold imports, the first window frame and the first page, each in fresh processes'''
+    # Imported here so child processes start without PyMuPDF loaded
+    from benchmarks.synthetic import make_pdf
+    pdf_path = os.path.join(workdir, 'startup.pdf')
+    make_pdf(pdf_path, pages=500 if full else 50)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    cases = {'import': [], 'empty': [], 'pdf': []}
+    for _ in range(REPEAT):
+        for case in cases:
+            args = [sys.executable, '-W', 'ignore', '-m', 'benchmarks.bench_startup', '--child', case]
+            if case == 'pdf':
+                args.append(pdf_path)
+            start = time.perf_counter()
+            proc = subprocess.run(args, capture_output=True, text=True, cwd=repo_root)
+            wall_ms = (time.perf_counter() - start) * 1000
+            if proc.returncode != 0:
+                print(f'Skipping {case} startup benchmark: {proc.stderr.strip()[-200:]}', file=sys.stderr)
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            if result:
+                result['process_ms'] = wall_ms
+                cases[case].append(result)
+
+    results = {}
+    for case, runs in cases.items():
+        for name in sorted(runs[0]) if runs else []:
+            values = sorted(r[name] for r in runs)
+            results[f'startup.{case}.{name}'] = values[len(values) // 2]
+    return results
+
+def measure(case: str, pdf_path: Optional[str] = None) -> dict:
+    '''Start the application the way main.py does, timing each stage from interpreter start'''
+    start = time.perf_counter()
+    if case == 'import':
+        import ui.main_window  # noqa: F401
+        return {'import_ms': (time.perf_counter() - start) * 1000}
+
+    import tkinter as tk
+    import main
+    try:
+        root = main.show_window()
+    except tk.TclError:
+        # No display: only the import case is measured
+        return {}
+    result = {'first_frame_ms': (time.perf_counter() - start) * 1000}
+
+    app = main.build_app(root, [pdf_path] if pdf_path else [])
+    root.update()
+    result['ui_ready_ms'] = (time.perf_counter() - start) * 1000
+
+    if pdf_path:
+        deadline = time.perf_counter() + PAGE_TIMEOUT
+        while 'first_pixel_ms' not in app.render_timings and time.perf_counter() < deadline:
+            root.update()
+            time.sleep(0.001)
+        result['first_page_ms'] = (time.perf_counter() - start) * 1000
+
+    app.render_scheduler.close()
+    app.thumbnail_panel.close()
+    app.workspace.close_all()
+    root.destroy()
+    return result
+
+if __name__ == '__main__':
+    if len(sys.argv) in (3, 4) and sys.argv[1] == '--child':
+        print(json.dumps(measure(sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None)))
+    else:
+        for name, value in run(sys.argv[1] if len(sys.argv) > 1 else '.').items():
+            print(f'{name:>40} {value:10.2f}')
+# ====================
@@ -0,0 +1,129 @@
+# ===== benchmarks/run.py =====
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from benchmarks import bench_display, bench_labels, bench_persistence, bench_render, bench_startup
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Differences below these floors are timer noise, not regressions
+NOISE_FLOOR = {'_ms': 0.05, '_mb': 0.5}
+
+SUITES = {
+    'render': bench_render.run,
+    'labels': bench_labels.run,
+    'persistence': bench_persistence.run,
+    'display': bench_display.run,
+    'startup': bench_startup.run
+}
+
+# Suites that create Tk windows
+GUI_SUITES = ('display', 'canvas', 'startup')
+
+def run_canvas() -> Dict[str, float]:
+    '''Time canvas add/delete cycles, or nothing if there is no display'''
+    import tkinter as tk
+    from benchmarks import bench_canvas_edit
+
+    try:
+        results = bench_canvas_edit.run()
+    except tk.TclError as e:
+        print(f'Skipping canvas benchmark, no display available: {e}', file=sys.stderr)
+        return {}
+    metrics = {}
+    for r in results:
+        metrics[f'canvas.n_{r["labels"]}.full_refresh_ms'] = r['full_refresh_ms']
+        metrics[f'canvas.n_{r["labels"]}.incremental_ms'] = r['incremental_ms']
+    return metrics
+
+def start_virtual_display() -> Optional[subprocess.Popen]:
+    '''Start Xvfb for the GUI benchmarks when no display is set'''
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+    proc = subprocess.Popen(['Xvfb', ':99', '-screen', '0', '1280x1024x24'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = ':99'
+    time.sleep(0.5)
+    return proc
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    '''List metrics that got worse than the baseline by more than threshold'''
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        current = results.get(name)
+        if current is None or not base:
+            continue
+        if name.endswith('_per_sec'):
+            change = (base - current) / base
+        else:
+            floor = next((v for suffix, v in NOISE_FLOOR.items() if name.endswith(suffix)), 0)
+            if current - base < floor:
+                continue
+            change = (current - base) / base
+        if change > threshold:
+            regressions.append(f'{name}: {base:.3f} -> {current:.3f} ({change:+.0%})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rendering, labeling and persistence')
+    parser.add_argument('-o', '--output', help='Write results to this JSON file')
+    parser.add_argument('--suite', action='append', choices=list(SUITES) + ['canvas'],
+                        help='Run only these suites (repeatable)')
+    parser.add_argument('--full', action='store_true', help='Include 1M-label sets and A0 pages')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown before a metric counts as a regression')
+    parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline with these results')
+    args = parser.parse_args()
+
+    suites = args.suite or list(SUITES) + ['canvas']
+    metrics: Dict[str, float] = {}
+    display = start_virtual_display() if set(suites) & set(GUI_SUITES) else None
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in suites:
+            print(f'Running {name} benchmarks...', file=sys.stderr)
+            if name == 'canvas':
+                metrics.update(run_canvas())
+            else:
+                metrics.update(SUITES[name](workdir, args.full))
+    if display:
+        display.terminate()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'full': args.full,
+        'metrics': {k: round(v, 4) for k, v in sorted(metrics.items())}
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(text + '\n')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)['metrics']
+    regressions = compare(report['metrics'], baseline, args.threshold)
+    for line in regressions:
+        print(f'REGRESSION {line}', file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
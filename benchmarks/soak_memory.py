@@ -0,0 +1,87 @@
+# ===== benchmarks/soak_memory.py =====
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from core.memory import current_rss
+from core.pdf_document import PDFDocument
+
+MB = 1024 * 1024
+
+def soak(pdf_path: str, pages: Optional[int], budget: Optional[int], cache_bytes: int,
+         sample_every: int = 50) -> dict:
+    '''Walk the pages of a PDF like a user paging through it and sample resident memory'''
+    pdf_doc = PDFDocument(cache_bytes=cache_bytes, memory_budget=budget)
+    pdf_doc.open(pdf_path)
+    pages = min(pages or pdf_doc.total_pages, pdf_doc.total_pages)
+
+    samples: List[int] = []
+    start = time.perf_counter()
+    for page_num in range(pages):
+        pdf_doc.render_preview(page_num)
+        pdf_doc.render_page(page_num)
+        if page_num % sample_every == 0:
+            samples.append(current_rss())
+    elapsed = time.perf_counter() - start
+    samples.append(current_rss())
+    stats = dict(pdf_doc.memory_stats)
+    pdf_doc.close()
+
+    # Trimming makes memory saw-tooth, so compare the peaks of both halves
+    # to see whether it levels off
+    half = len(samples) // 2
+    return {
+        'pages': pages,
+        'pages_per_sec': pages / elapsed,
+        'start_mb': samples[0] / MB,
+        'peak_mb': max(samples) / MB,
+        'end_mb': samples[-1] / MB,
+        'late_growth_mb': (max(samples[half:]) - max(samples[:half])) / MB,
+        'samples_mb': [round(s / MB) for s in samples],
+        **stats
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Page through a large PDF and check that memory stays bounded')
+    parser.add_argument('--pdf', help='PDF to page through; a synthetic scanned PDF is generated if omitted')
+    parser.add_argument('--pages', type=int, default=2000, help='Number of pages to visit')
+    parser.add_argument('--budget-mb', type=int, default=300, help='Memory budget in megabytes')
+    parser.add_argument('--no-budget', action='store_true', help='Run without a memory budget for comparison')
+    parser.add_argument('--cache-mb', type=int, default=256, help='Render cache size in megabytes')
+    parser.add_argument('--tolerance-mb', type=float, default=20.0,
+                        help='Allowed rise of peak memory in the second half of the run')
+    args = parser.parse_args()
+    if current_rss() is None:
+        print('Resident memory cannot be measured on this platform', file=sys.stderr)
+        return 1
+
+    budget = None if args.no_budget else args.budget_mb * MB
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            from benchmarks.synthetic import make_pdf
+            pdf_path = os.path.join(workdir, 'soak.pdf')
+            make_pdf(pdf_path, pages=args.pages, images=True)
+        result = soak(pdf_path, args.pages, budget, args.cache_mb * MB)
+
+    print(f"{result['pages']} pages at {result['pages_per_sec']:.1f} pages/s: "
+          f"RSS {result['start_mb']:.0f} MB start, {result['peak_mb']:.0f} MB peak, {result['end_mb']:.0f} MB end, "
+          f"{result['late_growth_mb']:.1f} MB higher peak in the second half")
+    print(f"store trims {result['store_trims']}, cache trims {result['cache_trims']}, reopens {result['reopens']}")
+    print('samples (MB): ' + ' '.join(str(s) for s in result['samples_mb']))
+
+    failures = []
+    if budget is not None and result['peak_mb'] > args.budget_mb * 1.1:
+        failures.append(f"peak {result['peak_mb']:.0f} MB exceeds the {args.budget_mb} MB budget")
+    if result['late_growth_mb'] > args.tolerance_mb:
+        failures.append(f"peak memory grew {result['late_growth_mb']:.1f} MB in the second half")
+    for line in failures:
+        print(f'FAIL {line}', file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
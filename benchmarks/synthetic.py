@@ -0,0 +1,62 @@
+# ===== benchmarks/synthetic.py =====
+
+import random
+import fitz  # PyMuPDF
+import numpy as np
+from core.label_manager import LabelManager
+
+PAGE_SIZES = {
+    'a4': (595, 842),
+    'a0': (2384, 3370)
+}
+
+def make_pdf(file_path: str, pages: int, size: str = 'a4', lines_per_page: int = 80, seed: int = 0,
+             images: bool = False):
+    '''Write a synthetic PDF with text and vector drawings on every page, and optionally a scanned image'''
+    rng = random.Random(seed)
+    width, height = PAGE_SIZES[size]
+    doc = fitz.open()
+    # A distinct image object per page, so MuPDF caches a new decoded image for each
+    samples = np.full((400, 400, 3), 230, dtype=np.uint8)
+    for page_num in range(pages):
+        page = doc.new_page(width=width, height=height)
+        fontsize = max((height - 80) / lines_per_page / 1.2, 4)
+        lines = [f'Page {page_num + 1} line {i}: invoice item {rng.randint(0, 99999)}'
+                 for i in range(lines_per_page)]
+        page.insert_text((40, 50), lines, fontsize=fontsize)
+
+        # Vector content makes rasterization closer to real forms and drawings
+        shape = page.new_shape()
+        for _ in range(lines_per_page // 2):
+            x, y = rng.uniform(0, width), rng.uniform(0, height)
+            shape.draw_rect(fitz.Rect(x, y, x + rng.uniform(10, 120), y + rng.uniform(5, 60)))
+        shape.finish(color=(0, 0, 0.6), width=0.5)
+        shape.commit()
+
+        if images:
+            samples[0, :4, 0] = np.frombuffer(page_num.to_bytes(4, 'little'), dtype=np.uint8)
+            xref = doc.get_new_xref()
+            doc.update_object(xref, '<</Type/XObject/Subtype/Image/Width 400/Height 400'
+                                    '/ColorSpace/DeviceRGB/BitsPerComponent 8>>')
+            doc.update_stream(xref, samples.tobytes(), new=True, compress=True)
+            page.insert_image(fitz.Rect(width - 220, height - 220, width - 20, height - 20), xref=xref)
+    doc.save(file_path)
+    doc.close()
+
+def make_labels(label_count: int, pages: int, size: str = 'a4', seed: int = 0) -> LabelManager:
+    '''Build a LabelManager holding label_count random boxes spread over pages'''
+    rng = np.random.default_rng(seed)
+    width, height = PAGE_SIZES[size]
+    manager = LabelManager()
+    per_page = np.bincount(rng.integers(0, pages, label_count), minlength=pages)
+    texts = [f'field_{i}' for i in range(32)]
+    for page_num, count in enumerate(per_page.tolist()):
+        if not count:
+            continue
+        x1 = rng.uniform(0, width - 100, count)
+        y1 = rng.uniform(0, height - 40, count)
+        boxes = np.stack([x1, y1, x1 + rng.uniform(10, 100, count), y1 + rng.uniform(5, 40, count)], axis=1)
+        manager.store.extend(page_num, boxes, (texts[i % len(texts)] for i in range(count)))
+    return manager
+
+# ====================
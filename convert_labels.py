@@ -0,0 +1,24 @@
+# ===== convert_labels.py =====
+
+import argparse
+import sys
+from core.label_db import db_to_json, is_label_db, json_to_db
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert label files between JSON and the indexed label database format')
+    parser.add_argument('source', help='JSON label file or label database (.db/.sqlite)')
+    parser.add_argument('target', help='output path; the format is chosen by extension')
+    args = parser.parse_args()
+
+    if is_label_db(args.source) == is_label_db(args.target):
+        parser.error('source and target must be one JSON file and one label database')
+
+    if is_label_db(args.target):
+        json_to_db(args.source, args.target)
+    else:
+        db_to_json(args.source, args.target)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
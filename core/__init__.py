@@ -1,7 +1,25 @@
-# ===== core/__init__.py =====
-
-from .pdf_document import PDFDocument
-from .label_manager import LabelManager
-
-__all__ = ['PDFDocument', 'LabelManager']
-# ====================
\ No newline at end of file
+# ===== core/__init__.py =====
+
+import importlib
+
+# Exports are imported on first access (PEP 562), so importing a light
+# submodule such as core.metrics does not load PyMuPDF and NumPy
+_EXPORTS = {
+    'PDFDocument': '.pdf_document',
+    'LabelManager': '.label_manager',
+    'RenderCache': '.render_cache'
+}
+
+__all__ = ['PDFDocument', 'LabelManager', 'RenderCache']
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+# ====================
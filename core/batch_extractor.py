@@ -0,0 +1,186 @@
+# ===== core/batch_extractor.py =====
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from core.label_manager import LabelManager
+from core.lazy_import import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+# Template: page number -> list of (label text, bbox in PDF points)
+Template = Dict[int, List[Tuple[str, Tuple[float, float, float, float]]]]
+
+_worker_template: Template = {}
+
+def load_template(file_path: str, zoom: float = 1.0) -> Template:
+    '''Load a saved label file as an extraction template'''
+    manager = LabelManager()
+    manager.load_from_file(file_path)
+
+    # Boxes are stored in PDF points; zoom only rescales files saved in
+    # canvas pixels by older versions of the tool
+    return manager_template(manager, 1.0 / zoom)
+
+def manager_template(manager: LabelManager, scale: float = 1.0) -> Template:
+    '''Get the labels held by a LabelManager as a template'''
+    template = {}
+    for page_num in manager.get_pages():
+        boxes = manager.get_page_boxes(page_num, scale).tolist()
+        text_ids, texts = manager.get_page_text_ids(page_num)
+        template[page_num] = [(texts[i], tuple(bbox)) for i, bbox in zip(text_ids.tolist(), boxes)]
+    return template
+
+def extract_document(file_path: str, template: Template) -> dict:
+    '''Extract the text inside every template box of one PDF'''
+    record = {'file': file_path, 'pages': 0, 'fields': [], 'error': None}
+    try:
+        with fitz.open(file_path) as doc:
+            record['pages'] = len(doc)
+            for page_num in sorted(template):
+                if page_num >= len(doc):
+                    continue
+                page = doc[page_num]
+                for label_text, bbox in template[page_num]:
+                    text = page.get_text('text', clip=fitz.Rect(bbox))
+                    record['fields'].append({
+                        'page': page_num,
+                        'label': label_text,
+                        'bbox': list(bbox),
+                        'text': text.strip()
+                    })
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+def _init_worker(template: Template):
+    global _worker_template
+    _worker_template = template
+
+def _extract_in_worker(file_path: str) -> dict:
+    return extract_document(file_path, _worker_template)
+
+class BatchExtractor:
+    '''Applies one label template to many same-layout PDFs in parallel'''
+
+    def __init__(self, template: Template, workers: Optional[int] = None):
+        self.template = template
+        self.workers = workers or os.cpu_count() or 1
+
+        # Statistics of the last run
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def run(self, pdf_paths: Iterable[str], output_path: str, resume: bool = True,
+            on_progress: Optional[Callable[['BatchExtractor'], None]] = None):
+        '''Extract all documents, appending one JSON record per line to output_path'''
+        pdf_paths = list(pdf_paths)
+        done = self._completed_files(output_path, set(pdf_paths)) if resume else set()
+        pending = [p for p in pdf_paths if p not in done]
+        self.skipped = len(pdf_paths) - len(pending)
+        self.processed = 0
+        self.failed = 0
+
+        start = time.perf_counter()
+        mode = 'a' if resume else 'w'
+        with open(output_path, mode, encoding='utf-8') as out:
+            pool = self._create_pool()
+            try:
+                # Keep a bounded number of documents in flight
+                queue = iter(pending)
+                in_flight = {}
+                max_in_flight = self.workers * 4
+
+                while True:
+                    for file_path in queue:
+                        in_flight[pool.submit(_extract_in_worker, file_path)] = file_path
+                        if len(in_flight) >= max_in_flight:
+                            break
+                    if not in_flight:
+                        break
+
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    records = []
+                    try:
+                        for future in finished:
+                            records.append(future.result())
+                            del in_flight[future]
+                    except BrokenProcessPool as e:
+                        # A worker died, e.g. crashing inside PyMuPDF on a bad
+                        # file, and took every document in flight with it.
+                        # They are recorded as failed so a resumed run retries them.
+                        records.extend({'file': p, 'pages': 0, 'fields': [], 'error': str(e)}
+                                       for p in in_flight.values())
+                        in_flight = {}
+                        pool.shutdown(wait=False)
+                        pool = self._create_pool()
+
+                    for record in records:
+                        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        self.processed += 1
+                        if record['error']:
+                            self.failed += 1
+                    out.flush()
+
+                    self.elapsed = time.perf_counter() - start
+                    if on_progress:
+                        on_progress(self)
+            finally:
+                pool.shutdown()
+
+        self.elapsed = time.perf_counter() - start
+
+    def docs_per_second(self) -> float:
+        '''Get throughput of the last run'''
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        '''Start worker processes that hold the template'''
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.template,))
+
+    def _completed_files(self, output_path: str, retry: Set[str]) -> Set[str]:
+        '''Read files already extracted successfully, dropping a torn last line'''
+        done = set()
+        if not os.path.exists(output_path):
+            return done
+
+        # Only successful records count as done. Failed files in this run
+        # are extracted again, so their old failure records are removed and
+        # each file ends up with one record; other failures are kept.
+        kept = []
+        valid_size = 0
+        stale = False
+        with open(output_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_size += len(line)
+                if not record.get('error'):
+                    done.add(record['file'])
+                elif record['file'] in retry:
+                    stale = True
+                    continue
+                kept.append(line)
+
+        if stale:
+            tmp_path = output_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.writelines(kept)
+            os.replace(tmp_path, output_path)
+        elif valid_size != os.path.getsize(output_path):
+            # A crash can leave a partial record at the end of the file
+            with open(output_path, 'r+b') as f:
+                f.truncate(valid_size)
+        return done
+
+# ====================
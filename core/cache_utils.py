@@ -0,0 +1,61 @@
+# ===== core/cache_utils.py =====
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+_keys_lock = threading.Lock()
+
+def cache_root() -> str:
+    '''Get the per-user directory for the tool's on-disk caches'''
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pdf-labeling-tool')
+
+def content_hash(file_path: str) -> str:
+    '''Hash a file's bytes, so renamed or copied PDFs share cached data'''
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def document_key(pdf_path: str) -> str:
+    '''Get a PDF's content hash, reusing the last one if the file is unchanged'''
+    # Hashing a large batch PDF takes a while, so hashes are remembered
+    # by path, size and modification time
+    path = os.path.abspath(pdf_path)
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    with _keys_lock:
+        keys = _read_keys()
+        entry = keys.get(path)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+
+    key = content_hash(path)
+    with _keys_lock:
+        keys = _read_keys()
+        keys[path] = stamp + [key]
+        _write_keys(keys)
+    return key
+
+def _read_keys() -> dict:
+    try:
+        with open(os.path.join(cache_root(), 'documents.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_keys(keys: dict):
+    os.makedirs(cache_root(), exist_ok=True)
+    path = os.path.join(cache_root(), 'documents.json')
+    # Other processes of the tool write this file too, so each write gets
+    # its own temporary file before atomically replacing it
+    with tempfile.NamedTemporaryFile('w', dir=cache_root(), prefix='documents.', suffix='.tmp',
+                                     delete=False) as f:
+        json.dump(keys, f)
+    os.replace(f.name, path)
+
+# ====================
@@ -0,0 +1,253 @@
+# ===== core/dataset_export.py =====
+
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, List, Optional, Tuple
+from core.batch_extractor import Template
+from core.lazy_import import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+FORMATS = ('coco', 'yolo')
+IMAGE_FORMATS = ('png', 'jpg')
+
+_worker_options: dict = {}
+_worker_doc: Optional[Tuple[str, 'fitz.Document']] = None
+
+def category_names(template: Template) -> List[str]:
+    '''Get the distinct label texts of a template in first-seen order'''
+    names = {}
+    for page_num in sorted(template):
+        for text, _ in template[page_num]:
+            names.setdefault(text, None)
+    return list(names)
+
+def safe_name(text: str) -> str:
+    '''Turn a label text into a file or directory name'''
+    return re.sub(r'[^\w.-]+', '_', text).strip('._') or 'label'
+
+def page_stem(file_path: str, doc_index: int, page_num: int) -> str:
+    '''Get the unique file name stem of one exported page'''
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return f'{doc_index:05d}-{safe_name(name)}-p{page_num + 1:04d}'
+
+def export_page(file_path: str, doc_index: int, page_num: int, labels: List[Tuple[str, Tuple[float, float, float, float]]],
+                out_dir: str, dpi: int, image_format: str, crops: bool) -> dict:
+    '''Render one page once, write it and the crops of its boxes, and describe the result'''
+    global _worker_doc
+    record = {'file': file_path, 'page': page_num, 'image': None, 'width': 0, 'height': 0,
+              'boxes': [], 'labels': [], 'error': None}
+    try:
+        # Pages of a document arrive together, so keep its handle open
+        if _worker_doc is None or _worker_doc[0] != file_path:
+            if _worker_doc is not None:
+                _worker_doc[1].close()
+            _worker_doc = (file_path, fitz.open(file_path))
+        doc = _worker_doc[1]
+        if page_num >= len(doc):
+            record['error'] = f'page {page_num + 1} not in document'
+            return record
+
+        page = doc[page_num]
+        pix = page.get_pixmap(dpi=dpi, alpha=False, colorspace=fitz.csRGB)
+        stem = page_stem(file_path, doc_index, page_num)
+        # Annotation files always use forward slashes
+        image = f'images/{stem}.{image_format}'
+        pix.save(os.path.join(out_dir, 'images', f'{stem}.{image_format}'))
+        record.update(image=image, width=pix.width, height=pix.height)
+
+        # Boxes in PDF points become pixel boxes clipped to the render
+        scale = dpi / 72
+        origin = np.array([page.rect.x0, page.rect.y0] * 2, dtype=np.float64)
+        boxes = (np.array([bbox for _, bbox in labels], dtype=np.float64).reshape(-1, 4) - origin) * scale
+        boxes = np.clip(np.round(boxes), 0, [pix.width, pix.height] * 2).astype(np.int64)
+
+        samples = None
+        if crops:
+            samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+            samples = samples[:, :pix.width * 3].reshape(pix.height, pix.width, 3)
+
+        for i, ((text, _), (x0, y0, x1, y1)) in enumerate(zip(labels, boxes.tolist())):
+            if x1 <= x0 or y1 <= y0:
+                continue
+            record['boxes'].append([x0, y0, x1, y1])
+            record['labels'].append(text)
+            if samples is not None:
+                # Every crop is a slice of the one page render
+                crop = np.ascontiguousarray(samples[y0:y1, x0:x1])
+                crop_pix = fitz.Pixmap(fitz.csRGB, x1 - x0, y1 - y0, crop.tobytes(), False)
+                crop_pix.save(os.path.join(out_dir, 'crops', safe_name(text), f'{stem}-{i}.{image_format}'))
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+def _init_worker(options: dict):
+    global _worker_options
+    _worker_options = options
+
+def _export_in_worker(file_path: str, doc_index: int, page_num: int,
+                      labels: List[Tuple[str, Tuple[float, float, float, float]]]) -> dict:
+    return export_page(file_path, doc_index, page_num, labels, **_worker_options)
+
+class CocoWriter:
+    '''Streams a COCO detection annotation file'''
+
+    def __init__(self, out_dir: str, categories: List[str]):
+        self.category_ids = {name: i + 1 for i, name in enumerate(categories)}
+        self.path = os.path.join(out_dir, 'annotations.json')
+        self.image_count = 0
+        self.annotation_count = 0
+
+        # Images go straight into the output; annotations are spooled to a
+        # second file and appended after the images array is closed
+        self._out = open(self.path, 'w', encoding='utf-8')
+        self._annotations = open(self.path + '.annotations.tmp', 'w+', encoding='utf-8')
+        categories = [{'id': i, 'name': name} for name, i in self.category_ids.items()]
+        self._out.write('{"info": {"description": "pdf-labeling-tool export"}, '
+                        f'"categories": {json.dumps(categories, ensure_ascii=False)}, "images": [\n')
+
+    def add(self, record: dict):
+        self.image_count += 1
+        image_id = self.image_count
+        image = {'id': image_id, 'file_name': record['image'], 'width': record['width'],
+                 'height': record['height'], 'source': record['file'], 'page': record['page']}
+        self._out.write(('' if image_id == 1 else ',\n') + json.dumps(image, ensure_ascii=False))
+
+        for (x0, y0, x1, y1), text in zip(record['boxes'], record['labels']):
+            self.annotation_count += 1
+            annotation = {'id': self.annotation_count, 'image_id': image_id,
+                          'category_id': self.category_ids[text], 'bbox': [x0, y0, x1 - x0, y1 - y0],
+                          'area': (x1 - x0) * (y1 - y0), 'iscrowd': 0}
+            self._annotations.write(('' if self.annotation_count == 1 else ',\n') + json.dumps(annotation))
+
+    def close(self):
+        self._out.write('\n], "annotations": [\n')
+        self._annotations.seek(0)
+        shutil.copyfileobj(self._annotations, self._out)
+        self._out.write('\n]}\n')
+        self._out.close()
+        self._annotations.close()
+        os.remove(self.path + '.annotations.tmp')
+
+class YoloWriter:
+    '''Writes one YOLO label file per page image and the class list'''
+
+    def __init__(self, out_dir: str, categories: List[str]):
+        self.out_dir = out_dir
+        self.class_ids = {name: i for i, name in enumerate(categories)}
+        self.image_count = 0
+        self.annotation_count = 0
+        os.makedirs(os.path.join(out_dir, 'labels'), exist_ok=True)
+        with open(os.path.join(out_dir, 'classes.txt'), 'w', encoding='utf-8') as f:
+            f.write(''.join(name + '\n' for name in categories))
+
+    def add(self, record: dict):
+        self.image_count += 1
+        width, height = record['width'], record['height']
+        lines = []
+        for (x0, y0, x1, y1), text in zip(record['boxes'], record['labels']):
+            lines.append(f'{self.class_ids[text]} {(x0 + x1) / 2 / width:.6f} {(y0 + y1) / 2 / height:.6f} '
+                         f'{(x1 - x0) / width:.6f} {(y1 - y0) / height:.6f}\n')
+        self.annotation_count += len(lines)
+        stem = os.path.splitext(os.path.basename(record['image']))[0]
+        with open(os.path.join(self.out_dir, 'labels', stem + '.txt'), 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+
+    def close(self):
+        pass
+
+class DatasetExporter:
+    '''Exports labeled regions of many PDFs as page images, crops and annotations'''
+
+    def __init__(self, template: Template, out_dir: str, fmt: str = 'coco', dpi: int = 150,
+                 image_format: str = 'png', crops: bool = True, workers: Optional[int] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f'Unknown dataset format: {fmt}')
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f'Unknown image format: {image_format}')
+        self.template = template
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.dpi = dpi
+        self.image_format = image_format
+        self.crops = crops
+        self.workers = workers or os.cpu_count() or 1
+
+        # Statistics of the last run
+        self.total_pages = 0
+        self.pages = 0
+        self.annotations = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.elapsed = 0.0
+
+    def run(self, pdf_paths: Iterable[str], on_progress: Optional[Callable[['DatasetExporter'], None]] = None,
+            cancel: Optional[Callable[[], bool]] = None):
+        '''Export every labeled page of every document'''
+        pdf_paths = list(pdf_paths)
+        categories = category_names(self.template)
+        pages = [p for p in sorted(self.template) if self.template[p]]
+        self.total_pages = len(pdf_paths) * len(pages)
+        self.pages = self.annotations = self.failed = 0
+        self.errors = []
+
+        os.makedirs(os.path.join(self.out_dir, 'images'), exist_ok=True)
+        if self.crops:
+            for name in categories:
+                os.makedirs(os.path.join(self.out_dir, 'crops', safe_name(name)), exist_ok=True)
+
+        options = {'out_dir': self.out_dir, 'dpi': self.dpi, 'image_format': self.image_format, 'crops': self.crops}
+        writer = CocoWriter(self.out_dir, categories) if self.fmt == 'coco' else YoloWriter(self.out_dir, categories)
+        start = time.perf_counter()
+        # Spawned workers do not inherit the GUI process's threads or Tk state
+        context = multiprocessing.get_context('spawn')
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                                     initargs=(options,)) as pool:
+                # Keep a bounded number of pages in flight so memory stays flat
+                tasks = ((path, i, p) for i, path in enumerate(pdf_paths) for p in pages)
+                in_flight = set()
+                max_in_flight = self.workers * 4
+
+                while True:
+                    if cancel is not None and cancel():
+                        for future in in_flight:
+                            future.cancel()
+                        break
+                    for file_path, doc_index, page_num in tasks:
+                        in_flight.add(pool.submit(_export_in_worker, file_path, doc_index, page_num,
+                                                  self.template[page_num]))
+                        if len(in_flight) >= max_in_flight:
+                            break
+                    if not in_flight:
+                        break
+
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record = future.result()
+                        if record['error']:
+                            self.failed += 1
+                            self.errors.append(f"{record['file']} page {record['page'] + 1}: {record['error']}")
+                            continue
+                        writer.add(record)
+                        self.pages += 1
+                        self.annotations += len(record['boxes'])
+
+                    self.elapsed = time.perf_counter() - start
+                    if on_progress:
+                        on_progress(self)
+        finally:
+            writer.close()
+        self.elapsed = time.perf_counter() - start
+
+    def pages_per_second(self) -> float:
+        '''Get throughput of the last run'''
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+# ====================
@@ -0,0 +1,106 @@
+# ===== core/label_db.py =====
+
+import json
+import sqlite3
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+
+LABEL_DB_EXTENSIONS = ('.db', '.sqlite')
+
+def is_label_db(file_path: str) -> bool:
+    '''Check whether a path names an indexed label database'''
+    return file_path.lower().endswith(LABEL_DB_EXTENSIONS)
+
+class LabelDatabase:
+    '''SQLite label container indexed by page, read one page at a time'''
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        # Documents are opened on a worker thread and then used from the UI
+        # thread, so the connection is shared and serialized by a lock
+        self.conn = sqlite3.connect(file_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS labels (
+                page INTEGER NOT NULL,
+                x1 REAL NOT NULL, y1 REAL NOT NULL, x2 REAL NOT NULL, y2 REAL NOT NULL,
+                label TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS labels_page ON labels (page);
+        ''')
+
+    def page_counts(self) -> Dict[int, int]:
+        '''Get the number of labels on every page'''
+        with self._lock:
+            rows = self.conn.execute('SELECT page, COUNT(*) FROM labels GROUP BY page').fetchall()
+        return {page: count for page, count in rows}
+
+    def read_page(self, page_num: int) -> Tuple[np.ndarray, List[str]]:
+        '''Read one page as an (n, 4) box array and its label texts'''
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT x1, y1, x2, y2, label FROM labels WHERE page = ? ORDER BY rowid', (page_num,)
+            ).fetchall()
+        boxes = np.array([r[:4] for r in rows], dtype=np.float64).reshape(-1, 4)
+        return boxes, [r[4] for r in rows]
+
+    def write_page(self, page_num: int, boxes: Iterable, texts: Iterable[str]):
+        '''Replace all labels of one page'''
+        with self._lock, self.conn:
+            self._replace_page(page_num, boxes, texts)
+
+    def write_pages(self, pages: Iterable[Tuple[int, Iterable, Iterable[str]]]):
+        '''Replace several pages in one transaction'''
+        with self._lock, self.conn:
+            for page_num, boxes, texts in pages:
+                self._replace_page(page_num, boxes, texts)
+
+    def clear(self):
+        '''Remove all labels'''
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM labels')
+
+    def close(self):
+        '''Close the database connection'''
+        with self._lock:
+            self.conn.close()
+
+    def _replace_page(self, page_num: int, boxes: Iterable, texts: Iterable[str]):
+        self.conn.execute('DELETE FROM labels WHERE page = ?', (page_num,))
+        self.conn.executemany(
+            'INSERT INTO labels (page, x1, y1, x2, y2, label) VALUES (?, ?, ?, ?, ?, ?)',
+            ((page_num, *map(float, box), text) for box, text in zip(boxes, texts))
+        )
+
+def json_to_db(json_path: str, db_path: str):
+    '''Convert a JSON label file to an indexed label database'''
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    db = LabelDatabase(db_path)
+    try:
+        db.clear()
+        db.write_pages(
+            (int(page_num_str), [ld['bbox'] for ld in labels_data], [ld['label'] for ld in labels_data])
+            for page_num_str, labels_data in data.items()
+        )
+    finally:
+        db.close()
+
+def db_to_json(db_path: str, json_path: str):
+    '''Convert an indexed label database to a JSON label file, one page at a time'''
+    db = LabelDatabase(db_path)
+    try:
+        with open(json_path, 'w') as f:
+            f.write('{')
+            for i, page_num in enumerate(sorted(db.page_counts())):
+                boxes, texts = db.read_page(page_num)
+                labels = [{'x': box[0], 'y': box[1], 'label': text, 'bbox': box}
+                          for box, text in zip(boxes.tolist(), texts)]
+                f.write(('' if i == 0 else ',') + f'\n  "{page_num}": ' + json.dumps(labels))
+            f.write('\n}')
+    finally:
+        db.close()
+
+# ====================
@@ -0,0 +1,196 @@
+# ===== core/label_journal.py =====
+
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+from core.label_store import LabelSnapshot
+
+class LabelJournal:
+    '''Append-only journal of label edits with background autosave and compaction'''
+
+    def __init__(self, base_path: str, compact_every: int = 5000, autosave_interval: float = 2.0):
+        self.snapshot_path = base_path + '.labels.snapshot.json'
+        self.journal_path = base_path + '.labels.journal'
+        self.compact_every = compact_every
+        self.autosave_interval = autosave_interval
+
+        self.seq = 0
+        self.ops_since_compact = 0
+        # Why the last background write failed, until the owner takes it
+        self.error: Optional[str] = None
+
+        self._file = None
+        self._file_lock = threading.Lock()
+        self._pending_snapshot = None
+        # Set whenever no snapshot is waiting to be written
+        self._snapshot_written = threading.Event()
+        self._snapshot_written.set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def exists(self) -> bool:
+        '''Check whether a snapshot or journal of earlier edits is on disk'''
+        return any(os.path.exists(p) for p in (self.snapshot_path, self.journal_path, self.journal_path + '.old'))
+
+    def replay(self, manager):
+        '''Rebuild a manager's labels from the snapshot plus journal on disk'''
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+            snapshot_seq = snapshot['seq']
+            manager.restore_snapshot(snapshot)
+
+        self.seq = snapshot_seq
+        # A rotated journal exists if a compaction did not finish
+        for path in (self.journal_path + '.old', self.journal_path):
+            ops, valid_size = _read_ops(path)
+            if ops is None:
+                continue
+            for op in ops:
+                if op['seq'] > snapshot_seq:
+                    manager.apply_op(op)
+                    self.seq = op['seq']
+                    self.ops_since_compact += 1
+
+            # Drop a record torn by a crash so new appends start on a clean line
+            if valid_size != os.path.getsize(path):
+                with open(path, 'r+b') as f:
+                    f.truncate(valid_size)
+
+    def start(self):
+        '''Open the journal for appending and start the autosave thread'''
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._autosave_worker, daemon=True)
+        self._thread.start()
+
+    def record(self, op: dict, manager):
+        '''Append one edit operation to the journal'''
+        self.seq += 1
+        op['seq'] = self.seq
+        with self._file_lock:
+            self._file.write(json.dumps(op) + '\n')
+        self.ops_since_compact += 1
+        if self.ops_since_compact >= self.compact_every:
+            self.compact(manager)
+
+    def compact(self, manager, wait: bool = False):
+        '''Rotate the journal and have the autosave thread write a snapshot'''
+        # Periodic compactions are skipped while a snapshot is still pending;
+        # with wait the pending one is written first so this one is not lost
+        if self._pending_snapshot is not None:
+            if not wait:
+                return
+            self.wait_for_snapshot()
+
+        with self._file_lock:
+            self._file.flush()
+            # A leftover rotated journal is covered by this snapshot as well,
+            # so only rotate when there is none
+            if not os.path.exists(self.journal_path + '.old'):
+                self._file.close()
+                os.replace(self.journal_path, self.journal_path + '.old')
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._pending_snapshot = (self.seq, manager.snapshot())
+            self._snapshot_written.clear()
+
+        self.ops_since_compact = 0
+        self._wake.set()
+
+    def wait_for_snapshot(self):
+        '''Block until the pending snapshot, if any, is on disk'''
+        self._wake.set()
+        while not self._snapshot_written.is_set():
+            if self._thread is None or not self._thread.is_alive():
+                # Nothing else writes it once the autosave thread is gone
+                self._write_pending()
+            else:
+                self._snapshot_written.wait(self.autosave_interval)
+
+    def close(self, manager):
+        '''Write a final snapshot and stop the autosave thread'''
+        self.compact(manager, wait=True)
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with self._file_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _autosave_worker(self):
+        '''Periodically flush the journal to disk and write pending snapshots'''
+        while True:
+            self._wake.wait(self.autosave_interval)
+            self._wake.clear()
+            # Read before the snapshot so a final compaction is never missed
+            stopping = self._stop.is_set()
+            try:
+                self._sync()
+            except OSError as e:
+                self.error = str(e)
+            self._write_pending()
+
+            if stopping:
+                return
+
+    def _write_pending(self):
+        '''Write the pending snapshot, recording a failure instead of raising'''
+        pending = self._pending_snapshot
+        if pending is None:
+            return
+        try:
+            self._write_snapshot(*pending)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self._pending_snapshot = None
+            self._snapshot_written.set()
+
+    def _sync(self):
+        with self._file_lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def _write_snapshot(self, seq: int, snapshot: LabelSnapshot):
+        '''Atomically replace the snapshot file, then drop the rotated journal'''
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            data = {'seq': seq, 'labels': snapshot.to_dict()}
+            if snapshot.backing:
+                data['backing'] = snapshot.backing
+                data['overrides'] = sorted(snapshot.page_rows)
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        old_path = self.journal_path + '.old'
+        if os.path.exists(old_path):
+            os.remove(old_path)
+
+def _read_ops(path: str) -> Tuple[Optional[List[dict]], int]:
+    '''Read operations from a journal file up to a torn last line'''
+    if not os.path.exists(path):
+        return None, 0
+
+    ops = []
+    valid_size = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                break
+            valid_size += len(line)
+    return ops, valid_size
+
+# ====================
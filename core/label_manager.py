@@ -1,59 +1,394 @@
-# ===== core/label_manager.py =====
-
-import json
-from typing import Dict, List
-from models.label import Label
-
-class LabelManager:
-    '''Manages labels for all pages'''
-    
-    def __init__(self):
-        self.labels: Dict[int, List[Label]] = {}
-    
-    def add_label(self, page_num: int, label: Label):
-        '''Add a label to a specific page'''
-        if page_num not in self.labels:
-            self.labels[page_num] = []
-        self.labels[page_num].append(label)
-    
-    def get_labels(self, page_num: int) -> List[Label]:
-        '''Get all labels for a specific page'''
-        return self.labels.get(page_num, [])
-    
-    def delete_label(self, page_num: int, index: int):
-        '''Delete a label by index from a specific page'''
-        if page_num in self.labels and 0 <= index < len(self.labels[page_num]):
-            del self.labels[page_num][index]
-    
-    def clear_page(self, page_num: int):
-        '''Clear all labels from a specific page'''
-        if page_num in self.labels:
-            self.labels[page_num] = []
-    
-    def clear_all(self):
-        '''Clear all labels from all pages'''
-        self.labels = {}
-    
-    def get_total_labels(self) -> int:
-        '''Get total number of labels across all pages'''
-        return sum(len(labels) for labels in self.labels.values())
-    
-    def save_to_file(self, file_path: str):
-        '''Save labels to JSON file'''
-        data = {}
-        for page_num, labels in self.labels.items():
-            data[str(page_num)] = [label.to_dict() for label in labels]
-        
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    def load_from_file(self, file_path: str):
-        '''Load labels from JSON file'''
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        self.labels = {}
-        for page_num_str, labels_data in data.items():
-            page_num = int(page_num_str)
-            self.labels[page_num] = [Label.from_dict(ld) for ld in labels_data]
-# ====================
\ No newline at end of file
+# ===== core/label_manager.py =====
+
+import json
+import os
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from core.label_db import LabelDatabase, is_label_db
+from core.label_journal import LabelJournal
+from core.label_store import LabelSnapshot, LabelStore
+from core.metrics import timed
+from core.spatial_index import GridIndex
+from models.label import Label
+
+class LabelManager:
+    '''Manages labels for all pages'''
+
+    # Spatial indexes are built on demand for this many recently queried pages
+    MAX_INDEXED_PAGES = 16
+
+    def __init__(self, max_loaded_labels: int = 250000):
+        self.store = LabelStore()
+        self.indexes: 'OrderedDict[int, GridIndex]' = OrderedDict()
+        self.journal: Optional[LabelJournal] = None
+        # Creates the journal on the first edit, see defer_journal()
+        self.journal_factory: Optional[Callable[[], LabelJournal]] = None
+        # Why autosave is disabled, if a journal could not be created
+        self.journal_error: Optional[str] = None
+
+        # Lazily loaded pages of an indexed label database
+        self.backing: Optional[LabelDatabase] = None
+        self.max_loaded_labels = max_loaded_labels
+        self._unloaded: Dict[int, int] = {}
+        self._loaded: 'OrderedDict[int, None]' = OrderedDict()
+        self._dirty: Set[int] = set()
+        # Page shown on the canvas, whose rows it holds, so it is never evicted
+        self.pinned_page: Optional[int] = None
+
+    def add_label(self, page_num: int, label: Label):
+        '''Add a label to a specific page'''
+        self._ensure_page(page_num, dirty=True)
+        label.row = self.store.append(page_num, label.bbox, label.label_text)
+        index = self.indexes.get(page_num)
+        if index is not None:
+            index.insert(label.row, label.bbox)
+        self._record({'op': 'add', 'page': page_num, 'label': label.label_text,
+                      'bbox': [float(v) for v in label.bbox]})
+
+    def get_labels(self, page_num: int) -> List[Label]:
+        '''Get all labels for a specific page'''
+        self._ensure_page(page_num)
+        rows = self.store.page_rows(page_num)
+        return [self._view(row) for row in rows.tolist()]
+
+    def get_label_count(self, page_num: int) -> int:
+        '''Get number of labels on a specific page'''
+        if page_num in self._unloaded:
+            return self._unloaded[page_num]
+        return self.store.count(page_num)
+
+    def get_page_boxes(self, page_num: int, scale: float = 1.0) -> np.ndarray:
+        '''Get an (n, 4) array of a page's boxes, scaled from PDF points'''
+        self._ensure_page(page_num)
+        return self.store.page_boxes(page_num, scale)
+
+    def get_page_text_ids(self, page_num: int) -> Tuple[np.ndarray, List[str]]:
+        '''Get the interned text id of each label on a page, and the text table'''
+        self._ensure_page(page_num)
+        return self.store.text_id[self.store.page_rows(page_num)], self.store.texts
+
+    def get_label(self, page_num: int, index: int) -> Optional[Label]:
+        '''Get a view of the label at a position on a page'''
+        self._ensure_page(page_num)
+        rows = self.store.page_rows(page_num)
+        return self._view(int(rows[index])) if 0 <= index < len(rows) else None
+
+    def get_text_id(self, label_text: str) -> int:
+        '''Get the interned id of a label text, as returned by get_page_text_ids()'''
+        return self.store.intern(label_text)
+
+    def get_pages(self) -> List[int]:
+        '''Get page numbers that have labels'''
+        return sorted(set(self.store.pages()) | set(self._unloaded))
+
+    def delete_label(self, page_num: int, index: int) -> Optional[Label]:
+        '''Delete a label by index from a specific page'''
+        self._ensure_page(page_num, dirty=True)
+        if 0 <= index < self.store.count(page_num):
+            label = self._view(int(self.store.page_rows(page_num)[index]))
+            self.store.remove(page_num, index)
+            spatial = self.indexes.get(page_num)
+            if spatial is not None:
+                spatial.remove(label.row)
+            self._record({'op': 'delete', 'page': page_num, 'index': index})
+            return label
+        return None
+
+    def remove_label(self, page_num: int, label: Label) -> bool:
+        '''Delete a specific label from a page'''
+        index = self.index_of(page_num, label)
+        if index < 0:
+            return False
+        self.delete_label(page_num, index)
+        return True
+
+    def index_of(self, page_num: int, label: Label) -> int:
+        '''Get the list position of a label on a page, or -1'''
+        if label.row is None:
+            return -1
+        self._ensure_page(page_num)
+        positions = np.flatnonzero(self.store.page_rows(page_num) == label.row)
+        return int(positions[0]) if len(positions) else -1
+
+    def find_labels_at(self, page_num: int, x: float, y: float) -> List[Label]:
+        '''Get labels containing a point, topmost (last drawn) first'''
+        return [self._view(row) for row in self._get_index(page_num).query_point(x, y)]
+
+    def find_labels_in_rect(self, page_num: int, rect: Tuple[float, float, float, float]) -> List[Label]:
+        '''Get labels overlapping a rectangle, in page order'''
+        return [self._view(row) for row in self._get_index(page_num).query_rect(rect)]
+
+    def find_nearest_label(self, page_num: int, x: float, y: float,
+                           max_distance: Optional[float] = None) -> Optional[Label]:
+        '''Get the label closest to a point'''
+        row = self._get_index(page_num).nearest(x, y, max_distance)
+        return self._view(row) if row is not None else None
+
+    def clear_page(self, page_num: int):
+        '''Clear all labels from a specific page'''
+        self._ensure_page(page_num, dirty=True)
+        self.store.clear_page(page_num)
+        self.indexes.pop(page_num, None)
+        self._record({'op': 'clear', 'page': page_num})
+
+    def copy_page_labels(self, page_num: int, target_pages: List[int], replace: bool = True) -> int:
+        '''Copy a page's labels onto other pages in one operation, returning labels added'''
+        boxes, texts = self._read_page(page_num)
+        targets = [p for p in target_pages if p != page_num]
+        for target in targets:
+            self._ensure_page(target, dirty=True)
+            if replace:
+                self.store.clear_page(target)
+            self.store.extend(target, boxes, texts)
+            self.indexes.pop(target, None)
+        self._record({'op': 'copy', 'page': page_num, 'pages': targets, 'replace': replace})
+        return len(texts) * len(targets)
+
+    def clear_all(self):
+        '''Clear all labels from all pages'''
+        self._reset()
+        self._record({'op': 'clear_all'})
+
+    def open_backing(self, file_path: str):
+        '''Use an indexed label database, loading its pages on first access'''
+        self._reset()
+        self.backing = LabelDatabase(file_path)
+        self._unloaded = self.backing.page_counts()
+
+    def snapshot(self) -> LabelSnapshot:
+        '''Get a frozen view of the labels for saving from another thread'''
+        if self.backing:
+            # Only pages that differ from the database need to be written
+            return self.store.snapshot(sorted(self._dirty), self.backing.file_path)
+        return self.store.snapshot()
+
+    def restore_snapshot(self, data: dict):
+        '''Restore labels written from a snapshot'''
+        if not data.get('backing'):
+            self.load_from_dict(data['labels'])
+            return
+
+        self.open_backing(data['backing'])
+        for page_num in data['overrides']:
+            labels_data = data['labels'].get(str(page_num), [])
+            self._unloaded.pop(page_num, None)
+            self.store.clear_page(page_num)
+            self.store.extend(page_num, [ld['bbox'] for ld in labels_data],
+                              [ld['label'] for ld in labels_data])
+            self._loaded[page_num] = None
+            self._dirty.add(page_num)
+
+    def compact_store(self):
+        '''Reclaim rows of deleted and evicted labels. Invalidates existing Label views.'''
+        dead = self.store.size - self.store.count()
+        if dead > 10000 and dead > self.store.count():
+            self.store.compact()
+            self.indexes.clear()
+
+    def attach_journal(self, journal: LabelJournal):
+        '''Recover labels from a journal and record every later edit to it'''
+        self.detach_journal()
+        self._reset()
+        journal.replay(self)
+        journal.start()
+        self.journal = journal
+
+    def defer_journal(self, factory: Callable[[], LabelJournal]):
+        '''Create a journal with factory on the first edit, so unedited documents write no files'''
+        self.journal_factory = factory
+
+    def detach_journal(self):
+        '''Write a final snapshot and stop journaling'''
+        self.journal_factory = None
+        if self.journal:
+            journal, self.journal = self.journal, None
+            journal.close(self)
+            self._take_journal_error(journal)
+
+    def apply_op(self, op: dict):
+        '''Apply one journaled edit operation'''
+        kind = op['op']
+        if kind == 'add':
+            bbox = tuple(op['bbox'])
+            self.add_label(op['page'], Label(bbox[0], bbox[1], op['label'], bbox))
+        elif kind == 'delete':
+            self.delete_label(op['page'], op['index'])
+        elif kind == 'clear':
+            self.clear_page(op['page'])
+        elif kind == 'clear_all':
+            self.clear_all()
+        elif kind == 'copy':
+            self.copy_page_labels(op['page'], op['pages'], op['replace'])
+
+    def _record(self, op: dict):
+        '''Append an edit to the journal, if one is attached'''
+        if self.journal:
+            self.journal.record(op, self)
+            self._take_journal_error(self.journal)
+        elif self.journal_factory:
+            self._start_journal()
+
+    def _take_journal_error(self, journal: LabelJournal):
+        '''Report a failed background write of the journal through journal_error'''
+        if journal.error:
+            self.journal_error, journal.error = journal.error, None
+
+    def _start_journal(self):
+        '''Create a deferred journal, starting it from a snapshot of the current labels'''
+        factory, self.journal_factory = self.journal_factory, None
+        try:
+            journal = factory()
+            journal.start()
+        except OSError as e:
+            self.journal_error = str(e)
+            return
+        self.journal = journal
+        # The edit that triggered this is already applied, so the snapshot covers it
+        journal.compact(self, wait=True)
+
+    def _ensure_page(self, page_num: int, dirty: bool = False):
+        '''Materialize a page from the backing database on first access'''
+        if self.backing is None:
+            return
+
+        if page_num in self._unloaded:
+            del self._unloaded[page_num]
+            boxes, texts = self.backing.read_page(page_num)
+            self.store.extend(page_num, boxes, texts)
+            self._loaded[page_num] = None
+            self._evict(keep=page_num)
+        elif page_num in self._loaded:
+            self._loaded.move_to_end(page_num)
+        else:
+            self._loaded[page_num] = None
+
+        if dirty:
+            self._dirty.add(page_num)
+
+    def pin_page(self, page_num: Optional[int]):
+        '''Keep a page loaded while it is displayed, or unpin with None'''
+        self.pinned_page = page_num
+
+    def _evict(self, keep: int):
+        '''Unload least recently used unmodified pages while over the memory cap'''
+        loaded = self.store.count()
+        for page_num in list(self._loaded):
+            if loaded <= self.max_loaded_labels:
+                break
+            if page_num == keep or page_num == self.pinned_page or page_num in self._dirty:
+                continue
+            count = self.store.count(page_num)
+            self.store.clear_page(page_num)
+            self.indexes.pop(page_num, None)
+            del self._loaded[page_num]
+            self._unloaded[page_num] = count
+            loaded -= count
+
+    def _reset(self):
+        '''Drop all labels and any backing database'''
+        self.store.clear()
+        self.indexes.clear()
+        if self.backing:
+            self.backing.close()
+            self.backing = None
+        self._unloaded = {}
+        self._loaded.clear()
+        self._dirty = set()
+
+    def _view(self, row: int) -> Label:
+        '''Build a lightweight Label view of a stored row'''
+        x1, y1, x2, y2 = self.store.boxes[row].tolist()
+        text = self.store.texts[self.store.text_id[row]]
+        return Label(x1, y1, text, (x1, y1, x2, y2), row)
+
+    def _get_index(self, page_num: int) -> GridIndex:
+        '''Get the spatial index for a page, building it from the store if needed'''
+        index = self.indexes.get(page_num)
+        if index is not None:
+            self.indexes.move_to_end(page_num)
+            return index
+
+        index = GridIndex()
+        self._ensure_page(page_num)
+        rows = self.store.page_rows(page_num)
+        for row, bbox in zip(rows.tolist(), self.store.boxes[rows].tolist()):
+            index.insert(row, bbox)
+
+        self.indexes[page_num] = index
+        if len(self.indexes) > self.MAX_INDEXED_PAGES:
+            self.indexes.popitem(last=False)
+        return index
+
+    def get_total_labels(self) -> int:
+        '''Get total number of labels across all pages'''
+        return self.store.count() + sum(self._unloaded.values())
+
+    @timed('save_labels')
+    def save_to_file(self, file_path: str):
+        '''Save labels to a JSON file or label database, with boxes in PDF points'''
+        if is_label_db(file_path):
+            self._save_to_db(file_path)
+            return
+
+        data = {}
+        for page_num in self.get_pages():
+            boxes, texts = self._read_page(page_num)
+            data[str(page_num)] = [{'x': box[0], 'y': box[1], 'label': text, 'bbox': box}
+                                   for box, text in zip(boxes.tolist(), texts)]
+
+        with open(file_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def _save_to_db(self, file_path: str):
+        '''Write labels to an indexed label database'''
+        if self.backing and os.path.exists(file_path) and os.path.samefile(file_path, self.backing.file_path):
+            # Saving over the backing database only rewrites modified pages
+            self.backing.write_pages((p, *self._read_page(p)) for p in sorted(self._dirty))
+            self._dirty.clear()
+            # The journaled edits are in the database now; a snapshot without
+            # overrides must be on disk before returning so replay after a
+            # crash does not apply them a second time
+            if self.journal:
+                self.journal.compact(self, wait=True)
+                self.journal.wait_for_snapshot()
+            return
+
+        db = LabelDatabase(file_path)
+        try:
+            db.clear()
+            db.write_pages((p, *self._read_page(p)) for p in self.get_pages())
+        finally:
+            db.close()
+
+    def _read_page(self, page_num: int) -> Tuple[np.ndarray, List[str]]:
+        '''Get a page's boxes and texts without materializing it'''
+        if page_num in self._unloaded:
+            return self.backing.read_page(page_num)
+        return self.store.page_boxes(page_num), self.store.page_texts(page_num)
+
+    @timed('load_labels')
+    def load_from_file(self, file_path: str):
+        '''Load labels from a JSON file, or open a label database lazily'''
+        if is_label_db(file_path):
+            self.open_backing(file_path)
+        else:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            self.load_from_dict(data)
+
+        # Bulk loads bypass the journal, so fold them into a new snapshot;
+        # later edits are journaled against it, so it must not be skipped
+        if self.journal:
+            self.journal.compact(self, wait=True)
+        elif self.journal_factory:
+            self._start_journal()
+
+    def load_from_dict(self, data: dict):
+        '''Replace all labels with data in the JSON label file layout'''
+        self._reset()
+        for page_num_str, labels_data in data.items():
+            boxes = [ld['bbox'] for ld in labels_data]
+            texts = [ld['label'] for ld in labels_data]
+            self.store.extend(int(page_num_str), boxes, texts)
+# ====================
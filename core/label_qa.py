@@ -0,0 +1,227 @@
+# ===== core/label_qa.py =====
+
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from core.label_manager import LabelManager
+from models.label import Label
+
+# Pages with up to this many boxes are compared all against all; larger
+# pages use a sweep over boxes sorted by left edge
+DENSE_LIMIT = 512
+# Rows and candidate columns of the sweep compared in one batch
+SWEEP_BLOCK = 256
+SWEEP_COLUMNS = 4096
+
+def normalize_boxes(boxes: np.ndarray) -> np.ndarray:
+    '''Get an (n, 4) float64 array of boxes with x0 <= x1 and y0 <= y1'''
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return np.concatenate([np.minimum(boxes[:, :2], boxes[:, 2:]),
+                           np.maximum(boxes[:, :2], boxes[:, 2:])], axis=1)
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    '''Get the intersection over union of every box in a with every box in b'''
+    inter_w = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+def overlapping_pairs(boxes: np.ndarray, min_iou: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''Find every pair i < j of boxes with IoU of at least min_iou, as index and IoU arrays'''
+    boxes = normalize_boxes(boxes)
+    n = len(boxes)
+    if n <= DENSE_LIMIT:
+        iou = iou_matrix(boxes, boxes)
+        i, j = np.nonzero(np.triu(iou >= min_iou, k=1))
+        return i, j, iou[i, j]
+
+    # Sweep line: after sorting by x0, the boxes that can overlap box k are
+    # the ones after it whose x0 is left of its x1. Blocks of rows are
+    # compared against the window their candidates span, in column chunks
+    # so one very wide box cannot make a huge matrix.
+    order = np.argsort(boxes[:, 0], kind='stable')
+    boxes = boxes[order]
+    window_end = np.searchsorted(boxes[:, 0], boxes[:, 2], side='left')
+    found_i, found_j, found_iou = [], [], []
+    for start in range(0, n, SWEEP_BLOCK):
+        stop = min(start + SWEEP_BLOCK, n)
+        end = int(window_end[start:stop].max())
+        rows = np.arange(start, stop)[:, None]
+        for col_start in range(start + 1, end, SWEEP_COLUMNS):
+            col_stop = min(col_start + SWEEP_COLUMNS, end)
+            iou = iou_matrix(boxes[start:stop], boxes[col_start:col_stop])
+            cols = np.arange(col_start, col_stop)[None, :]
+            mask = (iou >= min_iou) & (cols > rows) & (cols < window_end[start:stop, None])
+            i, j = np.nonzero(mask)
+            found_i.append(i + start)
+            found_j.append(j + col_start)
+            found_iou.append(iou[i, j])
+
+    if not found_i:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    i, j = order[np.concatenate(found_i)], order[np.concatenate(found_j)]
+    # Report pairs with the lower original index first
+    return np.minimum(i, j), np.maximum(i, j), np.concatenate(found_iou)
+
+def duplicate_groups(count: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    '''Label connected components of duplicate pairs, giving each box the lowest index of its group'''
+    group = np.arange(count)
+    if not len(i):
+        return group
+    # Propagate minimum labels along pairs until stable; chains of
+    # duplicates are short, so this converges in a few passes
+    while True:
+        low = np.minimum(group[i], group[j])
+        updated = group.copy()
+        np.minimum.at(updated, i, low)
+        np.minimum.at(updated, j, low)
+        updated = updated[updated]
+        if np.array_equal(updated, group):
+            return group
+        group = updated
+
+def check_page(boxes: np.ndarray, text_ids: np.ndarray, duplicate_iou: float = 0.9,
+               conflict_iou: float = 0.7) -> Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]]]:
+    '''Find duplicate boxes with the same text and overlapping boxes with different texts on one page'''
+    i, j, iou = overlapping_pairs(boxes, min(duplicate_iou, conflict_iou))
+    same = text_ids[i] == text_ids[j]
+    duplicate = same & (iou >= duplicate_iou)
+    conflict = ~same & (iou >= conflict_iou)
+    return (list(zip(i[duplicate].tolist(), j[duplicate].tolist(), iou[duplicate].tolist())),
+            list(zip(i[conflict].tolist(), j[conflict].tolist(), iou[conflict].tolist())))
+
+def merge_duplicates(boxes: np.ndarray, duplicates: List[Tuple[int, int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    '''Collapse each group of duplicates into its first box, placed at the group's mean box'''
+    boxes = normalize_boxes(boxes)
+    pairs = np.array([(i, j) for i, j, _ in duplicates], dtype=np.int64).reshape(-1, 2)
+    group = duplicate_groups(len(boxes), pairs[:, 0], pairs[:, 1])
+    keep = np.flatnonzero(group == np.arange(len(boxes)))
+    sums = np.zeros_like(boxes)
+    np.add.at(sums, group, boxes)
+    sizes = np.bincount(group, minlength=len(boxes))
+    return keep, sums[keep] / sizes[keep, None]
+
+def check_labels(manager: LabelManager, duplicate_iou: float = 0.9, conflict_iou: float = 0.7,
+                 merge: bool = False) -> dict:
+    '''Check every page of a label set, optionally merging duplicates in place'''
+    report = {'pages': 0, 'labels': 0, 'duplicates': [], 'conflicts': [], 'merged': 0}
+    merged_pages = {}
+    for page_num in manager.get_pages():
+        boxes = manager.get_page_boxes(page_num)
+        text_ids, texts = manager.get_page_text_ids(page_num)
+        report['pages'] += 1
+        report['labels'] += len(boxes)
+        duplicates, conflicts = check_page(boxes, text_ids, duplicate_iou, conflict_iou)
+
+        # Labels are identified by their position on the page, as in the label list
+        report['duplicates'].extend({'page': page_num, 'labels': [i, j], 'iou': round(iou, 4),
+                                     'text': texts[text_ids[i]]} for i, j, iou in duplicates)
+        report['conflicts'].extend({'page': page_num, 'labels': [i, j], 'iou': round(iou, 4),
+                                    'texts': [texts[text_ids[i]], texts[text_ids[j]]]} for i, j, iou in conflicts)
+        if merge and duplicates:
+            keep, merged = merge_duplicates(boxes, duplicates)
+            report['merged'] += len(boxes) - len(keep)
+            merged_pages[page_num] = [(texts[t], box) for t, box in zip(text_ids[keep].tolist(), merged.tolist())]
+
+    # Pages are rewritten after the scan so row positions stay valid while checking
+    for page_num, labels in merged_pages.items():
+        manager.clear_page(page_num)
+        for text, bbox in labels:
+            manager.add_label(page_num, Label(bbox[0], bbox[1], text, tuple(bbox)))
+    return report
+
+def check_file(file_path: str, duplicate_iou: float = 0.9, conflict_iou: float = 0.7,
+               output_path: Optional[str] = None) -> dict:
+    '''Check one label file, writing a copy with duplicates merged to output_path if given'''
+    record = {'file': file_path, 'error': None}
+    try:
+        manager = LabelManager()
+        manager.load_from_file(file_path)
+        record.update(check_labels(manager, duplicate_iou, conflict_iou, merge=output_path is not None))
+        if output_path is not None:
+            manager.save_to_file(output_path)
+            record['output'] = output_path
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+class LabelQA:
+    '''Checks many label files for duplicate and conflicting boxes in a process pool'''
+
+    def __init__(self, duplicate_iou: float = 0.9, conflict_iou: float = 0.7,
+                 merge_dir: Optional[str] = None, workers: Optional[int] = None):
+        self.duplicate_iou = duplicate_iou
+        self.conflict_iou = conflict_iou
+        self.merge_dir = merge_dir
+        self.workers = workers or os.cpu_count() or 1
+
+        # Statistics of the last run
+        self.processed = 0
+        self.failed = 0
+        self.labels = 0
+        self.duplicates = 0
+        self.conflicts = 0
+        self.merged = 0
+        self.elapsed = 0.0
+
+    def run(self, label_paths: Iterable[str],
+            on_progress: Optional[Callable[['LabelQA'], None]] = None) -> dict:
+        '''Check every label file and get a JSON-serializable report'''
+        label_paths = list(label_paths)
+        self.processed = self.failed = self.labels = self.duplicates = self.conflicts = self.merged = 0
+        if self.merge_dir:
+            os.makedirs(self.merge_dir, exist_ok=True)
+
+        records: Dict[int, dict] = {}
+        start = time.perf_counter()
+        workers = max(1, min(self.workers, len(label_paths)))
+        # Spawned workers do not inherit the GUI process's threads or Tk state
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(check_file, path, self.duplicate_iou, self.conflict_iou,
+                                   self._output_path(i, label_paths)): i for i, path in enumerate(label_paths)}
+            for future in as_completed(futures):
+                record = future.result()
+                records[futures[future]] = record
+                self.processed += 1
+                if record['error']:
+                    self.failed += 1
+                else:
+                    self.labels += record['labels']
+                    self.duplicates += len(record['duplicates'])
+                    self.conflicts += len(record['conflicts'])
+                    self.merged += record['merged']
+
+                self.elapsed = time.perf_counter() - start
+                if on_progress:
+                    on_progress(self)
+        self.elapsed = time.perf_counter() - start
+
+        return {
+            'settings': {'duplicate_iou': self.duplicate_iou, 'conflict_iou': self.conflict_iou,
+                         'merge_dir': self.merge_dir},
+            'summary': {'files': self.processed, 'failed': self.failed, 'labels': self.labels,
+                        'duplicates': self.duplicates, 'conflicts': self.conflicts,
+                        'merged': self.merged, 'elapsed_s': round(self.elapsed, 3)},
+            # Files in the order they were given
+            'files': [records[i] for i in sorted(records)]
+        }
+
+    def _output_path(self, index: int, label_paths: List[str]) -> Optional[str]:
+        '''Get where the merged copy of a label file goes'''
+        if not self.merge_dir:
+            return None
+        name = os.path.basename(label_paths[index])
+        # Inputs from different directories may share a name
+        if sum(os.path.basename(p) == name for p in label_paths) > 1:
+            name = f'{index:04d}-{name}'
+        return os.path.join(self.merge_dir, name)
+
+# ====================
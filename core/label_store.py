@@ -0,0 +1,168 @@
+# ===== core/label_store.py =====
+
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class LabelStore:
+    '''Columnar label storage with boxes in PDF point space'''
+
+    def __init__(self, capacity: int = 1024):
+        # Each label is a row in parallel columns. Deleted rows are
+        # tombstoned (page -1) so row ids stay stable until compact().
+        self.page = np.full(capacity, -1, dtype=np.int32)
+        # float64 so saved coordinates round-trip exactly as entered
+        self.boxes = np.zeros((capacity, 4), dtype=np.float64)
+        self.text_id = np.zeros(capacity, dtype=np.int32)
+        self.size = 0
+
+        # Interned label texts
+        self.texts: List[str] = []
+        self._text_ids: Dict[str, int] = {}
+
+        # Row ids of each page in drawing order
+        self._page_rows: Dict[int, np.ndarray] = {}
+
+    def append(self, page_num: int, bbox: Tuple[float, float, float, float], text: str) -> int:
+        '''Store one label and return its row id'''
+        row = self._allocate(1)
+        self.page[row] = page_num
+        self.boxes[row] = bbox
+        self.text_id[row] = self.intern(text)
+        self._page_rows[page_num] = np.append(self.page_rows(page_num), np.int32(row))
+        return row
+
+    def extend(self, page_num: int, boxes: np.ndarray, texts: Iterable[str]) -> np.ndarray:
+        '''Store many labels of one page at once and return their row ids'''
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        count = len(boxes)
+        start = self._allocate(count)
+        rows = np.arange(start, start + count, dtype=np.int32)
+        self.page[rows] = page_num
+        self.boxes[rows] = boxes
+        self.text_id[rows] = [self.intern(t) for t in texts]
+        self._page_rows[page_num] = np.concatenate([self.page_rows(page_num), rows])
+        return rows
+
+    def remove(self, page_num: int, position: int) -> int:
+        '''Remove the label at a position within a page and return its row id'''
+        rows = self.page_rows(page_num)
+        row = int(rows[position])
+        self.page[row] = -1
+        self._page_rows[page_num] = np.delete(rows, position)
+        return row
+
+    def clear_page(self, page_num: int):
+        '''Remove every label of a page'''
+        rows = self._page_rows.pop(page_num, None)
+        if rows is not None:
+            self.page[rows] = -1
+
+    def page_rows(self, page_num: int) -> np.ndarray:
+        '''Get row ids of a page in drawing order'''
+        rows = self._page_rows.get(page_num)
+        return rows if rows is not None else np.empty(0, dtype=np.int32)
+
+    def page_boxes(self, page_num: int, scale: float = 1.0) -> np.ndarray:
+        '''Get an (n, 4) array of a page's boxes, scaled from points in one step'''
+        boxes = self.boxes[self.page_rows(page_num)]
+        return boxes * scale if scale != 1.0 else boxes
+
+    def page_texts(self, page_num: int) -> List[str]:
+        '''Get the label texts of a page in drawing order'''
+        texts = self.texts
+        return [texts[i] for i in self.text_id[self.page_rows(page_num)]]
+
+    def pages(self) -> List[int]:
+        '''Get page numbers that have labels'''
+        return sorted(p for p, rows in self._page_rows.items() if len(rows))
+
+    def count(self, page_num: Optional[int] = None) -> int:
+        '''Count labels on one page, or on all pages'''
+        if page_num is not None:
+            return len(self.page_rows(page_num))
+        return sum(len(rows) for rows in self._page_rows.values())
+
+    def intern(self, text: str) -> int:
+        '''Get the id of a label text, adding it to the text table if new'''
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            self.texts.append(text)
+            self._text_ids[text] = text_id
+        return text_id
+
+    def snapshot(self, pages: Optional[List[int]] = None, backing: Optional[str] = None) -> 'LabelSnapshot':
+        '''Get a frozen view of the labels without copying the columns'''
+        # Stored rows are never modified in place and page row arrays are
+        # replaced rather than mutated, so sharing them is safe
+        page_rows = dict(self._page_rows)
+        if pages is not None:
+            page_rows = {p: self.page_rows(p) for p in pages}
+        return LabelSnapshot(page_rows, self.boxes, self.text_id, list(self.texts), backing)
+
+    def compact(self):
+        '''Drop tombstoned rows. Row ids held elsewhere become invalid.'''
+        live = np.flatnonzero(self.page[:self.size] >= 0)
+        remap = np.full(self.size, -1, dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+
+        self.page = self.page[live].copy()
+        self.boxes = self.boxes[live].copy()
+        self.text_id = self.text_id[live].copy()
+        self.size = len(live)
+        self._page_rows = {p: remap[rows] for p, rows in self._page_rows.items() if len(rows)}
+
+    def clear(self):
+        '''Remove all labels'''
+        self.__init__()
+
+    def nbytes(self) -> int:
+        '''Approximate memory held by the columns'''
+        rows = sum(r.nbytes for r in self._page_rows.values())
+        return self.page.nbytes + self.boxes.nbytes + self.text_id.nbytes + rows
+
+    def _allocate(self, count: int) -> int:
+        '''Reserve count rows, growing the columns geometrically'''
+        start = self.size
+        needed = start + count
+        capacity = len(self.page)
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            self.page = _grow(self.page, capacity, -1)
+            self.boxes = _grow(self.boxes, capacity, 0)
+            self.text_id = _grow(self.text_id, capacity, 0)
+        self.size = needed
+        return start
+
+class LabelSnapshot:
+    '''Point-in-time view of a LabelStore that can be serialized from any thread'''
+
+    def __init__(self, page_rows: Dict[int, np.ndarray], boxes: np.ndarray,
+                 text_id: np.ndarray, texts: List[str], backing: Optional[str] = None):
+        self.page_rows = page_rows
+        self.boxes = boxes
+        self.text_id = text_id
+        self.texts = texts
+        # Label database the snapshot's pages override, if any
+        self.backing = backing
+
+    def to_dict(self) -> Dict[str, list]:
+        '''Convert to the JSON label file layout'''
+        data = {}
+        for page_num in sorted(self.page_rows):
+            rows = self.page_rows[page_num]
+            if not len(rows):
+                continue
+            texts = [self.texts[i] for i in self.text_id[rows].tolist()]
+            data[str(page_num)] = [
+                {'x': box[0], 'y': box[1], 'label': text, 'bbox': box}
+                for box, text in zip(self.boxes[rows].tolist(), texts)
+            ]
+        return data
+
+def _grow(column: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full((capacity,) + column.shape[1:], fill, dtype=column.dtype)
+    grown[:len(column)] = column
+    return grown
+
+# ====================
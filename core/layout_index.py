@@ -0,0 +1,158 @@
+# ===== core/layout_index.py =====
+
+import multiprocessing
+import os
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from core.cache_utils import cache_root, document_key
+from core.lazy_import import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+# Pages are fingerprinted as occupancy grids of this many columns and rows
+GRID_SHAPE = (24, 32)
+
+# Drawing operations that put marks on the page
+MARK_TYPES = ('fill-path', 'stroke-path', 'fill-text', 'stroke-text', 'fill-image', 'fill-shade')
+
+def default_cache_dir() -> str:
+    '''Get the per-user directory for cached layout fingerprints'''
+    return os.path.join(cache_root(), 'layout')
+
+def occupancy_grid(rects: np.ndarray, page_rect: Tuple[float, float, float, float],
+                   shape: Tuple[int, int] = GRID_SHAPE) -> np.ndarray:
+    '''Mark the grid cells of a page covered by any of an (n, 4) array of rectangles'''
+    cols, rows = shape
+    x0, y0, x1, y1 = page_rect
+    width, height = max(x1 - x0, 1e-6), max(y1 - y0, 1e-6)
+
+    # Page backgrounds and frames would cover every cell, so they are ignored
+    area = (rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])
+    rects = rects[area < 0.5 * width * height]
+
+    c0 = np.clip(np.floor((rects[:, 0] - x0) / width * cols), 0, cols - 1).astype(np.int32)
+    r0 = np.clip(np.floor((rects[:, 1] - y0) / height * rows), 0, rows - 1).astype(np.int32)
+    # Rules and other zero-width marks still cover one cell
+    c1 = np.maximum(np.clip(np.ceil((rects[:, 2] - x0) / width * cols), 0, cols).astype(np.int32), c0 + 1)
+    r1 = np.maximum(np.clip(np.ceil((rects[:, 3] - y0) / height * rows), 0, rows).astype(np.int32), r0 + 1)
+
+    # Fill all rectangles at once with a 2D difference array
+    diff = np.zeros((rows + 1, cols + 1), dtype=np.int32)
+    np.add.at(diff, (r0, c0), 1)
+    np.add.at(diff, (r0, c1), -1)
+    np.add.at(diff, (r1, c0), -1)
+    np.add.at(diff, (r1, c1), 1)
+    return diff.cumsum(axis=0).cumsum(axis=1)[:rows, :cols] > 0
+
+def fingerprint_pages(pdf_path: str, pages: List[int],
+                      shape: Tuple[int, int] = GRID_SHAPE) -> Tuple[np.ndarray, np.ndarray]:
+    '''Get the flattened occupancy grid and size of some pages'''
+    grids = np.zeros((len(pages), shape[0] * shape[1]), dtype=bool)
+    sizes = np.zeros((len(pages), 2), dtype=np.float32)
+    with fitz.open(pdf_path) as doc:
+        for i, page_num in enumerate(pages):
+            page = doc[page_num]
+            # The bbox log lists every drawing operation without building
+            # path objects, so it is much cheaper than get_drawings()
+            rects = np.array([rect for kind, rect in page.get_bboxlog() if kind in MARK_TYPES],
+                             dtype=np.float32).reshape(-1, 4)
+            rect = page.rect
+            grids[i] = occupancy_grid(rects, (rect.x0, rect.y0, rect.x1, rect.y1), shape).ravel()
+            sizes[i] = (rect.width, rect.height)
+    return grids, sizes
+
+class LayoutIndex:
+    '''Coarse layout fingerprints of every page, for finding pages that share a form'''
+
+    def __init__(self, grids: np.ndarray, sizes: np.ndarray):
+        # One row per page: flattened occupancy grid and page size in points
+        self.grids = grids
+        self.sizes = sizes
+
+    @classmethod
+    def build(cls, pdf_path: str, workers: Optional[int] = None, chunk_size: int = 128,
+              cancel: Optional[threading.Event] = None) -> Optional['LayoutIndex']:
+        '''Fingerprint every page in a process pool; returns None if cancelled'''
+        with fitz.open(pdf_path) as doc:
+            total_pages = len(doc)
+        chunks = [list(range(i, min(i + chunk_size, total_pages)))
+                  for i in range(0, total_pages, chunk_size)]
+        if len(chunks) <= 1:
+            return cls(*fingerprint_pages(pdf_path, list(range(total_pages))))
+
+        # Spawned workers do not inherit the GUI process's threads or Tk state
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(fingerprint_pages, pdf_path, chunk) for chunk in chunks]
+            parts = []
+            for future in futures:
+                if cancel is not None and cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                parts.append(future.result())
+
+        return cls(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]))
+
+    @classmethod
+    def load(cls, file_path: str) -> 'LayoutIndex':
+        '''Read fingerprints written by save()'''
+        with np.load(file_path) as data:
+            grids = np.unpackbits(data['grids'], axis=1, count=int(data['cells'])).astype(bool)
+            return cls(grids, data['sizes'])
+
+    def save(self, file_path: str):
+        '''Write the fingerprints as one compact .npz file'''
+        tmp_path = file_path + '.tmp.npz'
+        np.savez(tmp_path, grids=np.packbits(self.grids, axis=1), cells=self.grids.shape[1], sizes=self.sizes)
+        os.replace(tmp_path, file_path)
+
+    def similarity(self, page_num: int) -> np.ndarray:
+        '''Get the overlap (intersection over union) of every page's layout with one page'''
+        grid = self.grids[page_num]
+        inter = np.count_nonzero(self.grids & grid, axis=1)
+        union = np.count_nonzero(self.grids | grid, axis=1)
+        scores = np.where(union > 0, inter / np.maximum(union, 1), 1.0)
+        # Pages of another size never share a layout
+        same_size = np.all(np.abs(self.sizes - self.sizes[page_num]) <= 1.0, axis=1)
+        return np.where(same_size, scores, 0.0)
+
+    def matching_pages(self, page_num: int, threshold: float = 0.8) -> List[int]:
+        '''Get the other pages whose layout matches a page'''
+        scores = self.similarity(page_num)
+        scores[page_num] = 0.0
+        return np.flatnonzero(scores >= threshold).tolist()
+
+    def clusters(self, threshold: float = 0.8) -> np.ndarray:
+        '''Group pages by layout, returning the first page of each page's group'''
+        leaders = np.full(len(self), -1, dtype=np.int32)
+        # Each unassigned page starts a group and claims every unassigned match
+        for page_num in range(len(self)):
+            if leaders[page_num] >= 0:
+                continue
+            members = (self.similarity(page_num) >= threshold) & (leaders < 0)
+            leaders[members] = page_num
+        return leaders
+
+    def __len__(self):
+        return len(self.grids)
+
+def load_or_build(pdf_path: str, cache_dir: Optional[str] = None,
+                  cancel: Optional[threading.Event] = None) -> Optional[LayoutIndex]:
+    '''Load a document's cached fingerprints, building and caching them on first use'''
+    cache_dir = cache_dir or default_cache_dir()
+    cols, rows = GRID_SHAPE
+    path = os.path.join(cache_dir, f'{document_key(pdf_path)}-{cols}x{rows}.npz')
+    if os.path.exists(path):
+        return LayoutIndex.load(path)
+
+    index = LayoutIndex.build(pdf_path, cancel=cancel)
+    if index is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        index.save(path)
+    return index
+
+# ====================
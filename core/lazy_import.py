@@ -0,0 +1,31 @@
+# ===== core/lazy_import.py =====
+
+import importlib
+from types import ModuleType
+
+class LazyModule:
+    '''Stand-in for a module that imports it on first attribute access'''
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> ModuleType:
+        '''Import the module now, e.g. from a background thread'''
+        if self._module is None:
+            # import_module holds the module's import lock, so concurrent
+            # first uses from several threads import it only once
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self.load(), attr)
+        # Later lookups of the same name skip this method
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f'<lazy module {self._name!r} ({state})>'
+
+# ====================
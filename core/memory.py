@@ -0,0 +1,42 @@
+# ===== core/memory.py =====
+
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _load_malloc_trim():
+    '''Find glibc's malloc_trim, which returns freed heap pages to the OS'''
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+        return libc.malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+_malloc_trim = _load_malloc_trim()
+
+def current_rss() -> Optional[int]:
+    '''Get the resident memory of this process in bytes, or None if unknown'''
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+def release_freed_memory():
+    '''Hand memory freed by MuPDF and Python back to the OS where the allocator allows it'''
+    if _malloc_trim is not None:
+        _malloc_trim(0)
+
+# ====================
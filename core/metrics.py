@@ -0,0 +1,158 @@
+# ===== core/metrics.py =====
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Set PDF_LABELING_METRICS=1 to collect metrics, and PDF_LABELING_METRICS_DUMP
+# to a file path to also write them there every DUMP_INTERVAL seconds
+METRICS_ENV = 'PDF_LABELING_METRICS'
+DUMP_ENV = 'PDF_LABELING_METRICS_DUMP'
+DUMP_INTERVAL = 10.0
+
+# Histogram bucket upper bounds in milliseconds, roughly 4 per decade
+BUCKETS_MS = [round(10 ** (e / 4), 3) for e in range(-8, 17)]
+
+class Histogram:
+    '''Latency histogram with fixed logarithmic buckets'''
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, value_ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.last = value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, q: float) -> float:
+        '''Approximate a percentile by the upper bound of its bucket'''
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'min_ms': self.min if self.count else 0.0,
+            'max_ms': self.max,
+            'last_ms': self.last,
+            'p50_ms': self.percentile(0.5),
+            'p90_ms': self.percentile(0.9),
+            'p99_ms': self.percentile(0.99)
+        }
+
+class Metrics:
+    '''Process-wide timers, latency histograms and counters'''
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._dump_thread: Optional[threading.Thread] = None
+
+    def observe(self, name: str, value_ms: float):
+        '''Record one latency sample'''
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(value_ms)
+
+    def count(self, name: str, amount: int = 1):
+        '''Add to a counter'''
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        '''Get all metrics as a JSON-serializable dict'''
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.started,
+                'timers': {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def summary_lines(self, names: List[str]) -> List[str]:
+        '''Format the latest, median and p90 latency of some timers for display'''
+        lines = []
+        with self._lock:
+            for name in names:
+                h = self.histograms.get(name)
+                if h is not None:
+                    lines.append(f'{name}: {h.last:.1f} ms (p50 {h.percentile(0.5):.1f}, '
+                                 f'p90 {h.percentile(0.9):.1f}, n={h.count})')
+        return lines
+
+    def reset(self):
+        '''Drop all recorded values'''
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def dump(self, file_path: str):
+        '''Atomically write a snapshot to a JSON file'''
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, file_path)
+
+    def start_dumping(self, file_path: str, interval: float = DUMP_INTERVAL):
+        '''Write a snapshot to a file periodically from a background thread'''
+        def worker():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.dump(file_path)
+                except OSError:
+                    pass
+
+        if self._dump_thread is None:
+            self._dump_thread = threading.Thread(target=worker, daemon=True)
+            self._dump_thread.start()
+
+metrics = Metrics(enabled=os.environ.get(METRICS_ENV, '0') not in ('', '0') or bool(os.environ.get(DUMP_ENV)))
+
+def timed(name: str) -> Callable:
+    '''Decorator recording a function's latency; a no-op when metrics are disabled'''
+    def decorate(fn: Callable) -> Callable:
+        # Decided once at import time, so disabled builds call fn directly
+        if not metrics.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.observe(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+# ====================
@@ -1,72 +1,416 @@
-# ===== core/pdf_document.py =====
-
-import fitz  # PyMuPDF
-from PIL import Image
-from typing import Optional
-
-class PDFDocument:
-    '''Handles PDF operations and rendering'''
-    
-    def __init__(self):
-        self.document = None
-        self.file_path = None
-        self.total_pages = 0
-        self.current_page = 0
-        self.zoom_level = 1.0
-    
-    def open(self, file_path: str) -> bool:
-        '''Open a PDF file'''
-        try:
-            self.document = fitz.open(file_path)
-            self.file_path = file_path
-            self.total_pages = len(self.document)
-            self.current_page = 0
-            return True
-        except Exception as e:
-            raise Exception(f'Failed to open PDF: {str(e)}')
-    
-    def close(self):
-        '''Close the current PDF document'''
-        if self.document:
-            self.document.close()
-            self.document = None
-    
-    def render_page(self, page_num: int) -> Optional[Image.Image]:
-        '''Render a specific page as PIL Image'''
-        if not self.document or page_num >= self.total_pages:
-            return None
-        
-        page = self.document[page_num]
-        mat = fitz.Matrix(self.zoom_level, self.zoom_level)
-        pix = page.get_pixmap(matrix=mat)
-        
-        img = Image.frombytes('RGB', [pix.width, pix.height], pix.samples)
-        return img
-    
-    def next_page(self) -> bool:
-        '''Move to next page'''
-        if self.current_page < self.total_pages - 1:
-            self.current_page += 1
-            return True
-        return False
-    
-    def prev_page(self) -> bool:
-        '''Move to previous page'''
-        if self.current_page > 0:
-            self.current_page -= 1
-            return True
-        return False
-    
-    def zoom_in(self):
-        '''Increase zoom level'''
-        self.zoom_level = min(self.zoom_level + 0.2, 3.0)
-    
-    def zoom_out(self):
-        '''Decrease zoom level'''
-        self.zoom_level = max(self.zoom_level - 0.2, 0.5)
-    
-    def get_page_info(self) -> str:
-        '''Get current page information'''
-        if self.document:
-            return f'Page: {self.current_page + 1} / {self.total_pages}'
-        return 'No PDF loaded'
+# ===== core/pdf_document.py =====
+
+import math
+import queue
+import threading
+from typing import Optional, Tuple
+from core.lazy_import import LazyModule
+from core.memory import current_rss, release_freed_memory
+from core.metrics import metrics, timed
+from core.render_cache import RenderCache
+
+# PyMuPDF is slow to import, so it is loaded on first use
+fitz = LazyModule('fitz')
+
+TILE_SIZE = 512
+
+# With a memory budget, the render cache gets this share of it, MuPDF's store
+# is trimmed above SOFT_LIMIT of it, and the document handle is reopened at
+# most once per REOPEN_INTERVAL renders to drop MuPDF's parsed objects
+CACHE_SHARE = 0.25
+SOFT_LIMIT = 0.8
+REOPEN_INTERVAL = 50
+
+class PDFDocument:
+    '''Handles PDF operations and rendering'''
+
+    def __init__(self, cache_bytes: int = 256 * 1024 * 1024, prefetch_pages: int = 2,
+                 memory_budget: Optional[int] = None):
+        self.document = None
+        self.file_path = None
+        self.total_pages = 0
+        self.current_page = 0
+        self.zoom_level = 1.0
+
+        # Pages are rendered as clipped tiles at or above this zoom
+        self.tile_zoom_threshold = 2.0
+        self.tile_size = TILE_SIZE
+
+        # Progressive display first shows a cheap preview rendered at the zoom
+        # divided by this factor; an integer so Tk can enlarge it directly
+        self.progressive = True
+        self.preview_reduction = 4
+
+        # Render cache and background prefetch
+        self.render_cache = RenderCache(cache_bytes)
+        self.prefetch_pages = prefetch_pages
+        self._doc_lock = threading.RLock()
+        self._doc_generation = 0
+        self._prefetch_queue = queue.Queue()
+        self._prefetch_thread = None
+
+        # Resident memory in bytes the process should stay under, see set_memory_budget()
+        self.memory_budget: Optional[int] = None
+        self.memory_stats = {'peak_rss': 0, 'store_trims': 0, 'cache_trims': 0, 'reopens': 0}
+        self._renders_since_reopen = 0
+        self.set_memory_budget(memory_budget)
+
+        # Word boxes of the open document, loaded or built in the background
+        self.text_index: Optional['TextIndex'] = None
+        self.text_index_error: Optional[str] = None
+        self._index_cancel: Optional[threading.Event] = None
+
+        # Page layout fingerprints, built on first use for label propagation
+        self.layout_index: Optional['LayoutIndex'] = None
+        self.layout_index_error: Optional[str] = None
+        self._layout_cancel: Optional[threading.Event] = None
+
+    def open(self, file_path: str) -> bool:
+        '''Open a PDF file'''
+        try:
+            document = fitz.open(file_path)
+        except Exception as e:
+            raise Exception(f'Failed to open PDF: {str(e)}')
+
+        self.close()
+        with self._doc_lock:
+            self.document = document
+            self.file_path = file_path
+            self.total_pages = len(self.document)
+            self.current_page = 0
+        return True
+
+    def close(self):
+        '''Close the current PDF document'''
+        with self._doc_lock:
+            self._doc_generation += 1
+            self.render_cache.clear()
+            self.text_index = None
+            self.text_index_error = None
+            if self._index_cancel:
+                self._index_cancel.set()
+                self._index_cancel = None
+            self.layout_index = None
+            self.layout_index_error = None
+            if self._layout_cancel:
+                self._layout_cancel.set()
+                self._layout_cancel = None
+            if self._prefetch_thread is not None:
+                # The detached worker owns its queue, so the sentinel cannot
+                # be drained by _schedule_prefetch() for the next document
+                self._prefetch_thread = None
+                self._prefetch_queue.put(None)
+                self._prefetch_queue = queue.Queue()
+            if self.document:
+                self.document.close()
+                self.document = None
+
+    @timed('render_page')
+    def render_page(self, page_num: int, zoom: Optional[float] = None) -> Optional[bytes]:
+        '''Render a specific page as PPM image data, using the render cache'''
+        if not self.document or page_num >= self.total_pages:
+            return None
+
+        zoom = self._zoom_key(zoom)
+        img = self.render_cache.get((page_num, zoom))
+        if img is None:
+            img = self._rasterize(page_num, zoom)
+            if img is not None:
+                self.render_cache.put((page_num, zoom), img)
+
+        self._schedule_prefetch(page_num, zoom)
+        return img
+
+    @timed('render_preview')
+    def render_preview(self, page_num: int, zoom: Optional[float] = None) -> Optional[bytes]:
+        '''Quickly render a low-resolution page without annotations'''
+        if not self.document or page_num >= self.total_pages:
+            return None
+
+        zoom = self._zoom_key(zoom) / self.preview_reduction
+        with self._doc_lock:
+            if not self.document:
+                return None
+            page = self.document[page_num]
+            # Anti-aliasing stays on: it is a process-wide MuPDF setting, and
+            # switching it here would change renders of other documents
+            # running at the same time
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), annots=False)
+            page = None
+
+        return self._finish_render(pix)
+
+    def is_rendered(self, page_num: int, zoom: Optional[float] = None) -> bool:
+        '''Check whether a full page render is already cached'''
+        return self.render_cache.contains((page_num, self._zoom_key(zoom)))
+
+    def use_tiles(self) -> bool:
+        '''Check whether pages should be rendered as tiles at the current zoom'''
+        return self.zoom_level >= self.tile_zoom_threshold
+
+    def get_page_size(self, page_num: int, zoom: Optional[float] = None) -> Tuple[int, int]:
+        '''Get the pixel size of a page at the current or given zoom'''
+        if not self.document or page_num >= self.total_pages:
+            return (0, 0)
+
+        with self._doc_lock:
+            if not self.document:
+                return (0, 0)
+            rect = self.document[page_num].rect
+        zoom = self._zoom_key(zoom)
+        return (math.ceil(rect.width * zoom), math.ceil(rect.height * zoom))
+
+    @timed('render_tile')
+    def render_tile(self, page_num: int, col: int, row: int,
+                    zoom: Optional[float] = None) -> Optional[bytes]:
+        '''Render one tile of a page at the current or given zoom, using the render cache'''
+        if not self.document or page_num >= self.total_pages:
+            return None
+
+        zoom = self._zoom_key(zoom)
+        key = (page_num, zoom, col, row)
+        img = self.render_cache.get(key)
+        if img is not None:
+            return img
+
+        with self._doc_lock:
+            if not self.document:
+                return None
+            page = self.document[page_num]
+            # Clip rect is in unscaled page coordinates
+            step = self.tile_size / zoom
+            x0 = page.rect.x0 + col * step
+            y0 = page.rect.y0 + row * step
+            clip = fitz.Rect(x0, y0, x0 + step, y0 + step) & page.rect
+            if clip.is_empty:
+                return None
+            mat = fitz.Matrix(zoom, zoom)
+            pix = page.get_pixmap(matrix=mat, clip=clip)
+            page = None
+
+        img = self._finish_render(pix)
+        self.render_cache.put(key, img)
+        return img
+
+    def start_text_index(self, cache_dir: Optional[str] = None):
+        '''Load or build the word index of the open document in the background'''
+        if not self.file_path or self._index_cancel:
+            return
+        self._index_cancel = threading.Event()
+        threading.Thread(target=self._load_text_index, daemon=True,
+                         args=(self.file_path, cache_dir, self._doc_generation, self._index_cancel)).start()
+
+    def snap_to_text(self, page_num: int,
+                     bbox: Tuple[float, float, float, float]) -> Optional[Tuple[float, float, float, float]]:
+        '''Fit a box in PDF points to the words it covers, if the text index is ready'''
+        index = self.text_index
+        return index.snap(page_num, bbox) if index is not None else None
+
+    def search_text(self, query: str) -> Optional[list]:
+        '''Find text in the document as (page, bbox) matches, or None while indexing'''
+        index = self.text_index
+        return index.search(query) if index is not None else None
+
+    def _load_text_index(self, file_path: str, cache_dir: Optional[str], generation: int,
+                         cancel: threading.Event):
+        '''Build the text index without holding the document lock'''
+        # Imported here so the numpy-backed index modules load off the startup path
+        from core.text_index import load_or_build
+
+        # Extraction uses separate document handles, so rendering is not blocked
+        try:
+            index = load_or_build(file_path, cache_dir, cancel)
+            error = None
+        except Exception as e:
+            index, error = None, str(e)
+        with self._doc_lock:
+            if generation == self._doc_generation:
+                self.text_index = index
+                self.text_index_error = error
+
+    def start_layout_index(self, cache_dir: Optional[str] = None):
+        '''Load or build the page layout fingerprints in the background'''
+        if not self.file_path or self._layout_cancel:
+            return
+        self._layout_cancel = threading.Event()
+        threading.Thread(target=self._load_layout_index, daemon=True,
+                         args=(self.file_path, cache_dir, self._doc_generation, self._layout_cancel)).start()
+
+    def find_similar_pages(self, page_num: int, threshold: float = 0.8) -> Optional[list]:
+        '''Get the other pages sharing a page's layout, or None while fingerprinting'''
+        index = self.layout_index
+        return index.matching_pages(page_num, threshold) if index is not None else None
+
+    def _load_layout_index(self, file_path: str, cache_dir: Optional[str], generation: int,
+                           cancel: threading.Event):
+        '''Build the layout fingerprints without holding the document lock'''
+        from core.layout_index import load_or_build
+
+        try:
+            index = load_or_build(file_path, cache_dir, cancel)
+            error = None
+        except Exception as e:
+            index, error = None, str(e)
+        with self._doc_lock:
+            if generation == self._doc_generation:
+                self.layout_index = index
+                self.layout_index_error = error
+
+    def get_cache_stats(self) -> dict:
+        '''Get render cache hit/miss counters'''
+        return self.render_cache.get_stats()
+
+    def _zoom_key(self, zoom: Optional[float] = None) -> float:
+        '''Zoom level rounded so repeated +/- steps hit the same cache entry'''
+        return round(self.zoom_level if zoom is None else zoom, 2)
+
+    @timed('rasterize')
+    def _rasterize(self, page_num: int, zoom: float) -> Optional[bytes]:
+        '''Render a page at the given zoom as PPM data, bypassing the cache'''
+        with self._doc_lock:
+            if not self.document or page_num >= self.total_pages:
+                return None
+            page = self.document[page_num]
+            mat = fitz.Matrix(zoom, zoom)
+            pix = page.get_pixmap(matrix=mat)
+            # Drop the page object, and the resources it pins, right away
+            page = None
+
+        return self._finish_render(pix)
+
+    def _finish_render(self, pix) -> bytes:
+        '''Convert a pixmap to PPM data, release it and check the memory budget'''
+        # PPM is a header plus the raw RGB samples, so this is the only copy
+        # of the pixels before Tk decodes them into the photo image
+        img = pix.tobytes('ppm')
+        del pix
+        metrics.count('bytes_rasterized', len(img))
+        if self.memory_budget is not None:
+            self._enforce_memory_budget()
+        return img
+
+    def set_memory_budget(self, budget: Optional[int]):
+        '''Keep resident memory under a budget in bytes by trimming caches, or None for no limit'''
+        self.memory_budget = budget
+        if budget is not None:
+            self.set_cache_budget(self.render_cache.max_bytes)
+
+    def set_cache_budget(self, max_bytes: int):
+        '''Change the render cache budget, within its share of any memory budget'''
+        if self.memory_budget is not None:
+            max_bytes = min(max_bytes, int(self.memory_budget * CACHE_SHARE))
+        self.render_cache.set_budget(max_bytes)
+
+    def _enforce_memory_budget(self):
+        '''Release memory when resident usage nears the budget, cheapest remedy first'''
+        rss = current_rss()
+        if rss is None:
+            return
+        stats = self.memory_stats
+        stats['peak_rss'] = max(stats['peak_rss'], rss)
+        self._renders_since_reopen += 1
+        if rss < self.memory_budget * SOFT_LIMIT:
+            return
+
+        # MuPDF's store of decoded fonts and images grows up to 256 MB by
+        # default and cannot be capped after startup, so it is trimmed
+        with self._doc_lock:
+            fitz.TOOLS.store_shrink(50 if rss < self.memory_budget else 100)
+        stats['store_trims'] += 1
+        release_freed_memory()
+        rss = current_rss()
+        if rss is None or rss < self.memory_budget:
+            return
+
+        self.render_cache.shrink(self.render_cache.current_bytes // 2)
+        stats['cache_trims'] += 1
+        release_freed_memory()
+        rss = current_rss()
+        if rss is None or rss < self.memory_budget or self._renders_since_reopen < REOPEN_INTERVAL:
+            return
+
+        # Parsed objects of every visited page stay with the document
+        # handle until it is closed, so swap in a fresh handle
+        with self._doc_lock:
+            if self.document:
+                document = fitz.open(self.file_path)
+                self.document.close()
+                self.document = document
+        self._renders_since_reopen = 0
+        stats['reopens'] += 1
+        release_freed_memory()
+
+    def _schedule_prefetch(self, page_num: int, zoom: float):
+        '''Queue neighbouring pages for background rendering'''
+        # Whole-page prefetch is skipped in tiled mode
+        if self.prefetch_pages <= 0 or zoom >= self.tile_zoom_threshold:
+            return
+
+        # Drop requests queued for a previous position
+        try:
+            while True:
+                self._prefetch_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        generation = self._doc_generation
+        for offset in range(1, self.prefetch_pages + 1):
+            for target in (page_num + offset, page_num - offset):
+                if 0 <= target < self.total_pages:
+                    self._prefetch_queue.put((generation, target, zoom))
+
+        if self._prefetch_thread is None or not self._prefetch_thread.is_alive():
+            self._prefetch_thread = threading.Thread(target=self._prefetch_worker, args=(self._prefetch_queue,),
+                                                     daemon=True)
+            self._prefetch_thread.start()
+
+    def _prefetch_worker(self, requests: queue.Queue):
+        '''Render pages from a worker's own queue into the cache'''
+        while True:
+            item = requests.get()
+            # close() detaches the worker and wakes it with None
+            if item is None:
+                return
+            generation, page_num, zoom = item
+            if generation != self._doc_generation or self.render_cache.contains((page_num, zoom)):
+                continue
+
+            img = self._rasterize(page_num, zoom)
+            with self._doc_lock:
+                if img is not None and generation == self._doc_generation:
+                    self.render_cache.put((page_num, zoom), img)
+
+    def next_page(self) -> bool:
+        '''Move to next page'''
+        if self.current_page < self.total_pages - 1:
+            self.current_page += 1
+            return True
+        return False
+
+    def prev_page(self) -> bool:
+        '''Move to previous page'''
+        if self.current_page > 0:
+            self.current_page -= 1
+            return True
+        return False
+
+    def go_to_page(self, page_num: int) -> bool:
+        '''Move to a specific page'''
+        if 0 <= page_num < self.total_pages and page_num != self.current_page:
+            self.current_page = page_num
+            return True
+        return False
+
+    def zoom_in(self):
+        '''Increase zoom level'''
+        self.zoom_level = round(min(self.zoom_level + 0.2, 3.0), 2)
+
+    def zoom_out(self):
+        '''Decrease zoom level'''
+        self.zoom_level = round(max(self.zoom_level - 0.2, 0.5), 2)
+
+    def get_page_info(self) -> str:
+        '''Get current page information'''
+        if self.document:
+            return f'Page: {self.current_page + 1} / {self.total_pages}'
+        return 'No PDF loaded'
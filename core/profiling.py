@@ -0,0 +1,84 @@
+# ===== core/profiling.py =====
+
+import collections
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Any, Callable, Counter, Optional
+
+# PDF_LABELING_PROFILE=cprofile or =sample wraps the session in a profiler;
+# results go to PDF_LABELING_PROFILE_OUT
+PROFILE_ENV = 'PDF_LABELING_PROFILE'
+PROFILE_OUT_ENV = 'PDF_LABELING_PROFILE_OUT'
+
+class SamplingProfiler:
+    '''Low-overhead profiler that periodically samples the stack of one thread'''
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.samples: Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        '''Start sampling in a background thread'''
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        '''Stop sampling'''
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, file_path: str):
+        '''Write stacks in the collapsed format read by flame graph tools'''
+        with open(file_path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+def run_profiled(fn: Callable[[], Any], mode: Optional[str] = None, output: Optional[str] = None) -> Any:
+    '''Run fn under the profiler selected by the environment, if any'''
+    mode = mode if mode is not None else os.environ.get(PROFILE_ENV, '')
+    if mode == 'cprofile':
+        output = output or os.environ.get(PROFILE_OUT_ENV, 'pdf-labeling.prof')
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            profiler.dump_stats(output)
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats('cumulative').print_stats(30)
+            print(f'Profile written to {output}', file=sys.stderr)
+    elif mode == 'sample':
+        output = output or os.environ.get(PROFILE_OUT_ENV, 'pdf-labeling.stacks')
+        profiler = SamplingProfiler(thread_id=threading.get_ident())
+        profiler.start()
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            profiler.stop()
+            profiler.write_collapsed(output)
+            print(f'{sum(profiler.samples.values())} samples over {time.perf_counter() - started:.1f} s '
+                  f'written to {output}', file=sys.stderr)
+    return fn()
+
+# ====================
@@ -0,0 +1,117 @@
+# ===== core/render_cache.py =====
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class RenderCache:
+    '''LRU cache of rendered page images bounded by a memory budget'''
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024,
+                 size_of: Optional[Callable[[Any], int]] = None):
+        self.max_bytes = max_bytes
+        self.size_of = size_of or _image_size
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        '''Return a cached entry and mark it as most recently used'''
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def contains(self, key: Hashable) -> bool:
+        '''Check for an entry without touching LRU order or counters'''
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: Hashable, value: Any):
+        '''Store an entry, evicting least recently used ones over budget'''
+        size = self.size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Entries larger than the whole budget are never cached
+            if size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def discard(self, predicate: Callable[[Hashable], bool]):
+        '''Drop every entry whose key matches the predicate'''
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def set_budget(self, max_bytes: int):
+        '''Change the memory budget, evicting entries if needed'''
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._entries and self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def shrink(self, max_bytes: int):
+        '''Evict least recently used entries until at most max_bytes are held, keeping the budget'''
+        with self._lock:
+            while self._entries and self.current_bytes > max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        '''Remove all entries'''
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        '''Reset hit/miss/eviction counters'''
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self) -> dict:
+        '''Get cache counters for tuning the budget'''
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self.current_bytes -= self._sizes.pop(key)
+
+def _image_size(img) -> int:
+    '''Approximate memory used by a rendered image'''
+    if isinstance(img, (bytes, bytearray)):
+        return len(img)
+    width, height = img.size
+    return width * height * len(img.getbands())
+
+# ====================
@@ -0,0 +1,198 @@
+# ===== core/spatial_index.py =====
+
+import math
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+BBox = Tuple[float, float, float, float]
+
+class GridIndex:
+    '''Uniform grid spatial index over bounding boxes'''
+
+    # Cells are split when they hold this many boxes on average
+    MAX_CELL_LOAD = 16
+    # Boxes spanning more cells than this are kept out of the grid and
+    # scanned directly, so splitting never multiplies their entries
+    MAX_BOX_CELLS = 64
+
+    def __init__(self, cell_size: float = 64.0, min_cell_size: float = 4.0):
+        self.cell_size = cell_size
+        self.min_cell_size = min_cell_size
+        self._entries = 0
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._boxes: Dict[Hashable, BBox] = {}
+        self._large: Set[Hashable] = set()
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+        # Min/max occupied cell coordinates, only ever grown until clear()
+        self._bounds: Optional[List[int]] = None
+
+    def insert(self, key: Hashable, bbox: BBox):
+        '''Add a box to the index'''
+        if key in self._boxes:
+            self.remove(key)
+        bbox = _normalize(bbox)
+        self._boxes[key] = bbox
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._add_to_grid(key, bbox)
+        self._grow_bounds(bbox)
+
+        # Keep per-cell load bounded as pages get denser
+        if (self._entries > self.MAX_CELL_LOAD * len(self._cells)
+                and self.cell_size / 2 >= self.min_cell_size):
+            self._rebuild(self.cell_size / 2)
+
+    def remove(self, key: Hashable):
+        '''Remove a box from the index'''
+        bbox = self._boxes.pop(key, None)
+        if bbox is None:
+            return
+        del self._order[key]
+        if key in self._large:
+            self._large.discard(key)
+            return
+        for cell in self._cells_for(bbox):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                self._entries -= 1
+                if not bucket:
+                    del self._cells[cell]
+
+    def clear(self):
+        '''Remove all boxes'''
+        self._cells.clear()
+        self._boxes.clear()
+        self._large.clear()
+        self._order.clear()
+        self._bounds = None
+        self._entries = 0
+
+    def query_point(self, x: float, y: float) -> List[Hashable]:
+        '''Get keys of boxes containing a point, most recently inserted first'''
+        cell = (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        hits = [key for key in self._cells.get(cell, ())
+                if _contains(self._boxes[key], x, y)]
+        hits.extend(key for key in self._large if _contains(self._boxes[key], x, y))
+        return self._sorted(hits)
+
+    def query_rect(self, rect: BBox) -> List[Hashable]:
+        '''Get keys of boxes intersecting a rectangle, in insertion order'''
+        rect = _normalize(rect)
+        candidates = set(self._large)
+        for cell in self._cells_for(rect):
+            candidates.update(self._cells.get(cell, ()))
+        hits = [key for key in candidates if _intersects(self._boxes[key], rect)]
+        return self._sorted(hits, reverse=False)
+
+    def nearest(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[Hashable]:
+        '''Get the key of the box closest to a point, searching rings of cells outwards'''
+        if not self._boxes:
+            return None
+
+        size = self.cell_size
+        cx, cy = math.floor(x / size), math.floor(y / size)
+        # Ring count needed to reach every occupied cell
+        min_x, min_y, max_x, max_y = self._bounds
+        max_ring = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy, 0)
+
+        best_key, best_dist = None, math.inf
+        for key in self._large:
+            dist = _distance(self._boxes[key], x, y)
+            if dist < best_dist or (dist == best_dist and self._order[key] > self._order[best_key]):
+                best_key, best_dist = key, dist
+        for ring in range(max_ring + 1):
+            # Nothing in this ring can be closer than (ring - 1) cells
+            reach = max(ring - 1, 0) * size
+            if reach > best_dist or (max_distance is not None and reach > max_distance):
+                break
+            for cell in _ring_cells(cx, cy, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                # Skip cells that cannot hold anything closer than the best so far
+                cell_dist = _distance((cell[0] * size, cell[1] * size,
+                                       (cell[0] + 1) * size, (cell[1] + 1) * size), x, y)
+                if cell_dist > best_dist or (max_distance is not None and cell_dist > max_distance):
+                    continue
+                for key in bucket:
+                    dist = _distance(self._boxes[key], x, y)
+                    if dist < best_dist or (dist == best_dist and self._order[key] > self._order[best_key]):
+                        best_key, best_dist = key, dist
+
+        if max_distance is not None and best_dist > max_distance:
+            return None
+        return best_key
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def _rebuild(self, cell_size: float):
+        '''Re-bucket every box with a new cell size'''
+        self.cell_size = cell_size
+        self._cells = {}
+        self._large = set()
+        self._bounds = None
+        self._entries = 0
+        for key, bbox in self._boxes.items():
+            self._add_to_grid(key, bbox)
+            self._grow_bounds(bbox)
+
+    def _add_to_grid(self, key: Hashable, bbox: BBox):
+        '''Bucket a box into its cells, or into the large boxes if it spans too many'''
+        size = self.cell_size
+        spanned = ((math.floor(bbox[2] / size) - math.floor(bbox[0] / size) + 1)
+                   * (math.floor(bbox[3] / size) - math.floor(bbox[1] / size) + 1))
+        if spanned > self.MAX_BOX_CELLS:
+            self._large.add(key)
+            return
+        for cell in self._cells_for(bbox):
+            self._cells.setdefault(cell, set()).add(key)
+            self._entries += 1
+
+    def _grow_bounds(self, bbox: BBox):
+        size = self.cell_size
+        cells = [math.floor(bbox[0] / size), math.floor(bbox[1] / size),
+                 math.floor(bbox[2] / size), math.floor(bbox[3] / size)]
+        if self._bounds is None:
+            self._bounds = cells
+        else:
+            self._bounds = [min(self._bounds[0], cells[0]), min(self._bounds[1], cells[1]),
+                            max(self._bounds[2], cells[2]), max(self._bounds[3], cells[3])]
+
+    def _cells_for(self, bbox: BBox):
+        size = self.cell_size
+        for cx in range(math.floor(bbox[0] / size), math.floor(bbox[2] / size) + 1):
+            for cy in range(math.floor(bbox[1] / size), math.floor(bbox[3] / size) + 1):
+                yield (cx, cy)
+
+    def _sorted(self, keys: List[Hashable], reverse: bool = True) -> List[Hashable]:
+        return sorted(keys, key=self._order.__getitem__, reverse=reverse)
+
+def _normalize(bbox: BBox) -> BBox:
+    x1, y1, x2, y2 = bbox
+    return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+def _contains(bbox: BBox, x: float, y: float) -> bool:
+    return bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def _distance(bbox: BBox, x: float, y: float) -> float:
+    dx = max(bbox[0] - x, 0, x - bbox[2])
+    dy = max(bbox[1] - y, 0, y - bbox[3])
+    return math.hypot(dx, dy)
+
+def _ring_cells(cx: int, cy: int, ring: int):
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cy - ring)
+        yield (cx + dx, cy + ring)
+    for dy in range(-ring + 1, ring):
+        yield (cx - ring, cy + dy)
+        yield (cx + ring, cy + dy)
+
+# ====================
@@ -0,0 +1,169 @@
+# ===== core/text_index.py =====
+
+import multiprocessing
+import os
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from core.cache_utils import cache_root, document_key
+from core.lazy_import import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+BBox = Tuple[float, float, float, float]
+
+def default_cache_dir() -> str:
+    '''Get the per-user directory for cached text indexes'''
+    return os.path.join(cache_root(), 'text')
+
+def extract_words(pdf_path: str, pages: List[int]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    '''Extract word boxes of some pages in reading order'''
+    page_col, boxes, words = [], [], []
+    with fitz.open(pdf_path) as doc:
+        for page_num in pages:
+            for x0, y0, x1, y1, word, *_ in doc[page_num].get_text('words'):
+                page_col.append(page_num)
+                boxes.append((x0, y0, x1, y1))
+                words.append(word)
+    return (np.array(page_col, dtype=np.int32),
+            np.array(boxes, dtype=np.float64).reshape(-1, 4), words)
+
+class TextIndex:
+    '''Word boxes of a whole document in PDF points, for snapping and search'''
+
+    def __init__(self, page: np.ndarray, boxes: np.ndarray, word_id: np.ndarray, vocab: List[str]):
+        # Parallel columns, one row per word, sorted by page in reading order.
+        # Word texts are interned in vocab, like label texts in LabelStore.
+        self.page = page
+        self.boxes = boxes
+        self.word_id = word_id
+        self.vocab = vocab
+        self._lower_vocab = [w.lower() for w in vocab]
+
+    @classmethod
+    def from_words(cls, page: np.ndarray, boxes: np.ndarray, words: List[str]) -> 'TextIndex':
+        '''Build an index from one text per word'''
+        ids = {}
+        word_id = np.fromiter((ids.setdefault(w, len(ids)) for w in words), dtype=np.int32, count=len(words))
+        return cls(page, boxes, word_id, list(ids))
+
+    @classmethod
+    def build(cls, pdf_path: str, workers: Optional[int] = None, chunk_size: int = 64,
+              cancel: Optional[threading.Event] = None) -> Optional['TextIndex']:
+        '''Extract every page in a process pool; returns None if cancelled'''
+        with fitz.open(pdf_path) as doc:
+            total_pages = len(doc)
+        chunks = [list(range(i, min(i + chunk_size, total_pages)))
+                  for i in range(0, total_pages, chunk_size)]
+        if len(chunks) <= 1:
+            return cls.from_words(*extract_words(pdf_path, list(range(total_pages))))
+
+        # Spawned workers do not inherit the GUI process's threads or Tk state
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(extract_words, pdf_path, chunk) for chunk in chunks]
+            parts = []
+            for future in futures:
+                if cancel is not None and cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                parts.append(future.result())
+
+        words = [w for part in parts for w in part[2]]
+        return cls.from_words(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]), words)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'TextIndex':
+        '''Read an index written by save()'''
+        with np.load(file_path) as data:
+            text = data['vocab'].tobytes().decode('utf-8')
+            return cls(data['page'], data['boxes'], data['word_id'], text.split('\n') if text else [])
+
+    def save(self, file_path: str):
+        '''Write the index as one compact .npz file'''
+        # Words never contain whitespace, so they are stored newline-joined
+        text = np.frombuffer('\n'.join(self.vocab).encode('utf-8'), dtype=np.uint8)
+        tmp_path = file_path + '.tmp.npz'
+        np.savez(tmp_path, page=self.page, boxes=self.boxes, word_id=self.word_id, vocab=text)
+        os.replace(tmp_path, file_path)
+
+    def page_range(self, page_num: int) -> Tuple[int, int]:
+        '''Get the row range of a page's words'''
+        start, end = np.searchsorted(self.page, [page_num, page_num + 1])
+        return int(start), int(end)
+
+    def words_in_rect(self, page_num: int, rect: BBox, min_overlap: float = 0.5) -> np.ndarray:
+        '''Get rows of words on a page with at least min_overlap of their area inside rect'''
+        start, end = self.page_range(page_num)
+        boxes = self.boxes[start:end]
+        x0, y0 = min(rect[0], rect[2]), min(rect[1], rect[3])
+        x1, y1 = max(rect[0], rect[2]), max(rect[1], rect[3])
+        inter_w = np.clip(np.minimum(boxes[:, 2], x1) - np.maximum(boxes[:, 0], x0), 0, None)
+        inter_h = np.clip(np.minimum(boxes[:, 3], y1) - np.maximum(boxes[:, 1], y0), 0, None)
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        covered = inter_w * inter_h >= min_overlap * np.maximum(area, 1e-6)
+        return np.flatnonzero(covered) + start
+
+    def snap(self, page_num: int, rect: BBox) -> Optional[BBox]:
+        '''Shrink or grow a drawn rectangle to the words it mostly covers'''
+        rows = self.words_in_rect(page_num, rect)
+        if not len(rows):
+            return None
+        boxes = self.boxes[rows]
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+
+    def text_in_rect(self, page_num: int, rect: BBox) -> str:
+        '''Get the words inside a rectangle in reading order'''
+        vocab = self.vocab
+        return ' '.join(vocab[i] for i in self.word_id[self.words_in_rect(page_num, rect)].tolist())
+
+    def search(self, query: str, max_results: int = 1000) -> List[Tuple[int, BBox]]:
+        '''Find a word or phrase case-insensitively, returning page and box of each match'''
+        terms = query.lower().split()
+        n = len(self.word_id) - len(terms) + 1
+        if not terms or n <= 0:
+            return []
+
+        # Substring scan of the vocabulary per term, then phrase matching on aligned masks
+        match = np.ones(n, dtype=bool)
+        for offset, term in enumerate(terms):
+            matching = np.zeros(len(self.vocab), dtype=bool)
+            matching[[i for i, word in enumerate(self._lower_vocab) if term in word]] = True
+            match &= matching[self.word_id[offset:offset + n]]
+            # Phrases do not continue across pages
+            if offset:
+                match &= self.page[offset:offset + n] == self.page[:n]
+
+        results = []
+        for row in np.flatnonzero(match)[:max_results].tolist():
+            boxes = self.boxes[row:row + len(terms)]
+            results.append((int(self.page[row]), (float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                                                  float(boxes[:, 2].max()), float(boxes[:, 3].max()))))
+        return results
+
+    def __len__(self):
+        return len(self.word_id)
+
+def load_or_build(pdf_path: str, cache_dir: Optional[str] = None,
+                  cancel: Optional[threading.Event] = None) -> Optional[TextIndex]:
+    '''Load a document's cached text index, building and caching it on first use'''
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, document_key(pdf_path) + '.npz')
+    if os.path.exists(path):
+        index = TextIndex.load(path)
+        # Older caches hold float32 boxes, which would put rounding noise into
+        # snapped labels, so those are rebuilt
+        if index.boxes.dtype == np.float64:
+            return index
+
+    index = TextIndex.build(pdf_path, cancel=cancel)
+    if index is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        index.save(path)
+    return index
+
+# ====================
@@ -0,0 +1,81 @@
+# ===== core/thumbnail_cache.py =====
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+from core.cache_utils import cache_root, document_key
+from core.lazy_import import LazyModule
+
+fitz = LazyModule('fitz')  # PyMuPDF
+
+THUMBNAIL_WIDTH = 120
+
+def default_cache_dir() -> str:
+    '''Get the per-user directory for cached thumbnails'''
+    return os.path.join(cache_root(), 'thumbnails')
+
+def render_thumbnails(pdf_path: str, pages: List[int], out_dir: str, width: int) -> List[int]:
+    '''Render pages of a PDF as PNG thumbnails of a fixed width'''
+    done = []
+    with fitz.open(pdf_path) as doc:
+        for page_num in pages:
+            page = doc[page_num]
+            zoom = width / page.rect.width
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), annots=False)
+            path = os.path.join(out_dir, f'{page_num}.png')
+            # Write then rename so readers never see a partial file
+            pix.save(path + '.tmp', output='png')
+            os.replace(path + '.tmp', path)
+            done.append(page_num)
+    return done
+
+class ThumbnailCache:
+    '''On-disk page thumbnails keyed by PDF content hash and page number'''
+
+    def __init__(self, cache_dir: Optional[str] = None, width: int = THUMBNAIL_WIDTH):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.width = width
+
+    def document_key(self, pdf_path: str) -> str:
+        '''Get the cache key of a PDF'''
+        return document_key(pdf_path)
+
+    def path(self, doc_key: str, page_num: int) -> str:
+        '''Get the file path of a page thumbnail'''
+        return os.path.join(self.cache_dir, doc_key, f'{page_num}.png')
+
+    def missing(self, doc_key: str, total_pages: int) -> List[int]:
+        '''Get the pages of a document that have no cached thumbnail'''
+        try:
+            names = set(os.listdir(os.path.join(self.cache_dir, doc_key)))
+        except FileNotFoundError:
+            return list(range(total_pages))
+        return [p for p in range(total_pages) if f'{p}.png' not in names]
+
+    def generate(self, pdf_path: str, doc_key: str, pages: List[int], workers: Optional[int] = None,
+                 chunk_size: int = 16, cancel: Optional[threading.Event] = None) -> Iterator[List[int]]:
+        '''Render missing thumbnails in a process pool, yielding pages as chunks finish'''
+        out_dir = os.path.join(self.cache_dir, doc_key)
+        os.makedirs(out_dir, exist_ok=True)
+        chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+        if not chunks:
+            return
+
+        # Spawned workers do not inherit the GUI process's threads or Tk state
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(render_thumbnails, pdf_path, chunk, out_dir, self.width)
+                       for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    if cancel is not None and cancel.is_set():
+                        break
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+# ====================
@@ -0,0 +1,118 @@
+# ===== core/workspace.py =====
+
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from core.label_journal import LabelJournal
+from core.label_manager import LabelManager
+from core.pdf_document import PDFDocument
+
+def list_pdfs(directory: str) -> List[str]:
+    '''Get the PDF files in a directory, sorted by name'''
+    with os.scandir(directory) as entries:
+        paths = [e.path for e in entries if e.is_file() and e.name.lower().endswith('.pdf')]
+    return sorted(paths, key=lambda p: os.path.basename(p).lower())
+
+class WorkspaceDocument:
+    '''An open PDF together with its labels'''
+
+    def __init__(self, file_path: str, pdf_doc: PDFDocument, label_manager: LabelManager):
+        self.file_path = file_path
+        self.pdf_doc = pdf_doc
+        self.label_manager = label_manager
+
+class Workspace:
+    '''A list of PDFs with a bounded LRU pool of open documents and their labels'''
+
+    def __init__(self, max_open: int = 8, cache_bytes: int = 256 * 1024 * 1024,
+                 memory_budget: Optional[int] = None):
+        self.paths: List[str] = []
+        self.max_open = max_open
+        # Resident memory budget in bytes applied to every open document
+        self.memory_budget = memory_budget
+        # The active document gets the full render cache, the others a share of it
+        self.cache_bytes = cache_bytes
+        self.background_cache_bytes = cache_bytes // max(max_open, 1)
+        self.open_documents: 'OrderedDict[str, WorkspaceDocument]' = OrderedDict()
+        # Documents being opened in the background by preload()
+        self._preloading: Dict[str, Future] = {}
+
+    def set_paths(self, paths: List[str]):
+        '''Replace the document list, closing documents no longer in it'''
+        self.paths = list(paths)
+        keep = set(self.paths)
+        for path in [p for p in self.open_documents if p not in keep]:
+            self._close(path)
+
+    def preload(self, file_path: str):
+        '''Start opening a document on a background thread, ahead of open()'''
+        if file_path in self.open_documents or file_path in self._preloading:
+            return
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._preloading[file_path] = executor.submit(self._load, file_path)
+        executor.shutdown(wait=False)
+
+    def open(self, file_path: str) -> WorkspaceDocument:
+        '''Make a document active, reusing its open handle and labels if pooled'''
+        entry = self.open_documents.get(file_path)
+        if entry is None:
+            future = self._preloading.pop(file_path, None)
+            entry = future.result() if future is not None else self._load(file_path)
+            self.open_documents[file_path] = entry
+        self.open_documents.move_to_end(file_path)
+        # Only documents that have been active index their text, so
+        # preloading several does not start several full-CPU pools
+        entry.pdf_doc.start_text_index()
+
+        for other in self.open_documents.values():
+            other.pdf_doc.set_cache_budget(
+                self.cache_bytes if other is entry else self.background_cache_bytes)
+
+        while len(self.open_documents) > self.max_open:
+            self._close(next(iter(self.open_documents)))
+        return entry
+
+    def close_all(self):
+        '''Close every open document, writing final label snapshots'''
+        for path, future in list(self._preloading.items()):
+            del self._preloading[path]
+            if future.exception() is None:
+                self.open_documents[path] = future.result()
+        for path in list(self.open_documents):
+            self._close(path)
+
+    def _load(self, file_path: str) -> WorkspaceDocument:
+        '''Open a document and recover its autosaved labels'''
+        pdf_doc = PDFDocument(cache_bytes=self.background_cache_bytes, memory_budget=self.memory_budget)
+        pdf_doc.open(file_path)
+
+        # Autosaved edits are recovered now; otherwise the journal files are
+        # only created next to the PDF once its labels are edited
+        label_manager = LabelManager()
+        journal = LabelJournal(file_path)
+        if journal.exists():
+            try:
+                label_manager.attach_journal(journal)
+            except OSError as e:
+                label_manager.journal_error = str(e)
+            except (ValueError, KeyError) as e:
+                # A damaged snapshot must not keep the document from opening;
+                # the first edit starts a new one over it
+                label_manager = LabelManager()
+                label_manager.defer_journal(lambda: LabelJournal(file_path))
+                label_manager.journal_error = f'the autosaved labels could not be recovered ({e})'
+        else:
+            label_manager.defer_journal(lambda: LabelJournal(file_path))
+        return WorkspaceDocument(file_path, pdf_doc, label_manager)
+
+    def _close(self, file_path: str):
+        '''Release a pooled document and its file handle'''
+        entry = self.open_documents.pop(file_path)
+        try:
+            entry.label_manager.detach_journal()
+        finally:
+            entry.label_manager.clear_all()
+            entry.pdf_doc.close()
+
+# ====================
@@ -0,0 +1,42 @@
+# ===== export_dataset.py =====
+
+import argparse
+import sys
+from batch_extract import collect_pdfs
+from core.batch_extractor import load_template
+from core.dataset_export import FORMATS, IMAGE_FORMATS, DatasetExporter
+
+def main():
+    parser = argparse.ArgumentParser(description='Export labeled regions of PDFs as a COCO or YOLO dataset')
+    parser.add_argument('labels', help='label file saved from the labeling tool')
+    parser.add_argument('inputs', nargs='*', help='PDF files or directories the labels apply to')
+    parser.add_argument('-o', '--output', required=True, help='dataset directory')
+    parser.add_argument('--file-list', help='text file with one PDF path per line')
+    parser.add_argument('--format', choices=FORMATS, default='coco', help='annotation format')
+    parser.add_argument('--dpi', type=int, default=150, help='resolution of page images and crops')
+    parser.add_argument('--image-format', choices=IMAGE_FORMATS, default='png', help='image file format')
+    parser.add_argument('--no-crops', action='store_true', help='only write page images and annotations')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    args = parser.parse_args()
+
+    template = load_template(args.labels)
+    pdf_paths = collect_pdfs(args.inputs, args.file_list)
+
+    def report(exporter):
+        sys.stderr.write(f'\r{exporter.pages} / {exporter.total_pages} pages, {exporter.failed} failed, '
+                         f'{exporter.pages_per_second():.1f} pages/sec')
+        sys.stderr.flush()
+
+    exporter = DatasetExporter(template, args.output, fmt=args.format, dpi=args.dpi,
+                               image_format=args.image_format, crops=not args.no_crops, workers=args.workers)
+    exporter.run(pdf_paths, on_progress=report)
+
+    sys.stderr.write(f'\nExported {exporter.pages} pages with {exporter.annotations} boxes '
+                     f'in {exporter.elapsed:.1f}s, {exporter.pages_per_second():.1f} pages/sec\n')
+    for error in exporter.errors:
+        sys.stderr.write(f'Failed: {error}\n')
+    return 1 if exporter.failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
@@ -1,13 +1,91 @@
-# ===== main.py =====
-
-import tkinter as tk
-from ui.main_window import PDFLabelingTool
-
-def main():
-    root = tk.Tk()
-    app = PDFLabelingTool(root)
-    app.run()
-
-if __name__ == '__main__':
-    main()
-# ====================
\ No newline at end of file
+# ===== main.py =====
+
+import argparse
+import importlib
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+from core.metrics import DUMP_ENV, metrics
+from core.profiling import run_profiled
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Label regions of PDF documents')
+    parser.add_argument('pdfs', nargs='*', help='PDF files, or one folder of PDFs, to open at startup')
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help='keep resident memory under this many megabytes by trimming caches')
+    return parser.parse_args()
+
+def show_window() -> tk.Tk:
+    '''Create the main window and draw a first frame before the heavy imports'''
+    root = tk.Tk()
+    root.title('PDF Labeling Tool')
+    root.geometry('1200x800')
+    ttk.Label(root, text='Loading...').pack(expand=True)
+    root.update()
+    return root
+
+def run_in_background(root: tk.Tk, fn: Callable):
+    '''Call fn on a worker thread while the window keeps handling events'''
+    result = {}
+
+    def worker():
+        try:
+            result['value'] = fn()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    while thread.is_alive():
+        root.update()
+        thread.join(0.02)
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+def load_app(pdf_paths: list, memory_budget: Optional[int] = None):
+    '''Start opening the first PDF, then import the UI while it loads'''
+    from core.workspace import Workspace, list_pdfs
+
+    if len(pdf_paths) == 1 and os.path.isdir(pdf_paths[0]):
+        pdf_paths = list_pdfs(pdf_paths[0])
+    pdf_paths = [os.path.abspath(p) for p in pdf_paths]
+    workspace = Workspace(memory_budget=memory_budget)
+    if pdf_paths:
+        workspace.preload(pdf_paths[0])
+
+    importlib.import_module('ui.main_window')
+    return workspace, pdf_paths
+
+def build_app(root: tk.Tk, pdf_paths: list, memory_budget: Optional[int] = None):
+    '''Import the application off the UI thread and build its UI into the window'''
+    workspace, pdf_paths = run_in_background(root, lambda: load_app(pdf_paths, memory_budget))
+    from ui.main_window import PDFLabelingTool
+
+    for child in root.winfo_children():
+        child.destroy()
+    return PDFLabelingTool(root, pdf_paths, memory_budget, workspace)
+
+def main():
+    args = parse_args()
+    dump_path = os.environ.get(DUMP_ENV)
+    if dump_path:
+        metrics.start_dumping(dump_path)
+
+    root = show_window()
+    budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+    app = build_app(root, args.pdfs, budget)
+    if not args.pdfs:
+        # Load PyMuPDF while the user picks a file
+        root.after(200, lambda: threading.Thread(target=importlib.import_module, args=('fitz',), daemon=True).start())
+    try:
+        run_profiled(app.run)
+    finally:
+        if dump_path:
+            metrics.dump(dump_path)
+
+if __name__ == '__main__':
+    main()
+# ====================
@@ -1,5 +1,5 @@
-# ===== models/__init__.py =====
-
-from .label import Label
-
-__all__ = ['Label']
+# ===== models/__init__.py =====
+
+from .label import Label
+
+__all__ = ['Label']
@@ -1,27 +1,40 @@
-# ===== models/label.py =====
-
-from typing import Tuple
-
-class Label:
-    '''Represents a single label with position and text'''
-    
-    def __init__(self, x: float, y: float, label_text: str, bbox: Tuple[float, float, float, float]):
-        self.x = x
-        self.y = y
-        self.label_text = label_text
-        self.bbox = bbox  # (x1, y1, x2, y2)
-    
-    def to_dict(self) -> dict:
-        return {
-            'x': self.x,
-            'y': self.y,
-            'label': self.label_text,
-            'bbox': self.bbox
-        }
-    
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Label':
-        return cls(data['x'], data['y'], data['label'], tuple(data['bbox']))
-    
-    def __repr__(self):
-        return f"Label('{self.label_text}' at {self.bbox})"
+# ===== models/label.py =====
+
+from typing import Optional, Tuple
+
+class Label:
+    '''Represents a single label with position and text, in PDF points'''
+
+    __slots__ = ('x', 'y', 'label_text', 'bbox', 'row')
+
+    def __init__(self, x: float, y: float, label_text: str, bbox: Tuple[float, float, float, float],
+                 row: Optional[int] = None):
+        self.x = x
+        self.y = y
+        self.label_text = label_text
+        self.bbox = bbox  # (x1, y1, x2, y2)
+        self.row = row  # Row id in the LabelStore once stored
+
+    def to_dict(self) -> dict:
+        return {
+            'x': self.x,
+            'y': self.y,
+            'label': self.label_text,
+            'bbox': self.bbox
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Label':
+        return cls(data['x'], data['y'], data['label'], tuple(data['bbox']))
+
+    def __eq__(self, other):
+        # Views of the same stored row are the same label
+        if isinstance(other, Label) and self.row is not None:
+            return self.row == other.row
+        return self is other
+
+    def __hash__(self):
+        return hash(self.row) if self.row is not None else id(self)
+
+    def __repr__(self):
+        return f"Label('{self.label_text}' at {self.bbox})"
@@ -0,0 +1,60 @@
+# ===== qa_labels.py =====
+
+import argparse
+import json
+import os
+import sys
+from core.label_db import is_label_db
+from core.label_qa import LabelQA
+
+def collect_label_files(inputs):
+    '''Expand files and directories into a sorted list of label files'''
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for dirpath, _, filenames in os.walk(item):
+                paths.extend(os.path.join(dirpath, f) for f in filenames
+                             if f.lower().endswith('.json') or is_label_db(f))
+        else:
+            paths.append(item)
+    return sorted(set(paths))
+
+def main():
+    parser = argparse.ArgumentParser(description='Find duplicate and conflicting boxes in label files')
+    parser.add_argument('inputs', nargs='+', help='label files (JSON or label database) or directories')
+    parser.add_argument('-o', '--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--duplicate-iou', type=float, default=0.9,
+                        help='minimum IoU for boxes with the same label to count as duplicates')
+    parser.add_argument('--conflict-iou', type=float, default=0.7,
+                        help='minimum IoU for boxes with different labels to count as a conflict')
+    parser.add_argument('--merge-dir', help='write copies of the label files with duplicates merged here')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    args = parser.parse_args()
+
+    label_paths = collect_label_files(args.inputs)
+    if not label_paths:
+        parser.error('no label files found')
+
+    def report_progress(qa):
+        sys.stderr.write(f'\r{qa.processed}/{len(label_paths)} files, {qa.duplicates} duplicates, '
+                         f'{qa.conflicts} conflicts')
+        sys.stderr.flush()
+
+    qa = LabelQA(args.duplicate_iou, args.conflict_iou, args.merge_dir, args.workers)
+    report = qa.run(label_paths, on_progress=report_progress)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    sys.stderr.write(f'\nChecked {qa.labels} labels in {qa.processed} files ({qa.failed} failed) '
+                     f'in {qa.elapsed:.1f}s: {qa.duplicates} duplicates, {qa.conflicts} conflicts, '
+                     f'{qa.merged} merged\n')
+    return 1 if qa.failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+# ====================
@@ -1,8 +1,25 @@
-# ===== ui/__init__.py =====
-
-from .pdf_canvas import PDFCanvas
-from .label_panel import LabelPanel
-from .main_window import PDFLabelingTool
-
-__all__ = ['PDFCanvas', 'LabelPanel', 'PDFLabelingTool']
-# ====================
+# ===== ui/__init__.py =====
+
+import importlib
+
+# Exports are imported on first access (PEP 562), see core/__init__.py
+_EXPORTS = {
+    'PDFCanvas': '.pdf_canvas',
+    'LabelPanel': '.label_panel',
+    'PDFLabelingTool': '.main_window',
+    'RenderScheduler': '.render_scheduler'
+}
+
+__all__ = ['PDFCanvas', 'LabelPanel', 'PDFLabelingTool', 'RenderScheduler']
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+# ====================
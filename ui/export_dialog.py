@@ -0,0 +1,94 @@
+# ===== ui/export_dialog.py =====
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from typing import Optional
+from core.dataset_export import FORMATS, IMAGE_FORMATS
+
+class ExportDialog:
+    '''Modal dialog choosing where and how to export a labeled dataset'''
+
+    def __init__(self, parent: tk.Tk):
+        self.parent = parent
+        self.result: Optional[dict] = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title('Export Dataset')
+        self.window.transient(parent)
+        self.window.resizable(False, False)
+
+        self.directory_var = tk.StringVar(value='')
+        self.format_var = tk.StringVar(value=FORMATS[0])
+        self.dpi_var = tk.StringVar(value='150')
+        self.image_format_var = tk.StringVar(value=IMAGE_FORMATS[0])
+        self.crops_var = tk.BooleanVar(value=True)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        '''Setup the UI components'''
+        frame = ttk.Frame(self.window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text='Output folder:').grid(row=0, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=self.directory_var, width=40).grid(row=0, column=1, pady=2)
+        ttk.Button(frame, text='Browse...', command=self._browse).grid(row=0, column=2, padx=(5, 0), pady=2)
+
+        ttk.Label(frame, text='Annotations:').grid(row=1, column=0, sticky=tk.W, pady=2)
+        formats = ttk.Frame(frame)
+        formats.grid(row=1, column=1, sticky=tk.W, pady=2)
+        for fmt in FORMATS:
+            ttk.Radiobutton(formats, text=fmt.upper(), value=fmt, variable=self.format_var).pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Label(frame, text='Resolution (DPI):').grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(frame, from_=36, to=600, increment=12, textvariable=self.dpi_var, width=8).grid(
+            row=2, column=1, sticky=tk.W, pady=2)
+
+        ttk.Label(frame, text='Image format:').grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Combobox(frame, values=IMAGE_FORMATS, textvariable=self.image_format_var, state='readonly',
+                     width=6).grid(row=3, column=1, sticky=tk.W, pady=2)
+
+        ttk.Checkbutton(frame, text='Also write a cropped image of every box', variable=self.crops_var).grid(
+            row=4, column=1, sticky=tk.W, pady=2)
+
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=5, column=0, columnspan=3, sticky=tk.E, pady=(10, 0))
+        ttk.Button(buttons, text='Export', command=self._on_export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text='Cancel', command=self.window.destroy).pack(side=tk.LEFT)
+
+    def show(self) -> Optional[dict]:
+        '''Wait for the dialog to close and get DatasetExporter options, or None if cancelled'''
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
+
+    def _browse(self):
+        '''Pick the output folder'''
+        directory = filedialog.askdirectory(parent=self.window, title='Select dataset folder')
+        if directory:
+            self.directory_var.set(directory)
+
+    def _on_export(self):
+        '''Validate the options and close the dialog'''
+        directory = self.directory_var.get().strip()
+        if not directory:
+            messagebox.showwarning('No Folder', 'Please choose an output folder.', parent=self.window)
+            return
+        try:
+            dpi = int(self.dpi_var.get())
+        except ValueError:
+            dpi = 0
+        if not 36 <= dpi <= 600:
+            messagebox.showwarning('Invalid DPI', 'Resolution must be between 36 and 600 DPI.', parent=self.window)
+            return
+
+        self.result = {
+            'out_dir': directory,
+            'fmt': self.format_var.get(),
+            'dpi': dpi,
+            'image_format': self.image_format_var.get(),
+            'crops': self.crops_var.get()
+        }
+        self.window.destroy()
+
+# ====================
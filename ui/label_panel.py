@@ -1,84 +1,317 @@
-# ===== ui/label_panel.py =====
-
-import tkinter as tk
-from tkinter import ttk
-from typing import Callable, Optional
-from core.label_manager import LabelManager
-
-class LabelPanel:
-    '''Manages the label input and display panel'''
-    
-    def __init__(self, parent: ttk.Frame, label_manager: LabelManager):
-        self.parent = parent
-        self.label_manager = label_manager
-        self.current_page = 0
-        
-        self.label_text_var = tk.StringVar(value='')
-        self.listbox = None
-        
-        # Callbacks
-        self.on_delete_selected: Optional[Callable] = None
-        self.on_clear_page: Optional[Callable] = None
-        
-        self._setup_ui()
-    
-    def _setup_ui(self):
-        '''Setup the UI components'''
-        ttk.Label(self.parent, text='Label Input', font=('Arial', 12, 'bold')).pack(pady=5)
-        
-        # Label entry
-        ttk.Label(self.parent, text='Label Text:').pack(anchor=tk.W, padx=5)
-        ttk.Entry(self.parent, textvariable=self.label_text_var, width=30).pack(padx=5, pady=5)
-        
-        # Instructions
-        ttk.Label(self.parent, text='Instructions:', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5, pady=(10, 0))
-        instructions = tk.Text(self.parent, height=5, wrap=tk.WORD, font=('Arial', 9))
-        instructions.pack(padx=5, pady=5, fill=tk.X)
-        instructions.insert('1.0', '1. Enter label text above\\n2. Click and drag on PDF to create labeled region\\n3. Labels are saved per page\\n4. Double-click labels in list to delete')
-        instructions.config(state=tk.DISABLED)
-        
-        # Labels list
-        ttk.Label(self.parent, text='Current Page Labels:', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5, pady=(10, 0))
-        
-        list_frame = ttk.Frame(self.parent)
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set)
-        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.listbox.yview)
-        
-        self.listbox.bind('<Double-Button-1>', lambda e: self._handle_delete())
-        
-        ttk.Button(self.parent, text='Delete Selected Label', command=self._handle_delete).pack(pady=5)
-        ttk.Button(self.parent, text='Clear All Page Labels', command=self._handle_clear).pack(pady=5)
-    
-    def get_label_text(self) -> str:
-        '''Get current label text'''
-        return self.label_text_var.get().strip()
-    
-    def set_page(self, page_num: int):
-        '''Set current page and update display'''
-        self.current_page = page_num
-        self.update_list()
-    
-    def update_list(self):
-        '''Update the labels listbox'''
-        self.listbox.delete(0, tk.END)
-        labels = self.label_manager.get_labels(self.current_page)
-        for i, label in enumerate(labels):
-            self.listbox.insert(tk.END, f'{i+1}. {label.label_text} @ ({int(label.x)}, {int(label.y)})')
-    
-    def _handle_delete(self):
-        '''Handle delete button click'''
-        if self.on_delete_selected:
-            self.on_delete_selected()
-    
-    def _handle_clear(self):
-        '''Handle clear button click'''
-        if self.on_clear_page:
-            self.on_clear_page()
-
+# ===== ui/label_panel.py =====
+
+import tkinter as tk
+import numpy as np
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+from core.label_manager import LabelManager
+from core.metrics import timed
+from models.label import Label
+
+class LabelPanel:
+    '''Manages the label input and display panel'''
+
+    def __init__(self, parent: ttk.Frame, label_manager: LabelManager):
+        self.parent = parent
+        self.label_manager = label_manager
+        self.current_page = 0
+
+        self.label_text_var = tk.StringVar(value='')
+        self.filter_var = tk.StringVar(value='')
+        self.canvas = None
+        self.count_label = None
+        self.row_height = 18
+
+        # Page position of the selected label
+        self.selected_index: Optional[int] = None
+
+        # Columns of the current page's labels, and the page positions of
+        # the labels passing the filter; only visible rows become canvas items.
+        # The arrays have spare capacity so edits update them in place; only
+        # the first _count labels and _shown rows are valid.
+        self._boxes = np.empty((0, 4), dtype=np.float64)
+        self._text_ids = np.empty(0, dtype=np.int32)
+        self._texts: List[str] = []
+        self._rows = np.empty(0, dtype=np.int64)
+        self._count = 0
+        self._shown = 0
+        self.cells: Dict[int, int] = {}
+        self._update_pending = False
+
+        # Callbacks
+        self.on_delete_selected: Optional[Callable] = None
+        self.on_clear_page: Optional[Callable] = None
+        self.on_copy_to_similar: Optional[Callable] = None
+        self.on_selection_changed: Optional[Callable] = None
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        '''Setup the UI components'''
+        ttk.Label(self.parent, text='Label Input', font=('Arial', 12, 'bold')).pack(pady=5)
+
+        # Label entry
+        ttk.Label(self.parent, text='Label Text:').pack(anchor=tk.W, padx=5)
+        ttk.Entry(self.parent, textvariable=self.label_text_var, width=30).pack(padx=5, pady=5)
+
+        # Instructions
+        ttk.Label(self.parent, text='Instructions:', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5, pady=(10, 0))
+        instructions = tk.Text(self.parent, height=5, wrap=tk.WORD, font=('Arial', 9))
+        instructions.pack(padx=5, pady=5, fill=tk.X)
+        instructions.insert('1.0', '1. Enter label text above\\n2. Click and drag on PDF to create labeled region\\n3. Labels are saved per page\\n4. Double-click labels in list to delete')
+        instructions.config(state=tk.DISABLED)
+
+        # Labels list
+        ttk.Label(self.parent, text='Current Page Labels:', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5, pady=(10, 0))
+
+        filter_frame = ttk.Frame(self.parent)
+        filter_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(filter_frame, text='Filter:').pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        self.filter_var.trace_add('write', lambda *args: self._apply_filter())
+
+        self.count_label = ttk.Label(self.parent, text='')
+        self.count_label.pack(anchor=tk.W, padx=5)
+
+        list_frame = ttk.Frame(self.parent)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        scrollbar = ttk.Scrollbar(list_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def yscroll(*args):
+            scrollbar.set(*args)
+            self._schedule_update()
+
+        self.canvas = tk.Canvas(list_frame, bg='white', highlightthickness=1, takefocus=1,
+                                yscrollcommand=yscroll, yscrollincrement=self.row_height)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.canvas.yview)
+
+        self.canvas.bind('<Configure>', lambda e: self._schedule_update())
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Double-Button-1>', lambda e: self._handle_delete())
+        self.canvas.bind('<Delete>', lambda e: self._handle_delete())
+        self.canvas.bind('<Up>', lambda e: self._move_selection(-1))
+        self.canvas.bind('<Down>', lambda e: self._move_selection(1))
+        self.canvas.bind('<MouseWheel>', lambda e: self.canvas.yview_scroll(-3 if e.delta > 0 else 3, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-3, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(3, 'units'))
+
+        ttk.Button(self.parent, text='Delete Selected Label', command=self._handle_delete).pack(pady=5)
+        ttk.Button(self.parent, text='Clear All Page Labels', command=self._handle_clear).pack(pady=5)
+        ttk.Button(self.parent, text='Copy to Similar Pages', command=self._handle_copy).pack(pady=5)
+
+    def get_label_text(self) -> str:
+        '''Get current label text'''
+        return self.label_text_var.get().strip()
+
+    def set_label_manager(self, label_manager: LabelManager):
+        '''Show the labels of another document'''
+        self.label_manager = label_manager
+        self.current_page = 0
+        self.update_list()
+
+    def set_page(self, page_num: int):
+        '''Set current page and update display'''
+        self.current_page = page_num
+        self.update_list()
+
+    @timed('update_list')
+    def update_list(self):
+        '''Reload the current page's labels and redraw the visible rows'''
+        self._load_page()
+        self.selected_index = None
+        self._apply_filter()
+
+    @timed('update_list_row')
+    def label_added(self, label: Label):
+        '''Show a label appended to the current page without rebuilding the list'''
+        index = self._count
+        self._boxes = _reserve(self._boxes, index + 1)
+        self._text_ids = _reserve(self._text_ids, index + 1)
+        self._boxes[index] = label.bbox
+        self._text_ids[index] = self.label_manager.get_text_id(label.label_text)
+        self._count += 1
+        if self._matches(index):
+            self._rows = _reserve(self._rows, self._shown + 1)
+            self._rows[self._shown] = index
+            self._shown += 1
+        self._update_extent()
+
+    @timed('update_list_row')
+    def label_deleted(self, index: int):
+        '''Drop a deleted label from the list, renumbering only the rows on screen'''
+        # Shift the later labels up one position within the cached columns
+        count = self._count
+        self._boxes[index:count - 1] = self._boxes[index + 1:count]
+        self._text_ids[index:count - 1] = self._text_ids[index + 1:count]
+        self._count -= 1
+
+        rows = self._rows[:self._shown]
+        position = int(np.searchsorted(rows, index))
+        if position < self._shown and rows[position] == index:
+            rows[position:-1] = rows[position + 1:]
+            self._shown -= 1
+        # Labels after the deleted one move up one position on the page
+        self._rows[position:self._shown] -= 1
+
+        if self.selected_index == index:
+            self.selected_index = None
+        elif self.selected_index is not None and self.selected_index > index:
+            self.selected_index -= 1
+
+        for row in [r for r in self.cells if r >= position]:
+            self.canvas.delete(self.cells.pop(row))
+        self._update_extent()
+
+    def select_index(self, index: Optional[int]):
+        '''Select a label by its position on the page, or clear the selection'''
+        self.selected_index = index if index is not None and index >= 0 else None
+        self._draw_selection()
+        position = self._position_of(self.selected_index)
+        if position is None:
+            return
+
+        top = position * self.row_height
+        view_top = self.canvas.canvasy(0)
+        view_bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        if top < view_top or top + self.row_height > view_bottom:
+            self.canvas.yview_moveto(max(top - (view_bottom - view_top) / 2, 0) / self._list_height())
+
+    def _load_page(self):
+        '''Fetch the current page's label columns without creating Label objects'''
+        self._boxes = self.label_manager.get_page_boxes(self.current_page)
+        self._text_ids, self._texts = self.label_manager.get_page_text_ids(self.current_page)
+        self._count = len(self._text_ids)
+
+    def _apply_filter(self):
+        '''Recompute the rows passing the filter and redraw the list'''
+        query = self.filter_var.get().strip().lower()
+        if query:
+            # Match each distinct text once, then select rows by text id
+            matching = np.zeros(len(self._texts), dtype=bool)
+            matching[[i for i, text in enumerate(self._texts) if query in text.lower()]] = True
+            self._rows = np.flatnonzero(matching[self._text_ids[:self._count]])
+        else:
+            self._rows = np.arange(self._count)
+        self._shown = len(self._rows)
+
+        self.canvas.delete('all')
+        self.cells = {}
+        self.canvas.yview_moveto(0)
+        self._update_extent()
+
+    def _matches(self, index: int) -> bool:
+        '''Check whether a label passes the filter'''
+        query = self.filter_var.get().strip().lower()
+        return not query or query in self._texts[self._text_ids[index]].lower()
+
+    def _position_of(self, index: Optional[int]) -> Optional[int]:
+        '''Get the list row showing a label, or None if it is filtered out'''
+        if index is None:
+            return None
+        position = int(np.searchsorted(self._rows[:self._shown], index))
+        if position < self._shown and self._rows[position] == index:
+            return position
+        return None
+
+    def _list_height(self) -> int:
+        return max(self._shown * self.row_height, 1)
+
+    def _update_extent(self):
+        '''Resize the scroll region and label count after the rows changed'''
+        total = self._count
+        shown = self._shown
+        self.count_label.config(text=f'{shown} of {total} labels' if shown != total else f'{total} labels')
+        self.canvas.config(scrollregion=(0, 0, 1, self._list_height()))
+        self._schedule_update()
+
+    def _schedule_update(self):
+        '''Coalesce scroll, resize and edit events into one update'''
+        if not self._update_pending:
+            self._update_pending = True
+            self.canvas.after_idle(self._update_visible)
+
+    def _update_visible(self):
+        '''Draw rows scrolled into view and release those scrolled out'''
+        self._update_pending = False
+        top = max(self.canvas.canvasy(0), 0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        visible = range(int(top // self.row_height),
+                        min(int(bottom // self.row_height), self._shown - 1) + 1)
+
+        for position in [p for p in self.cells if p not in visible]:
+            self.canvas.delete(self.cells.pop(position))
+        for position in visible:
+            if position not in self.cells:
+                self.cells[position] = self._draw_row(position)
+        self._draw_selection()
+
+    def _draw_row(self, position: int) -> int:
+        '''Draw the text of one list row'''
+        index = int(self._rows[position])
+        x, y = self._boxes[index, :2].tolist()
+        text = self._texts[self._text_ids[index]]
+        return self.canvas.create_text(4, position * self.row_height + self.row_height // 2, anchor=tk.W,
+                                       text=f'{index+1}. {text} @ ({int(x)}, {int(y)})', font=('Arial', 9))
+
+    def _draw_selection(self):
+        '''Highlight the selected row behind its text'''
+        self.canvas.delete('selected')
+        position = self._position_of(self.selected_index)
+        if position is not None:
+            top = position * self.row_height
+            self.canvas.create_rectangle(0, top, self.canvas.winfo_width(), top + self.row_height,
+                                         fill='#cce0ff', outline='', tags='selected')
+            self.canvas.tag_lower('selected')
+
+    def _on_click(self, event):
+        '''Select the clicked row'''
+        self.canvas.focus_set()
+        position = int(self.canvas.canvasy(event.y) // self.row_height)
+        if 0 <= position < self._shown:
+            self._select_position(position)
+
+    def _move_selection(self, step: int):
+        '''Move the selection up or down the list'''
+        if not self._shown:
+            return
+        position = self._position_of(self.selected_index)
+        if position is None:
+            position = 0 if step > 0 else self._shown - 1
+        else:
+            position = min(max(position + step, 0), self._shown - 1)
+        self._select_position(position)
+
+    def _select_position(self, position: int):
+        '''Select a list row and report the label's page position'''
+        index = int(self._rows[position])
+        self.select_index(index)
+        if self.on_selection_changed:
+            self.on_selection_changed(index)
+
+    def _handle_delete(self):
+        '''Handle delete button click'''
+        if self.on_delete_selected:
+            self.on_delete_selected()
+
+    def _handle_clear(self):
+        '''Handle clear button click'''
+        if self.on_clear_page:
+            self.on_clear_page()
+
+    def _handle_copy(self):
+        '''Handle copy to similar pages button click'''
+        if self.on_copy_to_similar:
+            self.on_copy_to_similar()
+
+def _reserve(column: np.ndarray, size: int) -> np.ndarray:
+    '''Get a column with room for size rows, doubling its capacity when full'''
+    if size <= len(column):
+        return column
+    grown = np.zeros((max(size, len(column) * 2),) + column.shape[1:], dtype=column.dtype)
+    grown[:len(column)] = column
+    return grown
+
 # ====================
\ No newline at end of file
@@ -1,199 +1,589 @@
-# ===== ui/main_window.py =====
-
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from typing import Tuple
-from core.pdf_document import PDFDocument
-from core.label_manager import LabelManager
-from models.label import Label
-from ui.pdf_canvas import PDFCanvas
-from ui.label_panel import LabelPanel
-
-class PDFLabelingTool:
-    '''Main application class'''
-    
-    def __init__(self, root: tk.Tk):
-        self.root = root
-        self.root.title('PDF Labeling Tool')
-        self.root.geometry('1200x800')
-        
-        # Initialize components
-        self.pdf_doc = PDFDocument()
-        self.label_manager = LabelManager()
-        
-        # UI components (will be initialized in setup)
-        self.pdf_canvas = None
-        self.label_panel = None
-        self.page_label = None
-        
-        self._setup_ui()
-    
-    def _setup_ui(self):
-        '''Setup the main UI'''
-        # Menu bar
-        self._create_menu()
-        
-        # Main container
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Left panel - PDF viewer
-        left_frame = ttk.Frame(main_frame)
-        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        canvas = tk.Canvas(left_frame, bg='gray')
-        canvas.pack(fill=tk.BOTH, expand=True)
-        
-        self.pdf_canvas = PDFCanvas(canvas, self.label_manager)
-        self.pdf_canvas.on_rectangle_drawn = self._on_rectangle_drawn
-        
-        # Navigation frame
-        nav_frame = ttk.Frame(left_frame)
-        nav_frame.pack(fill=tk.X, pady=5)
-        
-        ttk.Button(nav_frame, text='◀ Previous', command=self._prev_page).pack(side=tk.LEFT, padx=5)
-        self.page_label = ttk.Label(nav_frame, text='Page: 0 / 0')
-        self.page_label.pack(side=tk.LEFT, padx=10)
-        ttk.Button(nav_frame, text='Next ▶', command=self._next_page).pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(nav_frame, text='Zoom:').pack(side=tk.LEFT, padx=(20, 5))
-        ttk.Button(nav_frame, text='-', command=self._zoom_out, width=3).pack(side=tk.LEFT)
-        ttk.Button(nav_frame, text='+', command=self._zoom_in, width=3).pack(side=tk.LEFT, padx=5)
-        
-        # Right panel - Labels
-        right_frame = ttk.Frame(main_frame, width=300)
-        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(5, 0))
-        right_frame.pack_propagate(False)
-        
-        self.label_panel = LabelPanel(right_frame, self.label_manager)
-        self.label_panel.on_delete_selected = self._delete_selected_label
-        self.label_panel.on_clear_page = self._clear_page_labels
-    
-    def _create_menu(self):
-        '''Create menu bar'''
-        menubar = tk.Menu(self.root)
-        self.root.config(menu=menubar)
-        
-        file_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label='File', menu=file_menu)
-        file_menu.add_command(label='Open PDF', command=self._open_pdf)
-        file_menu.add_command(label='Save Labels', command=self._save_labels)
-        file_menu.add_command(label='Load Labels', command=self._load_labels)
-        file_menu.add_separator()
-        file_menu.add_command(label='Exit', command=self.root.quit)
-    
-    def _open_pdf(self):
-        '''Open PDF file'''
-        file_path = filedialog.askopenfilename(
-            title='Select PDF file',
-            filetypes=[('PDF files', '*.pdf'), ('All files', '*.*')]
-        )
-        
-        if file_path:
-            try:
-                self.pdf_doc.open(file_path)
-                self.label_manager.clear_all()
-                self._display_current_page()
-            except Exception as e:
-                messagebox.showerror('Error', str(e))
-    
-    def _display_current_page(self):
-        '''Display current page'''
-        img = self.pdf_doc.render_page(self.pdf_doc.current_page)
-        if img:
-            self.pdf_canvas.display_image(img, self.pdf_doc.current_page)
-            self.label_panel.set_page(self.pdf_doc.current_page)
-            self.page_label.config(text=self.pdf_doc.get_page_info())
-    
-    def _next_page(self):
-        '''Go to next page'''
-        if self.pdf_doc.next_page():
-            self._display_current_page()
-    
-    def _prev_page(self):
-        '''Go to previous page'''
-        if self.pdf_doc.prev_page():
-            self._display_current_page()
-    
-    def _zoom_in(self):
-        '''Zoom in'''
-        self.pdf_doc.zoom_in()
-        self._display_current_page()
-    
-    def _zoom_out(self):
-        '''Zoom out'''
-        self.pdf_doc.zoom_out()
-        self._display_current_page()
-    
-    def _on_rectangle_drawn(self, bbox: Tuple[float, float, float, float]):
-        '''Handle rectangle drawn on canvas'''
-        label_text = self.label_panel.get_label_text()
-        
-        if not label_text:
-            messagebox.showwarning('No Label', 'Please enter label text before drawing.')
-            return
-        
-        # Create label
-        x, y = bbox[0], bbox[1]
-        label = Label(x, y, label_text, bbox)
-        self.label_manager.add_label(self.pdf_doc.current_page, label)
-        
-        # Refresh display
-        self.pdf_canvas.refresh()
-        self.label_panel.update_list()
-    
-    def _delete_selected_label(self):
-        '''Delete selected label from list'''
-        selection = self.label_panel.listbox.curselection()
-        if selection:
-            index = selection[0]
-            self.label_manager.delete_label(self.pdf_doc.current_page, index)
-            self.pdf_canvas.refresh()
-            self.label_panel.update_list()
-    
-    def _clear_page_labels(self):
-        '''Clear all labels from current page'''
-        if messagebox.askyesno('Confirm', 'Clear all labels from this page?'):
-            self.label_manager.clear_page(self.pdf_doc.current_page)
-            self.pdf_canvas.refresh()
-            self.label_panel.update_list()
-    
-    def _save_labels(self):
-        '''Save labels to file'''
-        if not self.pdf_doc.file_path:
-            messagebox.showwarning('No PDF', 'Please open a PDF first.')
-            return
-        
-        file_path = filedialog.asksaveasfilename(
-            title='Save Labels',
-            defaultextension='.json',
-            filetypes=[('JSON files', '*.json'), ('All files', '*.*')]
-        )
-        
-        if file_path:
-            try:
-                self.label_manager.save_to_file(file_path)
-                messagebox.showinfo('Success', 'Labels saved successfully!')
-            except Exception as e:
-                messagebox.showerror('Error', f'Failed to save labels: {str(e)}')
-    
-    def _load_labels(self):
-        '''Load labels from file'''
-        file_path = filedialog.askopenfilename(
-            title='Load Labels',
-            filetypes=[('JSON files', '*.json'), ('All files', '*.*')]
-        )
-        
-        if file_path:
-            try:
-                self.label_manager.load_from_file(file_path)
-                self._display_current_page()
-                messagebox.showinfo('Success', 'Labels loaded successfully!')
-            except Exception as e:
-                messagebox.showerror('Error', f'Failed to load labels: {str(e)}')
-    
-    def run(self):
-        '''Start the application'''
-        self.root.mainloop()
-
+# ===== ui/main_window.py =====
+
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from typing import Dict, List, Optional, Tuple
+from core.batch_extractor import manager_template
+from core.dataset_export import DatasetExporter
+from core.pdf_document import PDFDocument
+from core.thumbnail_cache import ThumbnailCache
+from core.label_manager import LabelManager
+from core.memory import current_rss
+from core.workspace import Workspace, list_pdfs
+from models.label import Label
+from ui.export_dialog import ExportDialog
+from ui.pdf_canvas import PDFCanvas
+from ui.label_panel import LabelPanel
+from ui.render_scheduler import RenderScheduler
+from ui.stats_overlay import StatsOverlay
+from ui.thumbnail_panel import ThumbnailPanel
+from ui.workspace_panel import WorkspacePanel
+
+LABEL_FILETYPES = [
+    ('JSON files', '*.json'),
+    ('Label databases', '*.db *.sqlite'),
+    ('All files', '*.*')
+]
+
+class PDFLabelingTool:
+    '''Main application class'''
+
+    def __init__(self, root: tk.Tk, pdf_paths: Optional[List[str]] = None,
+                 memory_budget: Optional[int] = None, workspace: Optional[Workspace] = None):
+        self.root = root
+        self.root.title('PDF Labeling Tool')
+        self.root.geometry('1200x800')
+
+        # Initialize components; the active document and its labels come from the workspace
+        self.workspace = workspace or Workspace(memory_budget=memory_budget)
+        if pdf_paths:
+            # Open the first document while the rest of the UI is built;
+            # a no-op if main.py already started it
+            self.workspace.preload(pdf_paths[0])
+        self.pdf_doc = PDFDocument()
+        self.label_manager = LabelManager()
+        self.render_scheduler = RenderScheduler(self.root)
+
+        # Milliseconds from the last page request to its preview and final image
+        self.render_timings: Dict[str, float] = {}
+        self._render_started = 0.0
+
+        # Text search state: query, (page, bbox) matches and current match
+        self._search_query: Optional[str] = None
+        self._search_results: List[Tuple[int, Tuple[float, float, float, float]]] = []
+        self._search_pos = 0
+
+        # UI components (will be initialized in setup)
+        self.pdf_canvas = None
+        self.label_panel = None
+        self.thumbnail_panel = None
+        self.workspace_panel = None
+        self.stats_overlay = None
+        self.page_label = None
+        self.status_label = None
+
+        self._setup_ui()
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+        if pdf_paths:
+            self.root.after_idle(lambda: self._open_workspace(pdf_paths))
+
+    def _setup_ui(self):
+        '''Setup the main UI'''
+        # Menu bar
+        self._create_menu()
+
+        # Main container
+        main_frame = ttk.Frame(self.root)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Far left - document list and page navigator
+        thumb_frame = ttk.Frame(main_frame)
+        thumb_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 5))
+
+        documents_frame = ttk.Frame(thumb_frame)
+        documents_frame.pack(fill=tk.X)
+        self.workspace_panel = WorkspacePanel(documents_frame)
+        self.workspace_panel.on_document_selected = self._switch_document
+
+        self.thumbnail_panel = ThumbnailPanel(thumb_frame, ThumbnailCache())
+        self.thumbnail_panel.on_page_selected = self._go_to_page
+
+        # Left panel - PDF viewer
+        left_frame = ttk.Frame(main_frame)
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        canvas_frame = ttk.Frame(left_frame)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+
+        xbar = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL)
+        xbar.pack(side=tk.BOTTOM, fill=tk.X)
+        ybar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL)
+        ybar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        canvas = tk.Canvas(canvas_frame, bg='gray')
+        canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.pdf_canvas = PDFCanvas(canvas, self.label_manager, self.render_scheduler)
+        self.pdf_canvas.attach_scrollbars(xbar, ybar)
+        self.pdf_canvas.on_rectangle_drawn = self._on_rectangle_drawn
+        self.pdf_canvas.on_label_selected = self._on_canvas_label_selected
+
+        self.stats_overlay = StatsOverlay(canvas_frame)
+        self.stats_overlay.get_extra_lines = self._render_stats
+        self.root.bind('<F12>', lambda e: self.stats_overlay.toggle())
+
+        # Navigation frame
+        nav_frame = ttk.Frame(left_frame)
+        nav_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Button(nav_frame, text='◀ Previous', command=self._prev_page).pack(side=tk.LEFT, padx=5)
+        self.page_label = ttk.Label(nav_frame, text='Page: 0 / 0')
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        ttk.Button(nav_frame, text='Next ▶', command=self._next_page).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(nav_frame, text='Zoom:').pack(side=tk.LEFT, padx=(20, 5))
+        ttk.Button(nav_frame, text='-', command=self._zoom_out, width=3).pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text='+', command=self._zoom_in, width=3).pack(side=tk.LEFT, padx=5)
+
+        self.snap_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(nav_frame, text='Snap to text', variable=self.snap_var).pack(side=tk.LEFT, padx=(20, 5))
+
+        self.status_label = ttk.Label(nav_frame, text='')
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+
+        # Search frame
+        search_frame = ttk.Frame(left_frame)
+        search_frame.pack(fill=tk.X)
+
+        ttk.Label(search_frame, text='Find:').pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar(value='')
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT)
+        search_entry.bind('<Return>', lambda e: self._search(1))
+        search_entry.bind('<Shift-Return>', lambda e: self._search(-1))
+        ttk.Button(search_frame, text='Next Match', command=lambda: self._search(1)).pack(side=tk.LEFT, padx=5)
+        self.search_status = ttk.Label(search_frame, text='')
+        self.search_status.pack(side=tk.LEFT, padx=5)
+
+        # Right panel - Labels
+        right_frame = ttk.Frame(main_frame, width=300)
+        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(5, 0))
+        right_frame.pack_propagate(False)
+
+        self.label_panel = LabelPanel(right_frame, self.label_manager)
+        self.label_panel.on_delete_selected = self._delete_selected_label
+        self.label_panel.on_clear_page = self._clear_page_labels
+        self.label_panel.on_copy_to_similar = self._copy_to_similar_pages
+        self.label_panel.on_selection_changed = self._on_list_label_selected
+
+    def _create_menu(self):
+        '''Create menu bar'''
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label='File', menu=file_menu)
+        file_menu.add_command(label='Open PDF', command=self._open_pdf)
+        file_menu.add_command(label='Open Folder', command=self._open_folder)
+        file_menu.add_command(label='Save Labels', command=self._save_labels)
+        file_menu.add_command(label='Load Labels', command=self._load_labels)
+        file_menu.add_command(label='Export Dataset...', command=self._export_dataset)
+        file_menu.add_separator()
+        file_menu.add_command(label='Exit', command=self._on_close)
+
+        view_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label='View', menu=view_menu)
+        view_menu.add_command(label='Performance Stats', accelerator='F12',
+                              command=lambda: self.stats_overlay.toggle())
+
+    def _open_pdf(self):
+        '''Open PDF file'''
+        file_path = filedialog.askopenfilename(
+            title='Select PDF file',
+            filetypes=[('PDF files', '*.pdf'), ('All files', '*.*')]
+        )
+
+        if file_path:
+            self._open_workspace([file_path])
+
+    def _open_folder(self):
+        '''Open every PDF in a folder as a workspace'''
+        directory = filedialog.askdirectory(title='Select folder of PDF files')
+        if not directory:
+            return
+
+        try:
+            paths = list_pdfs(directory)
+        except OSError as e:
+            messagebox.showerror('Error', str(e))
+            return
+        if not paths:
+            messagebox.showwarning('No PDFs', 'The selected folder contains no PDF files.')
+            return
+        self._open_workspace(paths)
+
+    def _open_workspace(self, paths: List[str]):
+        '''Replace the workspace document list and show its first document'''
+        self.workspace.set_paths(paths)
+        self.workspace_panel.set_documents(paths)
+        self._switch_document(0)
+
+    def _switch_document(self, index: int):
+        '''Make a workspace document active, keeping the labels of the others'''
+        file_path = self.workspace.paths[index]
+        self.render_scheduler.cancel(lambda channel: True)
+        try:
+            entry = self.workspace.open(file_path)
+        except Exception as e:
+            messagebox.showerror('Error', str(e))
+            return
+
+        self.pdf_doc = entry.pdf_doc
+        self.label_manager = entry.label_manager
+        self.pdf_canvas.set_label_manager(self.label_manager)
+        self.label_panel.set_label_manager(self.label_manager)
+        self.workspace_panel.select(index)
+
+        self._search_query = None
+        self.pdf_canvas.set_highlight(0, None)
+        self.thumbnail_panel.set_document(file_path, self.pdf_doc.total_pages)
+        self._display_current_page()
+
+        self._warn_autosave_error()
+
+    def _warn_autosave_error(self):
+        '''Tell the user once about a problem autosaving the labels of the active document'''
+        # The journal is created on the first edit, so this is checked after edits too
+        error = self.label_manager.journal_error
+        if error:
+            self.label_manager.journal_error = None
+            messagebox.showwarning('Autosave', f'Autosave problem: {error}')
+
+    def _display_current_page(self):
+        '''Render the current page in the background and display it when done'''
+        # Jobs hold on to this document in case the workspace switches to another
+        doc = self.pdf_doc
+        page_num = doc.current_page
+        zoom = doc.zoom_level
+        self.page_label.config(text=doc.get_page_info())
+        self.thumbnail_panel.set_current(page_num)
+        self._render_started = time.perf_counter()
+        self.render_timings = {}
+
+        # Only the latest page/zoom is rendered; earlier requests are superseded
+        if doc.use_tiles():
+            # High zoom: only the page size is needed up front, tiles load as they become visible
+            self.render_scheduler.submit(
+                'page',
+                lambda: doc.get_page_size(page_num, zoom),
+                lambda size: self._show_tiled_page(page_num, zoom, size),
+                self._on_render_error
+            )
+        elif doc.progressive and not doc.is_rendered(page_num, zoom):
+            # Uncached page: show a quick preview, then refine it
+            self.render_scheduler.submit(
+                'page',
+                lambda: doc.render_preview(page_num, zoom),
+                lambda data: self._show_preview(page_num, zoom, data),
+                self._on_render_error
+            )
+        else:
+            self.render_scheduler.submit(
+                'page',
+                lambda: doc.render_page(page_num, zoom),
+                lambda img: self._show_page(page_num, zoom, img),
+                self._on_render_error
+            )
+
+    def _show_page(self, page_num: int, zoom: float, data: Optional[bytes]):
+        '''Display a rendered page'''
+        if not data:
+            return
+        # Labels are redrawn below, so stale label views can be invalidated here
+        self.label_manager.compact_store()
+        self.pdf_canvas.display_image(data, page_num, zoom)
+        self.label_panel.set_page(page_num)
+        self._record_render_time('first_pixel_ms')
+        self._record_render_time('final_ms')
+
+    def _show_preview(self, page_num: int, zoom: float, data: Optional[bytes]):
+        '''Display a page preview and queue its full-resolution render'''
+        if not data:
+            return
+        self.label_manager.compact_store()
+        self.pdf_canvas.display_image(data, page_num, zoom, self.pdf_doc.preview_reduction)
+        self.label_panel.set_page(page_num)
+        self._record_render_time('first_pixel_ms')
+
+        # Submitting on the same channel lets navigation supersede the refinement
+        doc = self.pdf_doc
+        self.render_scheduler.submit(
+            'page',
+            lambda: doc.render_page(page_num, zoom),
+            self._refine_page,
+            self._on_render_error
+        )
+
+    def _refine_page(self, data: Optional[bytes]):
+        '''Replace the preview with the full-resolution page'''
+        if data:
+            self.pdf_canvas.replace_image(data)
+            self._record_render_time('final_ms')
+
+    def _record_render_time(self, name: str):
+        self.render_timings[name] = (time.perf_counter() - self._render_started) * 1000
+
+    def _render_stats(self) -> List[str]:
+        '''Describe the last page render and the render cache for the stats overlay'''
+        lines = [f'{name}: {ms:.1f} ms' for name, ms in self.render_timings.items()]
+        stats = self.pdf_doc.get_cache_stats()
+        lines.append(f"cache: {stats['hit_rate']:.0%} hits, {stats['entries']} entries, "
+                     f"{stats['bytes'] / (1024 * 1024):.0f} / {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        rss = current_rss()
+        if rss is not None:
+            budget = self.pdf_doc.memory_budget
+            lines.append(f'memory: {rss / (1024 * 1024):.0f} MB' +
+                         (f' / {budget / (1024 * 1024):.0f} MB budget' if budget else ''))
+        return lines
+
+    def _show_tiled_page(self, page_num: int, zoom: float, page_size: Tuple[int, int]):
+        '''Display a page as tiles rendered on demand'''
+        self.label_manager.compact_store()
+        doc = self.pdf_doc
+        self.pdf_canvas.display_tiled(
+            page_num,
+            page_size,
+            doc.tile_size,
+            lambda col, row: doc.render_tile(page_num, col, row, zoom),
+            zoom
+        )
+        self.label_panel.set_page(page_num)
+
+    def _on_render_error(self, error: Exception):
+        '''Report a failed background render'''
+        messagebox.showerror('Error', f'Failed to render page: {str(error)}')
+
+    def _next_page(self):
+        '''Go to next page'''
+        if self.pdf_doc.next_page():
+            self._display_current_page()
+
+    def _prev_page(self):
+        '''Go to previous page'''
+        if self.pdf_doc.prev_page():
+            self._display_current_page()
+
+    def _go_to_page(self, page_num: int):
+        '''Go to a page picked in the navigator'''
+        if self.pdf_doc.go_to_page(page_num):
+            self._display_current_page()
+
+    def _search(self, step: int):
+        '''Jump to the next (or previous) match of the search text'''
+        query = self.search_var.get().strip()
+        if not query or not self.pdf_doc.document:
+            return
+
+        if query != self._search_query:
+            results = self.pdf_doc.search_text(query)
+            if results is None:
+                error = self.pdf_doc.text_index_error
+                self.search_status.config(text=f'Search unavailable: {error}' if error else 'Indexing text...')
+                return
+            self._search_query = query
+            self._search_results = results
+            self._search_pos = 0
+        elif self._search_results:
+            self._search_pos = (self._search_pos + step) % len(self._search_results)
+
+        if not self._search_results:
+            self.search_status.config(text='No matches')
+            self.pdf_canvas.set_highlight(0, None)
+            return
+
+        page_num, bbox = self._search_results[self._search_pos]
+        self.search_status.config(text=f'{self._search_pos + 1} / {len(self._search_results)}')
+        self.pdf_canvas.set_highlight(page_num, bbox)
+        self._go_to_page(page_num)
+
+    def _zoom_in(self):
+        '''Zoom in'''
+        self.pdf_doc.zoom_in()
+        self._display_current_page()
+
+    def _zoom_out(self):
+        '''Zoom out'''
+        self.pdf_doc.zoom_out()
+        self._display_current_page()
+
+    def _on_rectangle_drawn(self, bbox: Tuple[float, float, float, float]):
+        '''Handle rectangle drawn on canvas, with bbox in PDF points'''
+        label_text = self.label_panel.get_label_text()
+
+        if not label_text:
+            messagebox.showwarning('No Label', 'Please enter label text before drawing.')
+            return
+
+        # Fit the box to the words under it once the text index is ready
+        if self.snap_var.get():
+            bbox = self.pdf_doc.snap_to_text(self.pdf_canvas.current_page, bbox) or bbox
+
+        # Create label on the page being shown, which may lag a pending navigation
+        x, y = bbox[0], bbox[1]
+        label = Label(x, y, label_text, bbox)
+        self.label_manager.add_label(self.pdf_canvas.current_page, label)
+
+        # Update display
+        self.pdf_canvas.add_label(label)
+        self.label_panel.label_added(label)
+        self._warn_autosave_error()
+
+    def _on_canvas_label_selected(self, label: Optional[Label]):
+        '''Sync the label list with a label clicked on the canvas'''
+        index = self.label_manager.index_of(self.pdf_canvas.current_page, label) if label else None
+        self.label_panel.select_index(index)
+
+    def _on_list_label_selected(self, index: int):
+        '''Highlight the label selected in the list'''
+        label = self.label_manager.get_label(self.pdf_canvas.current_page, index)
+        if label is not None:
+            self.pdf_canvas.select_label(label)
+
+    def _delete_selected_label(self):
+        '''Delete selected label from list'''
+        index = self.label_panel.selected_index
+        if index is not None:
+            label = self.label_manager.delete_label(self.pdf_canvas.current_page, index)
+            if label:
+                self.pdf_canvas.remove_label(label)
+                self.label_panel.label_deleted(index)
+                self._warn_autosave_error()
+
+    def _clear_page_labels(self):
+        '''Clear all labels from current page'''
+        if messagebox.askyesno('Confirm', 'Clear all labels from this page?'):
+            self.label_manager.clear_page(self.pdf_canvas.current_page)
+            self.pdf_canvas.refresh()
+            self.label_panel.update_list()
+            self._warn_autosave_error()
+
+    def _copy_to_similar_pages(self):
+        '''Copy the current page's labels to every page with the same layout'''
+        if not self.pdf_doc.file_path:
+            messagebox.showwarning('No PDF', 'Please open a PDF first.')
+            return
+        page_num = self.pdf_canvas.current_page
+        if not self.label_manager.get_label_count(page_num):
+            messagebox.showwarning('No Labels', 'Label this page before copying its boxes to similar pages.')
+            return
+
+        # Fingerprinting runs in the background on first use
+        self.pdf_doc.start_layout_index()
+        self._await_layout_index(self.pdf_doc, page_num)
+
+    def _await_layout_index(self, doc: PDFDocument, page_num: int):
+        '''Poll for the layout fingerprints, then offer to copy labels'''
+        if doc is not self.pdf_doc:
+            self.status_label.config(text='')
+            return
+        matches = doc.find_similar_pages(page_num)
+        if matches is None:
+            if doc.layout_index_error:
+                self.status_label.config(text='')
+                messagebox.showerror('Error', f'Failed to compare page layouts: {doc.layout_index_error}')
+            else:
+                self.status_label.config(text='Comparing page layouts...')
+                self.root.after(200, lambda: self._await_layout_index(doc, page_num))
+            return
+
+        self.status_label.config(text='')
+        if not matches:
+            messagebox.showinfo('No Matches', 'No other page shares the layout of this page.')
+            return
+
+        count = self.label_manager.get_label_count(page_num)
+        labeled = sum(1 for p in matches if self.label_manager.get_label_count(p))
+        message = f'Copy {count} labels from page {page_num + 1} to {len(matches)} pages with the same layout?'
+        if labeled:
+            message += f'\n\nExisting labels on {labeled} of these pages will be replaced.'
+        if messagebox.askyesno('Copy Labels', message):
+            added = self.label_manager.copy_page_labels(page_num, matches)
+            self.status_label.config(text=f'Copied {added} labels to {len(matches)} pages')
+            self._warn_autosave_error()
+
+    def _save_labels(self):
+        '''Save labels to file'''
+        if not self.pdf_doc.file_path:
+            messagebox.showwarning('No PDF', 'Please open a PDF first.')
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            title='Save Labels',
+            defaultextension='.json',
+            filetypes=LABEL_FILETYPES
+        )
+
+        if file_path:
+            try:
+                self.label_manager.save_to_file(file_path)
+                messagebox.showinfo('Success', 'Labels saved successfully!')
+            except Exception as e:
+                messagebox.showerror('Error', f'Failed to save labels: {str(e)}')
+
+    def _load_labels(self):
+        '''Load labels from file'''
+        file_path = filedialog.askopenfilename(
+            title='Load Labels',
+            filetypes=LABEL_FILETYPES
+        )
+
+        if file_path:
+            try:
+                self.label_manager.load_from_file(file_path)
+                self._display_current_page()
+                messagebox.showinfo('Success', 'Labels loaded successfully!')
+                self._warn_autosave_error()
+            except Exception as e:
+                messagebox.showerror('Error', f'Failed to load labels: {str(e)}')
+
+    def _export_dataset(self):
+        '''Export the open PDF's labeled regions as page images, crops and annotations'''
+        if not self.pdf_doc.file_path:
+            messagebox.showwarning('No PDF', 'Please open a PDF first.')
+            return
+        template = manager_template(self.label_manager)
+        if not template:
+            messagebox.showwarning('No Labels', 'Label some pages before exporting a dataset.')
+            return
+
+        options = ExportDialog(self.root).show()
+        if options is None:
+            return
+
+        # Rendering runs in worker processes; this thread only collects results
+        exporter = DatasetExporter(template, **options)
+        state = {'done': False, 'error': None}
+        file_path = self.pdf_doc.file_path
+
+        def work():
+            try:
+                exporter.run([file_path])
+            except Exception as e:
+                state['error'] = str(e)
+            finally:
+                state['done'] = True
+
+        threading.Thread(target=work, daemon=True).start()
+        self._poll_export(exporter, state)
+
+    def _poll_export(self, exporter: DatasetExporter, state: dict):
+        '''Show export progress and report the result when done'''
+        if not state['done']:
+            self.status_label.config(text=f'Exporting page {exporter.pages} / {exporter.total_pages}...')
+            self.root.after(200, lambda: self._poll_export(exporter, state))
+            return
+
+        self.status_label.config(text='')
+        if state['error']:
+            messagebox.showerror('Error', f"Failed to export dataset: {state['error']}")
+        elif exporter.failed:
+            messagebox.showwarning('Export Incomplete', f'{exporter.failed} pages failed:\n' + '\n'.join(exporter.errors[:5]))
+        else:
+            messagebox.showinfo('Success', f'Exported {exporter.pages} pages with {exporter.annotations} boxes.')
+
+    def _on_close(self):
+        '''Flush autosaved labels and exit'''
+        self.render_scheduler.close()
+        self.thumbnail_panel.close()
+        try:
+            self.workspace.close_all()
+        finally:
+            self.root.quit()
+
+    def run(self):
+        '''Start the application'''
+        self.root.mainloop()
+
 # ====================
\ No newline at end of file
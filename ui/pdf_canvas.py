@@ -1,103 +1,358 @@
-# ===== ui/pdf_canvas.py =====
-
-import tkinter as tk
-from PIL import Image, ImageTk
-from typing import Tuple, List, Callable, Optional
-from core.label_manager import LabelManager
-from models.label import Label
-
-class PDFCanvas:
-    '''Handles PDF display and drawing interactions'''
-    
-    def __init__(self, canvas: tk.Canvas, label_manager: LabelManager):
-        self.canvas = canvas
-        self.label_manager = label_manager
-        self.current_image = None
-        self.current_page = 0
-        
-        # Drawing state
-        self.rect_start = None
-        self.drawing_rect = None
-        
-        # Callback
-        self.on_rectangle_drawn: Optional[Callable] = None
-        
-        # Bind events
-        self.canvas.bind('<ButtonPress-1>', self._on_mouse_down)
-        self.canvas.bind('<B1-Motion>', self._on_mouse_drag)
-        self.canvas.bind('<ButtonRelease-1>', self._on_mouse_up)
-    
-    def display_image(self, img: Image.Image, page_num: int):
-        '''Display an image on the canvas'''
-        self.current_page = page_num
-        self.current_image = ImageTk.PhotoImage(img)
-        
-        self.canvas.delete('all')
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.current_image)
-        self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
-        
-        self._draw_labels()
-    
-    def _draw_labels(self):
-        '''Draw all labels for current page'''
-        labels = self.label_manager.get_labels(self.current_page)
-        for i, label in enumerate(labels):
-            bbox = label.bbox
-            self.canvas.create_rectangle(
-                bbox[0], bbox[1], bbox[2], bbox[3],
-                outline='red', width=2, tags=f'label_{i}'
-            )
-            self.canvas.create_text(
-                bbox[0], bbox[1] - 5,
-                text=label.label_text,
-                anchor=tk.SW,
-                fill='red',
-                font=('Arial', 10, 'bold'),
-                tags=f'label_{i}'
-            )
-    
-    def _on_mouse_down(self, event):
-        '''Handle mouse button press'''
-        self.rect_start = (event.x, event.y)
-    
-    def _on_mouse_drag(self, event):
-        '''Handle mouse drag'''
-        if self.rect_start:
-            if self.drawing_rect:
-                self.canvas.delete(self.drawing_rect)
-            
-            x1, y1 = self.rect_start
-            self.drawing_rect = self.canvas.create_rectangle(
-                x1, y1, event.x, event.y,
-                outline='blue', width=2, dash=(5, 5)
-            )
-    
-    def _on_mouse_up(self, event):
-        '''Handle mouse button release'''
-        if self.rect_start and self.drawing_rect:
-            x1, y1 = self.rect_start
-            x2, y2 = event.x, event.y
-            
-            # Normalize coordinates
-            bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
-            
-            # Only create label if rectangle is large enough
-            if abs(x2 - x1) > 5 and abs(y2 - y1) > 5:
-                if self.on_rectangle_drawn:
-                    self.on_rectangle_drawn(bbox)
-            
-            self.canvas.delete(self.drawing_rect)
-            self.drawing_rect = None
-            self.rect_start = None
-    
-    def refresh(self):
-        '''Refresh the canvas to show updated labels'''
-        # Remove old labels
-        for item in self.canvas.find_all():
-            tags = self.canvas.gettags(item)
-            if any(tag.startswith('label_') for tag in tags):
-                self.canvas.delete(item)
-        
-        self._draw_labels()
-
+# ===== ui/pdf_canvas.py =====
+
+import tkinter as tk
+from typing import Tuple, List, Callable, Dict, Optional, Set
+from core.label_manager import LabelManager
+from core.metrics import metrics, timed
+from models.label import Label
+from ui.render_scheduler import RenderScheduler
+
+class PDFCanvas:
+    '''Handles PDF display and drawing interactions'''
+
+    def __init__(self, canvas: tk.Canvas, label_manager: LabelManager,
+                 scheduler: Optional[RenderScheduler] = None):
+        self.canvas = canvas
+        self.label_manager = label_manager
+        # Tiles are rendered off the main loop when a scheduler is given
+        self.scheduler = scheduler
+        self.current_image = None
+        self.image_item = None
+        self.current_page = 0
+        self.zoom = 1.0  # Canvas pixels per PDF point
+
+        # Tiled display state
+        self.tile_loader: Optional[Callable] = None
+        self.tile_size = 0
+        self.page_size = (0, 0)
+        self.tiles: Dict[Tuple[int, int], Tuple[int, tk.PhotoImage]] = {}
+        self._tile_requests: Set[Tuple[int, int]] = set()
+        self._tile_update_pending = False
+
+        # Drawing state
+        self.rect_start = None
+        self.drawing_rect = None
+        self.selected_label: Optional[Label] = None
+
+        # Search match (page, bbox in PDF points) to outline and scroll to
+        self.highlight: Optional[Tuple[int, Tuple[float, float, float, float]]] = None
+        self._scroll_to_highlight = False
+
+        # Canvas item ids (rectangle, text) of each drawn label
+        self.label_items: Dict[Label, Tuple[int, int]] = {}
+
+        # Callbacks
+        self.on_rectangle_drawn: Optional[Callable] = None
+        self.on_label_selected: Optional[Callable] = None
+
+        # Bind events
+        self.canvas.bind('<ButtonPress-1>', self._on_mouse_down)
+        self.canvas.bind('<B1-Motion>', self._on_mouse_drag)
+        self.canvas.bind('<ButtonRelease-1>', self._on_mouse_up)
+        self.canvas.bind('<Configure>', lambda e: self._schedule_tile_update())
+        self.canvas.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.canvas.bind('<Button-4>', lambda e: self._scroll(-1))
+        self.canvas.bind('<Button-5>', lambda e: self._scroll(1))
+
+    def attach_scrollbars(self, xbar: tk.Scrollbar, ybar: tk.Scrollbar):
+        '''Connect scrollbars and load tiles whenever the view moves'''
+        def xscroll(*args):
+            xbar.set(*args)
+            self._schedule_tile_update()
+
+        def yscroll(*args):
+            ybar.set(*args)
+            self._schedule_tile_update()
+
+        self.canvas.config(xscrollcommand=xscroll, yscrollcommand=yscroll)
+        xbar.config(command=self.canvas.xview)
+        ybar.config(command=self.canvas.yview)
+
+    @timed('display_image')
+    def display_image(self, data: bytes, page_num: int, zoom: float = 1.0, enlarge: int = 1):
+        '''Display PPM image data on the canvas, enlarged by an integer factor'''
+        self.current_page = page_num
+        # label_items and selected_label are keyed by row ids of this page
+        self.label_manager.pin_page(page_num)
+        self.zoom = zoom
+        self.current_image = self._photo(data)
+        if enlarge > 1:
+            # Low-resolution previews fill the page until replace_image() is called
+            self.current_image = self.current_image.zoom(enlarge)
+        self.selected_label = None
+        self.tile_loader = None
+        self.tiles = {}
+        self._cancel_tiles()
+        self.label_items = {}
+
+        self.canvas.delete('all')
+        self.image_item = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.current_image)
+        self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
+
+        self._draw_labels()
+        self._draw_highlight()
+
+    def replace_image(self, data: bytes):
+        '''Swap the displayed page image in place, keeping labels and selection'''
+        if self.image_item is None:
+            return
+        self.current_image = self._photo(data)
+        self.canvas.itemconfig(self.image_item, image=self.current_image)
+
+    @timed('display_tiled')
+    def display_tiled(self, page_num: int, page_size: Tuple[int, int], tile_size: int,
+                      tile_loader: Callable[[int, int], Optional[bytes]], zoom: float = 1.0):
+        '''Display a page as tiles, rendering only those inside the visible region'''
+        self.current_page = page_num
+        self.label_manager.pin_page(page_num)
+        self.zoom = zoom
+        self.current_image = None
+        self.image_item = None
+        self.selected_label = None
+        self.tile_loader = tile_loader
+        self.tile_size = tile_size
+        self.page_size = page_size
+        self.tiles = {}
+        self._cancel_tiles()
+        self.label_items = {}
+
+        self.canvas.delete('all')
+        self.canvas.config(scrollregion=(0, 0, page_size[0], page_size[1]))
+
+        self._draw_labels()
+        self._draw_highlight()
+        self._update_tiles()
+
+    def set_label_manager(self, label_manager: LabelManager):
+        '''Switch to another document's labels, clearing the canvas until its page is displayed'''
+        self.label_manager = label_manager
+        self.current_image = None
+        self.image_item = None
+        self.selected_label = None
+        self.tile_loader = None
+        self.tiles = {}
+        self._cancel_tiles()
+        self.label_items = {}
+        self.canvas.delete('all')
+
+    def _schedule_tile_update(self):
+        '''Coalesce scroll and resize events into one tile update'''
+        if self.tile_loader and not self._tile_update_pending:
+            self._tile_update_pending = True
+            self.canvas.after_idle(self._update_tiles)
+
+    def _visible_tiles(self) -> List[Tuple[int, int]]:
+        '''Get (col, row) of every tile intersecting the visible canvas region'''
+        left = max(self.canvas.canvasx(0), 0)
+        top = max(self.canvas.canvasy(0), 0)
+        right = min(self.canvas.canvasx(self.canvas.winfo_width()), self.page_size[0])
+        bottom = min(self.canvas.canvasy(self.canvas.winfo_height()), self.page_size[1])
+        if right <= left or bottom <= top:
+            return []
+
+        size = self.tile_size
+        cols = range(int(left // size), int((right - 1) // size) + 1)
+        rows = range(int(top // size), int((bottom - 1) // size) + 1)
+        return [(col, row) for row in rows for col in cols]
+
+    def _update_tiles(self):
+        '''Render newly visible tiles and release those scrolled out of view'''
+        self._tile_update_pending = False
+        if not self.tile_loader:
+            return
+
+        visible = set(self._visible_tiles())
+        for key in [k for k in self.tiles if k not in visible]:
+            item, _ = self.tiles.pop(key)
+            self.canvas.delete(item)
+
+        self._cancel_tiles(keep=visible)
+
+        for col, row in sorted(visible - self.tiles.keys() - self._tile_requests):
+            if self.scheduler is None:
+                self._place_tile(col, row, self.tile_loader(col, row))
+                continue
+            loader = self.tile_loader
+            self._tile_requests.add((col, row))
+            self.scheduler.submit(('tile', col, row),
+                                  lambda c=col, r=row: loader(c, r),
+                                  lambda img, c=col, r=row: self._place_tile(c, r, img))
+
+    def _place_tile(self, col: int, row: int, data: Optional[bytes]):
+        '''Show a rendered tile beneath the labels'''
+        self._tile_requests.discard((col, row))
+        if data is None:
+            return
+        photo = self._photo(data)
+        item = self.canvas.create_image(col * self.tile_size, row * self.tile_size,
+                                        anchor=tk.NW, image=photo, tags='tile')
+        self.canvas.tag_lower(item)
+        self.tiles[(col, row)] = (item, photo)
+
+    def _cancel_tiles(self, keep: Set[Tuple[int, int]] = frozenset()):
+        '''Stop rendering tiles that are no longer needed'''
+        self._tile_requests &= keep
+        if self.scheduler:
+            self.scheduler.cancel(lambda channel: isinstance(channel, tuple) and channel[0] == 'tile'
+                                  and channel[1:] not in keep)
+
+    def _photo(self, data: bytes) -> tk.PhotoImage:
+        '''Decode PPM data straight into a Tk photo image'''
+        return tk.PhotoImage(master=self.canvas, data=data, format='PPM')
+
+    def _on_mouse_wheel(self, event):
+        '''Handle mouse wheel scrolling'''
+        self._scroll(-1 if event.delta > 0 else 1)
+
+    def _scroll(self, units: int):
+        '''Scroll the canvas vertically'''
+        self.canvas.yview_scroll(units, 'units')
+
+    @timed('draw_labels')
+    def _draw_labels(self):
+        '''Draw all labels for current page'''
+        # Scale the whole page from PDF points to canvas pixels in one step
+        boxes = self.label_manager.get_page_boxes(self.current_page, self.zoom).tolist()
+        for label, bbox in zip(self.label_manager.get_labels(self.current_page), boxes):
+            self._create_label_items(label, bbox)
+        metrics.count('labels_drawn', len(boxes))
+
+    def add_label(self, label: Label):
+        '''Draw a single label on the canvas'''
+        self._create_label_items(label, [v * self.zoom for v in label.bbox])
+
+    def _create_label_items(self, label: Label, bbox: List[float]):
+        '''Create the rectangle and text items of a label at canvas coordinates'''
+        color = self._label_color(label)
+        rect = self.canvas.create_rectangle(
+            bbox[0], bbox[1], bbox[2], bbox[3],
+            outline=color, width=2, tags='label'
+        )
+        text = self.canvas.create_text(
+            bbox[0], bbox[1] - 5,
+            text=label.label_text,
+            anchor=tk.SW,
+            fill=color,
+            font=('Arial', 10, 'bold'),
+            tags='label'
+        )
+        self.label_items[label] = (rect, text)
+
+    def remove_label(self, label: Label):
+        '''Remove a single label from the canvas'''
+        items = self.label_items.pop(label, None)
+        if items:
+            self.canvas.delete(*items)
+        if label == self.selected_label:
+            self.selected_label = None
+
+    def recolor_label(self, label: Label, color: Optional[str] = None):
+        '''Change the color of a drawn label, or reset it to its default'''
+        items = self.label_items.get(label)
+        if items:
+            color = color or self._label_color(label)
+            self.canvas.itemconfig(items[0], outline=color)
+            self.canvas.itemconfig(items[1], fill=color)
+
+    def select_label(self, label: Optional[Label]):
+        '''Highlight a label on the canvas'''
+        previous = self.selected_label
+        if label != previous:
+            self.selected_label = label
+            if previous is not None:
+                self.recolor_label(previous)
+            if label is not None:
+                self.recolor_label(label)
+
+    def set_highlight(self, page_num: int, bbox: Optional[Tuple[float, float, float, float]]):
+        '''Outline a search match, scrolling to it once its page is displayed'''
+        self.highlight = (page_num, bbox) if bbox else None
+        self._scroll_to_highlight = True
+        self._draw_highlight()
+
+    def _draw_highlight(self):
+        '''Draw the search match outline if it is on the current page'''
+        self.canvas.delete('highlight')
+        if not self.highlight or self.highlight[0] != self.current_page:
+            return
+
+        x1, y1, x2, y2 = [v * self.zoom for v in self.highlight[1]]
+        self.canvas.create_rectangle(x1 - 2, y1 - 2, x2 + 2, y2 + 2, outline='gold', width=3, tags='highlight')
+        if self._scroll_to_highlight:
+            self._scroll_to_highlight = False
+            self._scroll_into_view(x1, y1, x2, y2)
+
+    def _scroll_into_view(self, x1: float, y1: float, x2: float, y2: float):
+        '''Center the view on a region if it is not fully visible'''
+        region = [float(v) for v in str(self.canvas.cget('scrollregion')).split()] or [0, 0, 0, 0]
+        width, height = region[2] - region[0], region[3] - region[1]
+        if width <= 0 or height <= 0:
+            return
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        view_w, view_h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if left <= x1 and x2 <= left + view_w and top <= y1 and y2 <= top + view_h:
+            return
+        self.canvas.xview_moveto(max((x1 + x2 - view_w) / 2, 0) / width)
+        self.canvas.yview_moveto(max((y1 + y2 - view_h) / 2, 0) / height)
+
+    def _label_color(self, label: Label) -> str:
+        return 'orange' if label == self.selected_label else 'red'
+
+    def _select_at(self, x: float, y: float):
+        '''Select the label under a canvas point, or the nearest one within a few pixels'''
+        x, y = x / self.zoom, y / self.zoom
+        hits = self.label_manager.find_labels_at(self.current_page, x, y)
+        label = hits[0] if hits else self.label_manager.find_nearest_label(
+            self.current_page, x, y, max_distance=5 / self.zoom)
+
+        self.select_label(label)
+        if self.on_label_selected:
+            self.on_label_selected(label)
+
+    def _on_mouse_down(self, event):
+        '''Handle mouse button press'''
+        self.rect_start = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+
+    def _on_mouse_drag(self, event):
+        '''Handle mouse drag'''
+        if self.rect_start:
+            if self.drawing_rect:
+                self.canvas.delete(self.drawing_rect)
+
+            x1, y1 = self.rect_start
+            self.drawing_rect = self.canvas.create_rectangle(
+                x1, y1, self.canvas.canvasx(event.x), self.canvas.canvasy(event.y),
+                outline='blue', width=2, dash=(5, 5)
+            )
+
+    def _on_mouse_up(self, event):
+        '''Handle mouse button release'''
+        if self.rect_start:
+            x1, y1 = self.rect_start
+            x2, y2 = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+
+            # Normalize coordinates
+            bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+            # Only create label if rectangle is large enough
+            if abs(x2 - x1) > 5 and abs(y2 - y1) > 5:
+                if self.drawing_rect and self.on_rectangle_drawn:
+                    # Labels are stored in PDF points, independent of zoom
+                    self.on_rectangle_drawn(tuple(v / self.zoom for v in bbox))
+            elif abs(x2 - x1) <= 5 and abs(y2 - y1) <= 5:
+                # A click without a drag selects a label
+                self._select_at(x2, y2)
+
+            if self.drawing_rect:
+                self.canvas.delete(self.drawing_rect)
+            self.drawing_rect = None
+            self.rect_start = None
+
+    @timed('refresh')
+    def refresh(self):
+        '''Redraw all labels of the current page'''
+        self.canvas.delete('label')
+        self.label_items = {}
+        self._draw_labels()
+
 # ====================
\ No newline at end of file
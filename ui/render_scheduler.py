@@ -0,0 +1,114 @@
+# ===== ui/render_scheduler.py =====
+
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class RenderScheduler:
+    '''Runs render jobs on a worker thread and delivers results on the Tk main loop'''
+
+    def __init__(self, widget: tk.Misc, poll_ms: int = 10):
+        self.widget = widget
+        self.poll_ms = poll_ms
+
+        # Each channel holds at most one waiting job; newer submits replace it
+        self._pending: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._tokens: Dict[Hashable, int] = {}
+        self._running = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        # Tk is not thread safe, so finished jobs are polled from the main loop
+        self._results = queue.Queue()
+        self._polling = False
+
+    def submit(self, channel: Hashable, job: Callable[[], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None) -> int:
+        '''Queue a job, superseding any earlier job on the same channel'''
+        with self._cond:
+            token = self._tokens.get(channel, 0) + 1
+            self._tokens[channel] = token
+            self._pending.pop(channel, None)
+            self._pending[channel] = (token, job, on_done, on_error)
+            self._cond.notify()
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        self._start_polling()
+        return token
+
+    def cancel(self, predicate: Callable[[Hashable], bool]):
+        '''Drop waiting jobs and ignore in-flight results on matching channels'''
+        with self._cond:
+            for channel in [c for c in self._tokens if predicate(c)]:
+                self._tokens[channel] += 1
+                self._pending.pop(channel, None)
+
+    def is_pending(self, channel: Hashable) -> bool:
+        '''Check whether a channel has a job waiting to run'''
+        with self._cond:
+            return channel in self._pending
+
+    def close(self):
+        '''Drop all work and stop the worker thread'''
+        self.cancel(lambda channel: True)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _worker(self):
+        '''Run the oldest waiting job, skipping those superseded before they started'''
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                channel, (token, job, on_done, on_error) = self._pending.popitem(last=False)
+                self._running = True
+
+            try:
+                result, error = job(), None
+            except Exception as e:
+                result, error = None, e
+
+            with self._cond:
+                self._running = False
+                # Results of jobs superseded while running are dropped here or on delivery
+                if token == self._tokens.get(channel):
+                    self._results.put((channel, token, result, error, on_done, on_error))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        '''Deliver finished results on the main thread while work is outstanding'''
+        try:
+            while True:
+                try:
+                    channel, token, result, error, on_done, on_error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if token != self._tokens.get(channel):
+                    continue
+                if error is None:
+                    on_done(result)
+                elif on_error:
+                    on_error(error)
+                else:
+                    raise error
+        finally:
+            with self._cond:
+                busy = self._pending or self._running or not self._results.empty()
+            if busy and not self._closed:
+                self.widget.after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+# ====================
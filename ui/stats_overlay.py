@@ -0,0 +1,70 @@
+# ===== ui/stats_overlay.py =====
+
+import tkinter as tk
+from typing import Callable, List, Optional
+from core.metrics import METRICS_ENV, metrics
+
+# Timers shown in the overlay, in display order
+OVERLAY_TIMERS = ['render_preview', 'render_page', 'render_tile', 'display_image', 'display_tiled',
+                  'draw_labels', 'refresh', 'update_list', 'update_list_row', 'save_labels', 'load_labels']
+
+class StatsOverlay:
+    '''Live latency and counter readout drawn over the page view'''
+
+    def __init__(self, parent: tk.Widget, interval_ms: int = 500):
+        self.parent = parent
+        self.interval_ms = interval_ms
+        self.visible = False
+
+        # Callbacks
+        self.get_extra_lines: Optional[Callable[[], List[str]]] = None
+
+        self.label = tk.Label(parent, justify=tk.LEFT, anchor=tk.NW, font=('Courier', 9),
+                              bg='black', fg='lime', padx=6, pady=4)
+        self._after_id = None
+
+    def toggle(self):
+        '''Show or hide the overlay'''
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        '''Show the overlay in the top right corner and start refreshing it'''
+        self.visible = True
+        self.label.place(relx=1.0, x=-20, y=4, anchor=tk.NE)
+        self.label.lift()
+        self._refresh()
+
+    def hide(self):
+        '''Hide the overlay and stop refreshing it'''
+        self.visible = False
+        self.label.place_forget()
+        if self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _refresh(self):
+        '''Redraw the readout; polling stops while hidden'''
+        self._after_id = None
+        if not self.visible:
+            return
+        self.label.config(text='\n'.join(self._lines()))
+        self._after_id = self.parent.after(self.interval_ms, self._refresh)
+
+    def _lines(self) -> List[str]:
+        lines = list(self.get_extra_lines()) if self.get_extra_lines else []
+        if not metrics.enabled:
+            lines.append(f'Timers off: start with {METRICS_ENV}=1')
+            return lines
+
+        lines.extend(metrics.summary_lines(OVERLAY_TIMERS))
+        counters = metrics.snapshot()['counters']
+        if 'labels_drawn' in counters:
+            lines.append(f"labels drawn: {counters['labels_drawn']}")
+        if 'bytes_rasterized' in counters:
+            lines.append(f"rasterized: {counters['bytes_rasterized'] / (1024 * 1024):.1f} MB")
+        return lines
+
+# ====================
@@ -0,0 +1,220 @@
+# ===== ui/thumbnail_panel.py =====
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from core.thumbnail_cache import ThumbnailCache
+
+class ThumbnailPanel:
+    '''Scrollable page overview that keeps only the visible thumbnails in memory'''
+
+    def __init__(self, parent: ttk.Frame, cache: ThumbnailCache):
+        self.parent = parent
+        self.cache = cache
+        # Every page gets a fixed-height cell so the list can be virtualized
+        self.cell_height = int(cache.width * 1.45) + 24
+        self.total_pages = 0
+        self.current_page = 0
+
+        self.doc_key: Optional[str] = None
+        self.ready: Set[int] = set()
+        # Canvas items and image of each page cell currently drawn
+        self.cells: Dict[int, Tuple[List[int], Optional[tk.PhotoImage]]] = {}
+
+        # Callbacks
+        self.on_page_selected: Optional[Callable] = None
+
+        # Background hashing and generation report back through this queue
+        self._updates = queue.Queue()
+        self._generation = 0
+        self._cancel: Optional[threading.Event] = None
+        self._polling = False
+        self._update_pending = False
+
+        self.canvas = None
+        self.status_label = None
+        self._setup_ui()
+
+    def _setup_ui(self):
+        '''Setup the UI components'''
+        ttk.Label(self.parent, text='Pages', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5)
+        self.status_label = ttk.Label(self.parent, text='')
+        self.status_label.pack(anchor=tk.W, padx=5)
+
+        list_frame = ttk.Frame(self.parent)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        scrollbar = ttk.Scrollbar(list_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def yscroll(*args):
+            scrollbar.set(*args)
+            self._schedule_update()
+
+        self.canvas = tk.Canvas(list_frame, width=self.cache.width + 16, bg='gray80',
+                                highlightthickness=0, yscrollcommand=yscroll)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.canvas.yview)
+
+        self.canvas.bind('<Configure>', lambda e: self._schedule_update())
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<MouseWheel>', lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+
+    def set_document(self, pdf_path: str, total_pages: int):
+        '''Show a new document, loading cached thumbnails and generating the rest'''
+        if self._cancel:
+            self._cancel.set()
+        self._generation += 1
+        self._cancel = threading.Event()
+
+        self.total_pages = total_pages
+        self.current_page = 0
+        self.doc_key = None
+        self.ready = set()
+        self.cells = {}
+        self.canvas.delete('all')
+        self.canvas.config(scrollregion=(0, 0, self.cache.width + 16, total_pages * self.cell_height),
+                           yscrollincrement=self.cell_height // 4)
+        self.canvas.yview_moveto(0)
+        self.status_label.config(text='')
+
+        threading.Thread(target=self._prepare, daemon=True,
+                         args=(pdf_path, total_pages, self._generation, self._cancel)).start()
+        self._start_polling()
+        self._schedule_update()
+
+    def set_current(self, page_num: int):
+        '''Highlight the displayed page and scroll it into view'''
+        self.current_page = page_num
+        self.canvas.delete('current')
+        if not self.total_pages:
+            return
+
+        top = page_num * self.cell_height
+        self.canvas.create_rectangle(2, top + 2, self.cache.width + 14, top + self.cell_height - 2,
+                                     outline='blue', width=3, tags='current')
+        view_top = self.canvas.canvasy(0)
+        view_bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        if top < view_top or top + self.cell_height > view_bottom:
+            self.canvas.yview_moveto(top / (self.total_pages * self.cell_height))
+
+    def close(self):
+        '''Stop generating thumbnails'''
+        if self._cancel:
+            self._cancel.set()
+
+    def _prepare(self, pdf_path: str, total_pages: int, generation: int, cancel: threading.Event):
+        '''Hash the document and render missing thumbnails, off the main thread'''
+        try:
+            doc_key = self.cache.document_key(pdf_path)
+            missing = self.cache.missing(doc_key, total_pages)
+            self._updates.put((generation, 'key', doc_key, sorted(set(range(total_pages)) - set(missing))))
+            for pages in self.cache.generate(pdf_path, doc_key, missing, cancel=cancel):
+                self._updates.put((generation, 'pages', pages))
+        except Exception as e:
+            self._updates.put((generation, 'error', str(e)))
+        finally:
+            self._updates.put((generation, 'done'))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.canvas.after(50, self._poll)
+
+    def _poll(self):
+        '''Apply background progress on the main thread'''
+        running = True
+        while True:
+            try:
+                update = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            if update[0] != self._generation:
+                continue
+            kind = update[1]
+            if kind == 'key':
+                self.doc_key = update[2]
+                self._add_ready(update[3])
+            elif kind == 'pages':
+                self._add_ready(update[2])
+            elif kind == 'error':
+                self.status_label.config(text=f'Thumbnails unavailable: {update[2]}')
+            else:
+                running = False
+
+        if running:
+            self.status_label.config(text=f'{len(self.ready)} / {self.total_pages} thumbnails')
+            self.canvas.after(100, self._poll)
+        else:
+            if len(self.ready) == self.total_pages:
+                self.status_label.config(text='')
+            self._polling = False
+
+    def _add_ready(self, pages: List[int]):
+        '''Mark pages as cached and redraw those already on screen'''
+        self.ready.update(pages)
+        for page_num in pages:
+            cell = self.cells.get(page_num)
+            if cell is not None and cell[1] is None:
+                self.canvas.delete(*cell[0])
+                del self.cells[page_num]
+        self._schedule_update()
+
+    def _schedule_update(self):
+        '''Coalesce scroll and resize events into one update'''
+        if not self._update_pending:
+            self._update_pending = True
+            self.canvas.after_idle(self._update_visible)
+
+    def _update_visible(self):
+        '''Draw cells scrolled into view and release those scrolled out'''
+        self._update_pending = False
+        if not self.total_pages:
+            return
+
+        top = max(self.canvas.canvasy(0), 0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = int(top // self.cell_height)
+        last = min(int(bottom // self.cell_height), self.total_pages - 1)
+        visible = range(first, last + 1)
+
+        for page_num in [p for p in self.cells if p not in visible]:
+            items, _ = self.cells.pop(page_num)
+            self.canvas.delete(*items)
+
+        for page_num in visible:
+            if page_num not in self.cells:
+                self.cells[page_num] = self._draw_cell(page_num)
+        self.canvas.tag_raise('current')
+
+    def _draw_cell(self, page_num: int) -> Tuple[List[int], Optional[tk.PhotoImage]]:
+        '''Draw one page cell with its thumbnail, or a placeholder until it is cached'''
+        top = page_num * self.cell_height
+        center = (self.cache.width + 16) // 2
+        photo = None
+        if page_num in self.ready and self.doc_key:
+            try:
+                photo = tk.PhotoImage(master=self.canvas, file=self.cache.path(self.doc_key, page_num))
+            except tk.TclError:
+                photo = None
+
+        if photo is not None:
+            image = self.canvas.create_image(center, top + 6, anchor=tk.N, image=photo)
+        else:
+            image = self.canvas.create_rectangle(8, top + 6, self.cache.width + 8, top + self.cell_height - 20,
+                                                 fill='white', outline='gray60')
+        text = self.canvas.create_text(center, top + self.cell_height - 4, anchor=tk.S,
+                                       text=str(page_num + 1), font=('Arial', 9))
+        return [image, text], photo
+
+    def _on_click(self, event):
+        '''Open the clicked page'''
+        page_num = int(self.canvas.canvasy(event.y) // self.cell_height)
+        if 0 <= page_num < self.total_pages and self.on_page_selected:
+            self.on_page_selected(page_num)
+
+# ====================
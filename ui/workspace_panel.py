@@ -0,0 +1,58 @@
+# ===== ui/workspace_panel.py =====
+
+import os
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+class WorkspacePanel:
+    '''List of the documents in the workspace'''
+
+    def __init__(self, parent: ttk.Frame):
+        self.parent = parent
+        self.listbox = None
+        self.count_label = None
+
+        # Callbacks
+        self.on_document_selected: Optional[Callable] = None
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        '''Setup the UI components'''
+        ttk.Label(self.parent, text='Documents', font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=5)
+        self.count_label = ttk.Label(self.parent, text='')
+        self.count_label.pack(anchor=tk.W, padx=5)
+
+        list_frame = ttk.Frame(self.parent)
+        list_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        scrollbar = ttk.Scrollbar(list_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox = tk.Listbox(list_frame, height=8, width=20, exportselection=False,
+                                  yscrollcommand=scrollbar.set)
+        self.listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.config(command=self.listbox.yview)
+
+        self.listbox.bind('<<ListboxSelect>>', lambda e: self._handle_select())
+
+    def set_documents(self, paths: List[str]):
+        '''Show a new document list'''
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *[os.path.basename(p) for p in paths])
+        self.count_label.config(text=f'{len(paths)} files' if len(paths) != 1 else '')
+
+    def select(self, index: int):
+        '''Highlight the active document'''
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+
+    def _handle_select(self):
+        '''Handle listbox selection change'''
+        selection = self.listbox.curselection()
+        if selection and self.on_document_selected:
+            self.on_document_selected(selection[0])
+
+# ====================